@@ -13,6 +13,8 @@ from pathlib import Path
 import sys
 from datetime import datetime
 
+from file_lock import file_lock, write_json_atomic
+
 
 class ProblemManager:
     def __init__(self, base_dir: Path):
@@ -64,9 +66,8 @@ class ProblemManager:
                     fb.write(f.read())
             print(f"📦 Backup created: {backup_file.name}")
 
-        # 저장
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 저장 (임시 파일에 쓴 뒤 교체)
+        write_json_atomic(self.metadata_file, data, ensure_ascii=False, indent=2)
 
     def create_problem_file(self, problem_id: str, source: str = '', content: str = '') -> Path:
         """문제 파일 생성"""
@@ -116,7 +117,11 @@ class ProblemManager:
         return solution_file
 
     def add_to_metadata(self, problem_id: str, metadata: dict):
-        """메타데이터에 문제 추가"""
+        """메타데이터에 문제 추가 (다른 스크립트와 동시에 수정하지 않도록 잠금)"""
+        with file_lock(self.metadata_file):
+            self._add_to_metadata(problem_id, metadata)
+
+    def _add_to_metadata(self, problem_id: str, metadata: dict):
         data = self.load_metadata()
 
         # 중복 체크
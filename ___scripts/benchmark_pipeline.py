@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+파이프라인 벤치마크 - 합성 문제 코퍼스
+
+실제 .tex 파일을 본뜬 합성 코퍼스(한글 본문, 인라인 / 디스플레이 수식, \\fbox 출처,
+\\endnote{} 풀이, tikzpicture)를 임시 디렉토리에 만들고 파이프라인 단계별 시간을 잰다.
+
+측정 단계 (코퍼스 규모별, 각 단계는 별도 프로세스에서 실행):
+- extract          : TexProblemExtractor.extract_all (문제집 .tex → 개별 문제 / 풀이 파일)
+- format           : format_all_problems
+- rebuild_metadata : rebuild_metadata.main
+- build_cold       : build_incremental.build_all (빈 캐시, TeX 대신 스텁 컴파일러)
+- build_noop       : build_incremental.build_all (변경 없음, 증분 경로)
+- collect_upload   : upload_to_r2.collect_files_to_upload (빈 업로드 캐시, boto3 필요)
+
+스크립트들을 코퍼스 디렉토리에 복사해 실행하므로 저장소의 데이터 / 캐시는 건드리지 않는다.
+결과는 benchmarks/pipeline_history.jsonl 에 한 줄씩 쌓이며, 같은 머신 / 같은 규모의
+직전 기록보다 --threshold 이상 느려진 단계를 회귀로 표시한다.
+실패한 단계가 있거나 build_cold가 그림을 하나도 저장하지 못하면 (스텁 컴파일러 고장 등)
+기록하지 않고 종료 코드 1로 끝난다.
+
+사용법:
+    python3 benchmark_pipeline.py                        # 1k, 10k 문제
+    python3 benchmark_pipeline.py --sizes 1000 10000 100000
+    python3 benchmark_pipeline.py --sizes 1000 --keep    # 생성한 코퍼스 디렉토리 유지
+    python3 benchmark_pipeline.py --fail-on-regression   # 회귀가 있으면 종료 코드 1 (CI용)
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from file_lock import file_lock
+
+# 경로 설정
+SCRIPTS_DIR = Path(__file__).parent
+BASE_DIR = SCRIPTS_DIR.parent
+HISTORY_FILE = BASE_DIR / "benchmarks" / "pipeline_history.jsonl"
+
+DEFAULT_SIZES = [1000, 10000]
+
+# 문제집 파일 하나에 들어가는 문제 수
+PROBLEMS_PER_FILE = 100
+
+# 풀이에 그림이 있는 문제 비율, 같은 그림을 다시 쓰는 비율 (그림 저장소 적중)
+TIKZ_RATIO = 0.25
+REUSED_FIGURE_RATIO = 0.1
+
+# 직전 기록보다 이 비율 이상 느려지면 회귀 (짧은 단계의 잡음은 MIN_REGRESSION_SECONDS로 무시)
+DEFAULT_THRESHOLD = 0.2
+MIN_REGRESSION_SECONDS = 0.05
+
+SOURCES = ['KMO 중등부 1차', 'KMO 고등부 1차', 'KJMO', '경시 모의고사', '교과서 심화']
+SUBJECTS = [
+    '삼각형 $ABC$에서', '원 $O$ 위의 네 점 $A, B, C, D$에 대하여', '양의 정수 $n$에 대하여',
+    '실수 $x, y$가', '정사각형 $ABCD$의 내부에 점 $P$가 있다. 점 $P$에서',
+    '선분 $AB$를 지름으로 하는 반원의 호 위에 점 $C$가 있다. 이때',
+]
+CONDITIONS = [
+    '$\\overline{{AB}}={a}$, $\\overline{{BC}}={b}$이고',
+    '$x+y={a}$, $xy={b}$일 때',
+    '$\\angle A = {a}^\\circ$, $\\angle B = {b}^\\circ$이면',
+    '$n^2 + {a}n + {b}$이 완전제곱수가 되도록 하는',
+    '넓이가 ${a}$이고 둘레가 ${b}$인',
+]
+QUESTIONS = [
+    '의 값을 구하여라.', '의 최솟값을 구하여라.', '임을 증명하여라.',
+    '을 만족하는 모든 값의 합을 구하여라.', '의 개수를 구하여라.',
+]
+SOLUTION_SENTENCES = [
+    '점 $M$을 선분 $CD$의 중점이라 하자. 그러면 $\\overline{{OM}} \\perp \\overline{{CD}}$이다.',
+    '피타고라스 정리에 의해 $\\overline{{OC}}^2 = {a}^2 + {b}^2$을 얻는다.',
+    '산술-기하 평균 부등식에서 $x + y \\ge 2\\sqrt{{xy}}$이므로 등호는 $x = y$일 때 성립한다.',
+    '따라서 구하는 값은 ${a}$이다.',
+    '$n = {a}$일 때 $n^2 + {b} = ({a}+1)^2 - {c}$이므로 조건을 만족한다.',
+]
+
+# 스텁 TeX 컴파일러: 입력의 tikzpicture를 페이지로 가진 가짜 PDF를 만들고,
+# pdf2svg 스텁은 페이지 내용에서 결정되는 path 데이터로 SVG를 쓴다.
+STUB_PDFLATEX = '''#!{python} -S
+import pathlib, re, sys
+if '--version' in sys.argv:
+    print('pdfTeX 3.141592653 (benchmark stub)')
+    sys.exit(0)
+args = [a for a in sys.argv[1:] if not a.startswith('-')]
+tex = pathlib.Path(args[-1]).with_suffix('.tex')
+jobname = tex.stem
+for a in sys.argv[1:]:
+    if a.startswith('-jobname='):
+        jobname = a.split('=', 1)[1]
+if '-ini' in sys.argv:
+    pathlib.Path(jobname + '.fmt').write_text('fmt')
+    sys.exit(0)
+src = tex.read_text(encoding='utf-8')
+pages = re.findall(r'\\\\begin\\{{tikzpicture\\}}.*?\\\\end\\{{tikzpicture\\}}', src, re.S)
+suffix = '.dvi' if '-output-format=dvi' in sys.argv else '.pdf'
+pathlib.Path(jobname + suffix).write_text('%PDF\\n' + '\\n\\f\\n'.join(pages), encoding='utf-8')
+'''
+
+STUB_PDF2SVG = '''#!{python} -S
+import hashlib, pathlib, sys
+pdf, out = sys.argv[1], sys.argv[2]
+page = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+pages = pathlib.Path(pdf).read_text(encoding='utf-8')[5:].split('\\n\\f\\n')
+if page > len(pages):
+    sys.exit(1)
+digest = hashlib.sha256(pages[page - 1].encode('utf-8')).digest()
+paths = ''.join(
+    '<path style="fill:none;stroke-width:0.797011;stroke:rgb(0%%,0%%,0%%);" '
+    'd="M %.6f %.6f L %.6f %.6f "/>\\n' % (digest[i], digest[i + 1], digest[i + 2], digest[i + 3])
+    for i in range(0, 28, 4)
+)
+pathlib.Path(out).write_text(
+    '<?xml version="1.0" encoding="UTF-8"?>\\n'
+    '<svg xmlns="http://www.w3.org/2000/svg" width="120pt" height="90pt" viewBox="0 0 120 90">\\n'
+    '<g id="surface1">\\n' + paths + '</g>\\n</svg>\\n'
+)
+'''
+
+# 단계별 실행 코드 (코퍼스에 복사한 스크립트 기준, {root}는 코퍼스 디렉토리)
+STAGES = [
+    ('extract', "from extract_problems import TexProblemExtractor",
+     "TexProblemExtractor(root).extract_all()"),
+    ('format', "from format_problem_files import format_all_problems",
+     "format_all_problems(root / 'problems')"),
+    ('rebuild_metadata', "import rebuild_metadata",
+     "rebuild_metadata.main()"),
+    ('build_cold', "import build_incremental",
+     "build_incremental.build_all(jobs={jobs}, backend='pdf2svg')"),
+    ('build_noop', "import build_incremental",
+     "build_incremental.build_all(jobs={jobs}, backend='pdf2svg')"),
+    ('collect_upload', "import upload_to_r2",
+     "upload_to_r2.collect_files_to_upload()"),
+]
+
+# 자식 프로세스: import는 시간에서 빼고, 출력은 버리고, 결과는 JSON 파일로
+DRIVER = '''
+import contextlib, json, os, resource, sys, time
+from pathlib import Path
+root = Path({root!r})
+sys.path[:0] = [str(root / '___scripts'), str(root / 'web_app')]
+try:
+    {setup}
+except ImportError as e:
+    Path({result!r}).write_text(json.dumps({{'skipped': str(e)}}))
+    sys.exit(0)
+with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+    start = time.perf_counter()
+    {call}
+    seconds = time.perf_counter() - start
+usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+Path({result!r}).write_text(json.dumps({{'seconds': seconds, 'max_rss_mb': usage / 1024}}))
+'''
+
+
+def make_figure(rng: random.Random) -> str:
+    """tkz-euclide 스타일의 tikzpicture"""
+    names = 'ABCDEFG'[:rng.randint(3, 6)]
+    lines = ['\\begin{tikzpicture}[scale=0.8]', '', '% 점 정의']
+    for name in names:
+        lines.append(f'\\tkzDefPoint({rng.uniform(-8, 8):.2f},{rng.uniform(0, 7):.2f}){{{name}}}')
+    lines += [
+        '',
+        f'\\tkzDrawPolygon[thick]({",".join(names)})',
+        f'\\tkzDrawCircle[thick, color=blue!60]({names[0]},{names[1]})',
+        f'\\tkzDrawPoints[size=4]({",".join(names)})',
+        '',
+        '% 라벨',
+    ]
+    for name in names:
+        lines.append(f'\\tkzLabelPoint[below]({name}){{${name}$}}')
+    lines += ['', '\\end{tikzpicture}']
+    return '\n'.join(lines)
+
+
+def make_problem_block(rng: random.Random, number: int, figure_pool: List[str]) -> str:
+    """\\fbox 출처 + \\stepcounter{prob} + 본문 + \\endnote{풀이} + \\vfill"""
+    a, b, c = rng.randint(2, 99), rng.randint(2, 99), rng.randint(1, 9)
+    source = f"{rng.randint(20, 40)}회({rng.randint(2005, 2025)}) {rng.choice(SOURCES)} {number}번"
+    statement = (f"{rng.choice(SUBJECTS)} {rng.choice(CONDITIONS).format(a=a, b=b)} "
+                 f"$f(x) = x^2 + {a}x + {b}$ {rng.choice(QUESTIONS)}")
+    if rng.random() < 0.3:
+        statement += f"\n\\[ \\overline{{AB}}^2 + \\overline{{AC}}^2 = {a}(\\overline{{AM}}^2 + {b})\\]"
+
+    solution_lines = [f"답: {a} \\\\", ""]
+    if rng.random() < TIKZ_RATIO:
+        if figure_pool and rng.random() < REUSED_FIGURE_RATIO:
+            figure = rng.choice(figure_pool)
+        else:
+            figure = make_figure(rng)
+            figure_pool.append(figure)
+        solution_lines += [figure, ""]
+    for _ in range(rng.randint(2, 5)):
+        solution_lines.append(rng.choice(SOLUTION_SENTENCES).format(a=a, b=b, c=c) + " \\\\")
+
+    return (f"\\fbox{{{source}}}\\\\\n"
+            f"\\stepcounter{{prob}}\n"
+            f"\\numbering {statement}\\\\\n"
+            f"\\endnote{{\n" + "\n".join(solution_lines) + "\n}\n"
+            f"\\vfill\n")
+
+
+def generate_corpus(root: Path, size: int, seed: int = 0) -> Dict[str, int]:
+    """
+    root 아래에 문제집 .tex 파일과 스크립트 복사본 생성
+
+    Returns:
+        {'problems', 'figures', 'source_files', 'source_bytes'}
+    """
+    rng = random.Random(seed)
+    contents_dir = root / "Problem Sets" / "contents"
+    contents_dir.mkdir(parents=True)
+    (root / "problems").mkdir()
+
+    figure_pool: List[str] = []
+    source_bytes = 0
+    n_files = (size + PROBLEMS_PER_FILE - 1) // PROBLEMS_PER_FILE
+    for file_index in range(n_files):
+        count = min(PROBLEMS_PER_FILE, size - file_index * PROBLEMS_PER_FILE)
+        blocks = [make_problem_block(rng, n + 1, figure_pool) for n in range(count)]
+        text = "\n".join(blocks)
+        (contents_dir / f"{file_index:04d}_합성단원.tex").write_text(text, encoding='utf-8')
+        source_bytes += len(text.encode('utf-8'))
+
+    # 스크립트 복사 (BASE_DIR이 코퍼스 디렉토리를 가리키도록)
+    (root / "___scripts").mkdir()
+    for script in SCRIPTS_DIR.glob("*.py"):
+        shutil.copy2(script, root / "___scripts" / script.name)
+    (root / "web_app" / "data").mkdir(parents=True)
+    shutil.copy2(BASE_DIR / "web_app" / "rebuild_metadata.py", root / "web_app" / "rebuild_metadata.py")
+
+    # 스텁 TeX 컴파일러
+    bin_dir = root / ".bench_bin"
+    bin_dir.mkdir()
+    for name, template in (('pdflatex', STUB_PDFLATEX), ('pdf2svg', STUB_PDF2SVG)):
+        stub = bin_dir / name
+        stub.write_text(template.format(python=sys.executable), encoding='utf-8')
+        stub.chmod(0o755)
+
+    return {
+        'problems': size,
+        'figures': len(figure_pool),
+        'source_files': n_files,
+        'source_bytes': source_bytes,
+    }
+
+
+def run_stage(root: Path, name: str, setup: str, call: str, jobs: int) -> dict:
+    """단계 하나를 새 프로세스에서 실행하고 {'seconds', 'max_rss_mb'} 또는 {'skipped'} 반환"""
+    result_file = root / f".bench_{name}.json"
+    code = DRIVER.format(root=str(root), result=str(result_file),
+                         setup=setup, call=call.format(jobs=jobs))
+    env = {
+        **os.environ,
+        'PATH': f"{root / '.bench_bin'}{os.pathsep}{os.environ.get('PATH', '')}",
+        'TIKZ_BACKEND': 'pdf2svg',
+        # upload_to_r2는 import 시 설정을 확인하므로 더미 값 (네트워크는 사용하지 않음)
+        'R2_ACCOUNT_ID': 'benchmark',
+        'R2_BUCKET_NAME': 'benchmark',
+    }
+    proc = subprocess.run([sys.executable, '-c', code], cwd=root, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0 or not result_file.exists():
+        return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else
+                f"exit {proc.returncode}"}
+    return json.loads(result_file.read_text())
+
+
+def benchmark_size(size: int, jobs: int, keep: bool, seed: int) -> dict:
+    """코퍼스 하나를 만들고 모든 단계 측정"""
+    root = Path(tempfile.mkdtemp(prefix=f"problem_bank_bench_{size}_"))
+    try:
+        print(f"\n🧪 합성 코퍼스 생성: {size:,}개 문제 → {root}")
+        start = time.perf_counter()
+        corpus = generate_corpus(root, size, seed)
+        print(f"   그림 {corpus['figures']:,}개, 원본 {corpus['source_files']}개 파일 "
+              f"({corpus['source_bytes'] / 1024 / 1024:.1f} MB), "
+              f"{time.perf_counter() - start:.1f}초")
+
+        stages = {}
+        for name, setup, call in STAGES:
+            if name == 'rebuild_metadata':
+                # 추출 결과를 웹 앱 데이터 위치로 이동 (실제 작업 흐름과 동일, 측정 제외)
+                shutil.move(str(root / "problems"), str(root / "web_app" / "data" / "problems"))
+
+            result = run_stage(root, name, setup, call, jobs)
+            if name == 'build_cold' and 'seconds' in result and corpus['figures']:
+                # 그림이 하나도 저장되지 않았으면 실패 경로(격리)의 시간을 잰 것
+                stored = len(list((root / ".figure_cache").glob("*.svg")))
+                if not stored:
+                    result = {'error': f"그림 {corpus['figures']:,}개 중 저장된 SVG 없음 "
+                                       f"(스텁 컴파일러 확인)"}
+            stages[name] = result
+            if 'seconds' in result:
+                print(f"   ⏱️  {name:<18} {result['seconds']:>9.2f}초  "
+                      f"(최대 RSS {result['max_rss_mb']:.0f} MB)")
+            elif 'skipped' in result:
+                print(f"   ⏭️  {name:<18} 스킵 ({result['skipped']})")
+            else:
+                print(f"   ❌ {name:<18} 실패: {result['error']}")
+
+        return {**corpus, 'stages': stages}
+    finally:
+        if keep:
+            print(f"   📁 코퍼스 유지: {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def load_history(history_file: Path) -> List[dict]:
+    if not history_file.exists():
+        return []
+    with file_lock(history_file, shared=True):
+        with open(history_file, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(history_file: Path, record: dict):
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(history_file):
+        with open(history_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def find_regressions(record: dict, history: List[dict], threshold: float) -> List[str]:
+    """같은 머신 / 같은 규모의 직전 기록보다 느려진 단계"""
+    previous = [
+        r for r in history
+        if r['host'] == record['host'] and r['problems'] == record['problems']
+        and r['jobs'] == record['jobs']
+    ]
+    if not previous:
+        return []
+
+    baseline = previous[-1]
+    regressions = []
+    for name, result in record['stages'].items():
+        before = baseline['stages'].get(name, {}).get('seconds')
+        after = result.get('seconds')
+        if before is None or after is None:
+            continue
+        if after > before * (1 + threshold) and after - before > MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{record['problems']:,}개 {name}: {before:.2f}초 → {after:.2f}초 "
+                f"(+{(after / before - 1) * 100:.0f}%, 기준 {baseline.get('commit') or '?'})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='합성 코퍼스 파이프라인 벤치마크',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, metavar='N',
+                        help=f'코퍼스 문제 수 (기본: {" ".join(map(str, DEFAULT_SIZES))})')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='build_all 병렬 워커 수 (기본: CPU 개수)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='코퍼스 생성 시드 (기본: 0, 같은 시드면 같은 코퍼스)')
+    parser.add_argument('--history', type=Path, default=HISTORY_FILE,
+                        help=f'결과 기록 파일 (기본: {HISTORY_FILE.relative_to(BASE_DIR)})')
+    parser.add_argument('--no-record', action='store_true',
+                        help='결과를 기록하지 않고 비교만')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'회귀로 볼 감속 비율 (기본: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='회귀가 있으면 종료 코드 1')
+    parser.add_argument('--keep', action='store_true',
+                        help='생성한 코퍼스 디렉토리를 지우지 않음')
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("파이프라인 벤치마크 - 합성 코퍼스")
+    print("=" * 70)
+
+    history = load_history(args.history)
+    environment = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': get_git_commit(),
+        'host': socket.gethostname(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'jobs': max(1, args.jobs),
+        'seed': args.seed,
+    }
+
+    regressions = []
+    failures = []
+    for size in args.sizes:
+        record = {**environment, **benchmark_size(size, max(1, args.jobs), args.keep, args.seed)}
+        failed = [name for name, result in record['stages'].items() if 'error' in result]
+        if failed:
+            # 실패한 측정은 기록하지 않음 (다음 회귀 비교의 기준이 되지 않도록)
+            failures += [f"{size:,}개 {name}: {record['stages'][name]['error']}" for name in failed]
+            continue
+        regressions += find_regressions(record, history, args.threshold)
+        if not args.no_record:
+            append_history(args.history, record)
+
+    print("\n" + "=" * 70)
+    if failures:
+        print(f"❌ 실패 {len(failures)}건 (기록하지 않음)")
+        for line in failures:
+            print(f"  {line}")
+    if regressions:
+        print(f"⚠️  회귀 {len(regressions)}건 (직전 기록 대비 {args.threshold * 100:.0f}% 이상 느려짐)")
+        for line in regressions:
+            print(f"  {line}")
+    else:
+        print("✅ 회귀 없음")
+    if not args.no_record:
+        print(f"📈 기록: {args.history}")
+    print("=" * 70)
+
+    if failures or (regressions and args.fail_on_regression):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
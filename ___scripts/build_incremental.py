@@ -10,20 +10,95 @@
 4. 개별 JSON 파일로 저장 (번들 대신)
 
 출력:
-- dist/problems/{id}.json  : 개별 문제 JSON
-- dist/svg/{id}_fig*.svg   : SVG 그림
+- dist/problems/{id}.json  : 문제 보기 payload (본문, 그림 목록; 공백 없음, --format으로 .msgpack / .cbor 추가)
+- dist/solutions/{id}.json : 풀이 payload (풀이 설명, 풀이를 열 때 지연 로드)
+- dist/print/{id}.json     : 인쇄용 전체 payload (--print-profile)
+- dist/svg/{id}_fig*.svg   : SVG 그림 (좌표 양자화 / 중복 속성·글리프 제거)
+- dist/svg-sprite/        : 글리프를 glyphs.svg로 모은 그림 (--svg-sprite)
 - dist/metadata.json       : 전체 메타데이터
-- .build_cache.json        : 빌드 캐시 (해시)
+- dist/**/*.br, *.gz       : 사전 압축본 (upload_to_r2.py가 Content-Encoding을 붙여 업로드)
+- .build_cache.db          : 빌드 캐시 (SQLite, 해시, 문제 / 그림별 소요 시간)
+- .figure_cache/{hash}.svg : 그림 저장소 (TikZ 코드 해시 기반)
+- .figure_cache/quarantine/{hash}.log : 컴파일 실패 그림 격리 (실패 로그)
+
+사용법:
+    python3 build_incremental.py             # CPU 개수만큼 병렬 빌드
+    python3 build_incremental.py --jobs 1    # 순차 빌드
+    python3 build_incremental.py --batch     # 문제별 그림 묶음 컴파일
+    python3 build_incremental.py --backend dvisvgm       # DVI + dvisvgm 렌더링
+    python3 build_incremental.py --benchmark-backends    # 백엔드 비교
+    python3 build_incremental.py --git-since             # 마지막 빌드 커밋 이후 변경분만
+    python3 build_incremental.py --git-since origin/main # 지정 커밋 이후 변경분만
+    python3 build_incremental.py --ids 245 246           # 지정 문제만
+    python3 build_incremental.py --range 200-260 --has-tikz  # 범위 + TikZ 문제만
+    python3 build_incremental.py --no-gc                 # 고아 dist/ 파일 정리 생략
+    python3 build_incremental.py --svg-sprite            # 공유 글리프 스프라이트 그림 추가 생성
+    python3 build_incremental.py --no-precompress        # .br / .gz 사전 압축 생략
+    python3 build_incremental.py --format json msgpack   # 출력 형식 (기본: 공백 없는 JSON)
+    python3 build_incremental.py --pretty                # 들여쓴 JSON (디버그용)
+    python3 build_incremental.py --print-profile         # 인쇄용 전체 payload 추가 생성
+    python3 build_incremental.py --watch                 # 저장할 때마다 바뀐 문제만 재빌드
+    python3 build_incremental.py --plan [--json]         # 빌드 계획 / 예상 시간만 출력
+    python3 build_incremental.py --trace                 # 단계별 trace + 소요 시간 표
+    python3 build_incremental.py -j 1 --profile build.prof  # cProfile
+    python3 build_incremental.py --metrics build_metrics.prom  # 실행 지표 (Prometheus / JSON lines)
 """
 
+import argparse
+import cProfile
 import hashlib
 import json
+import os
+import pstats
 import re
 import shutil
+import sqlite3
 import subprocess
+import sys
 import tempfile
+import threading
+import time
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext, redirect_stdout
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import build_trace
+from build_trace import span, traced
+from file_lock import file_lock
+from payload_profiles import (PROFILE_DIRS, configure as configure_profiles, json_size,
+                              problem_profiles, profile_signature, profile_sizes, project,
+                              summarize_sizes)
+from output_format import (FORMAT_SUFFIXES, configure as configure_output, format_signature,
+                           missing_packages, output_paths, output_suffixes, read_payload,
+                           write_payload)
+from precompress import precompress_dir, precompress_signature
+from run_metrics import RunMetrics
+from svg_optimize import build_sprite, optimize_svg_file, optimizer_signature
+
+# watch 모드: watchdog가 있으면 파일 시스템 이벤트(inotify 등)로 깨어나고, 없으면 stat 폴링
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+from tikz_render import (
+    BACKENDS,
+    DEFAULT_BACKEND,
+    DEFAULT_MEMORY_MB,
+    DEFAULT_TIMEOUT,
+    STANDALONE_TEMPLATE,
+    TIKZ_PATTERN,
+    FigureRenderer,
+    benchmark_backends,
+    compile_tikz_batch_to_svg,
+    compile_tikz_to_svg,
+    ensure_preamble_format,
+    get_backend,
+    get_toolchain_version,
+    pop_failure,
+)
 
 # 경로 설정
 BASE_DIR = Path(__file__).parent.parent
@@ -35,96 +110,556 @@ METADATA_FILE = BASE_DIR / "web_app" / "data" / "problems_metadata.json"
 DIST_DIR = BASE_DIR / "dist"
 DIST_PROBLEMS_DIR = DIST_DIR / "problems"
 DIST_SVG_DIR = DIST_DIR / "svg"
-DIST_METADATA_FILE = DIST_DIR / "metadata.json"
+DIST_METADATA_STEM = DIST_DIR / "metadata"  # 확장자는 출력 형식별
+DIST_SVG_SPRITE_DIR = DIST_DIR / "svg-sprite"
 
-# 캐시 파일
-CACHE_FILE = BASE_DIR / ".build_cache.json"
+# 캐시 파일 (SQLite WAL, 이전 JSON 캐시는 처음 열 때 가져옴)
+CACHE_FILE = BASE_DIR / ".build_cache.db"
+LEGACY_CACHE_FILE = BASE_DIR / ".build_cache.json"
 
-# TikZ 패턴
-TIKZ_PATTERN = re.compile(
-    r'\\begin\{tikzpicture\}.*?\\end\{tikzpicture\}',
-    re.DOTALL
-)
+# 그림 저장소 (TikZ 코드 내용 주소 기반)
+FIGURE_STORE_DIR = BASE_DIR / ".figure_cache"
 
-# standalone LaTeX 템플릿
-STANDALONE_TEMPLATE = r"""\documentclass[tikz,border=5pt]{standalone}
-\usepackage{tkz-euclide}
-\usepackage{xcolor}
-\begin{document}
-%s
-\end{document}
-"""
+# 스케줄링 비용 모델
+DEFAULT_FIGURE_COST = 2.0    # 소요 시간 기록이 없는 그림의 예상 컴파일 시간 (초)
+BASE_PROBLEM_COST = 0.01     # 그림 외 문제 처리 시간 (초)
+WORKER_PYTHON_MB = 128       # 워커 파이썬 프로세스 자체가 쓰는 메모리 추정치
+WORKER_MEMORY_MB = 512       # 그림 메모리 제한이 없을 때 워커 1개(파이썬 + pdflatex) 추정치
+
+# 컴파일 실패 그림 격리 (같은 키의 그림은 소스가 바뀔 때까지 재컴파일하지 않음)
+QUARANTINE_DIR = FIGURE_STORE_DIR / "quarantine"
+
+# 빌더 버전: 출력 형식이나 처리 로직이 바뀌면 올려서 모든 문제를 다시 빌드
+BUILDER_VERSION = "2"
+
+# 풀이 설명 텍스트 추출 규칙 (pattern, replacement, flags) - 순서대로 적용, 캐시 키에 포함
+SOLUTION_TEXT_RULES = [
+    # tikzpicture 환경 제거
+    (r'\\begin\{tikzpicture\}.*?\\end\{tikzpicture\}', '', re.DOTALL),
+    # center, figure 등 환경 제거
+    (r'\\begin\{center\}', '', 0),
+    (r'\\end\{center\}', '', 0),
+    (r'\\begin\{figure\}(\[.*?\])?', '', 0),
+    (r'\\end\{figure\}', '', 0),
+    # "답" 패턴 제거 (답안은 이미 metadata에 있음)
+    (r'답\s*[:：]\s*[^\\\n]+\\\\?', '', 0),
+    (r'답\s+[^\\\n]+\\\\?', '', 0),
+    # 연속된 공백/줄바꿈 정리
+    (r'\n\s*\n\s*\n+', '\n\n', 0),
+]
+
+# 파일 해시 (blake2b는 큰 버퍼와 함께 쓰면 sha256보다 빠름)
+HASH_ALGORITHMS = ('sha256', 'blake2b')
+DEFAULT_HASH_ALGORITHM = 'sha256'
+HASH_CHUNK_SIZE = 1024 * 1024
 
+# 이 시간 안에 수정된 파일은 같은 mtime으로 다시 수정될 수 있으므로 stat을 믿지 않음
+RACY_MTIME_WINDOW_NS = 2 * 10**9
 
-def compute_file_hash(filepath: Path) -> str:
-    """파일의 SHA256 해시 계산"""
-    if not filepath.exists():
+
+@traced()
+def compute_file_hash(filepath: Union[Path, str], algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """파일 해시 계산 (기본 SHA256)"""
+    if not os.path.exists(filepath):
         return ""
 
-    sha256 = hashlib.sha256()
+    hasher = hashlib.new(algorithm)
     with open(filepath, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
 
 
-def load_cache() -> Dict[str, str]:
-    """빌드 캐시 로드"""
-    if CACHE_FILE.exists():
-        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+_BASE_PREFIX = str(BASE_DIR) + os.sep
+
 
+def file_cache_key(path: Union[Path, str]) -> str:
+    """원본 파일의 stat / 해시 캐시 키 (file_{저장소 기준 경로}, 문제마다 불리므로 문자열로 계산)"""
+    text = str(path)
+    if text.startswith(_BASE_PREFIX):
+        return "file_" + text[len(_BASE_PREFIX):].replace(os.sep, '/')
+    return f"file_{Path(path).relative_to(BASE_DIR).as_posix()}"
 
-def save_cache(cache: Dict[str, str]):
-    """빌드 캐시 저장"""
-    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, indent=2)
 
+def cached_file_hash(filepath: Union[Path, str], cache: dict, paranoid: bool = False,
+                     algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """
+    stat 정보를 먼저 비교하는 파일 해시
 
-def compile_tikz_to_svg(tikz_code: str, output_path: Path) -> bool:
-    """tikzpicture 코드를 SVG로 변환"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        tex_file = tmpdir / "figure.tex"
-        pdf_file = tmpdir / "figure.pdf"
+    캐시의 file_{경로} 항목에 [size, mtime_ns, inode, 알고리즘, 해시]를 저장하고,
+    stat이 같으면 파일을 읽지 않고 저장된 해시를 돌려준다.
+    paranoid이면 항상 전체 해시를 계산한다.
+    """
+    try:
+        st = os.stat(filepath)
+    except FileNotFoundError:
+        return ""
+
+    build_trace.count('files_scanned')
+    stat_key = file_cache_key(filepath)
+    signature = [st.st_size, st.st_mtime_ns, st.st_ino, algorithm]
+
+    entry = cache.get(stat_key)
+    if not paranoid and entry and entry[:4] == signature:
+        return entry[4]
+
+    build_trace.count('files_hashed')
+    build_trace.count('bytes_hashed', st.st_size)
+    file_hash = compute_file_hash(filepath, algorithm)
+    if time.time_ns() - st.st_mtime_ns > RACY_MTIME_WINDOW_NS:
+        cache[stat_key] = signature + [file_hash]
+    return file_hash
+
+
+def problem_source_files(problem_id: str) -> Tuple[str, str]:
+    """문제의 원본 파일 경로 (문제, 풀이) - 변경 판정에서 문제마다 불리므로 Path 대신 문자열"""
+    return (f"{PROBLEMS_DIR}{os.sep}{problem_id}.tex",
+            f"{SOLUTIONS_DIR}{os.sep}{problem_id}_solution.tex")
+
+
+_build_fingerprints: Dict[str, str] = {}
+
+
+def compute_build_fingerprint(backend: Optional[str] = None) -> str:
+    """
+    모든 문제 출력에 공통으로 영향을 주는 입력의 해시
+
+    빌더 버전, standalone 템플릿, 툴체인(백엔드) 버전, 풀이 텍스트 추출 규칙, SVG 최적화 규칙,
+    출력 형식, payload 프로필
+    """
+    backend = backend or get_backend()
+    if backend not in _build_fingerprints:
+        rules = json.dumps([(p, r, int(f)) for p, r, f in SOLUTION_TEXT_RULES], ensure_ascii=False)
+        sha256 = hashlib.sha256()
+        for part in (BUILDER_VERSION, STANDALONE_TEMPLATE, get_toolchain_version(backend), rules,
+                     optimizer_signature(), format_signature(), profile_signature()):
+            sha256.update(part.encode('utf-8'))
+            sha256.update(b'\0')
+        _build_fingerprints[backend] = sha256.hexdigest()
+    return _build_fingerprints[backend]
+
+
+@traced()
+def compute_problem_hash(problem_id: str, problem_meta: dict, cache: dict,
+                         paranoid: bool = False,
+                         hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+                         backend: Optional[str] = None) -> str:
+    """
+    문제 JSON의 캐시 키: 출력에 영향을 주는 모든 입력의 결합 해시
+
+    문제 / 풀이 파일, 메타데이터 항목, 빌드 공통 입력(compute_build_fingerprint)
+    """
+    problem_file, solution_file = problem_source_files(problem_id)
+    problem_hash = cached_file_hash(problem_file, cache, paranoid, hash_algorithm)
+    solution_hash = cached_file_hash(solution_file, cache, paranoid, hash_algorithm)
+    meta_hash = hashlib.sha256(
+        json.dumps(problem_meta, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+    fingerprint = compute_build_fingerprint(backend)
+    return hashlib.sha256(f"{problem_hash}{solution_hash}{meta_hash}{fingerprint}".encode()).hexdigest()
+
+
+def index_problem_metadata(metadata: dict) -> Dict[str, dict]:
+    """문제 ID → 메타데이터 항목"""
+    return {p['id']: p for p in metadata['problems']}
+
+
+def has_solution_file(problem_id: str) -> bool:
+    """풀이 파일이 있는지 (목록의 has_solution, 풀이 payload 생성 기준)"""
+    solution_file = SOLUTIONS_DIR / f"{problem_id}_solution.tex"
+    try:
+        return solution_file.stat().st_size > 0
+    except FileNotFoundError:
+        return False
 
-        # standalone tex 파일 생성
-        tex_content = STANDALONE_TEMPLATE % tikz_code
-        with open(tex_file, 'w', encoding='utf-8') as f:
-            f.write(tex_content)
 
-        # pdflatex 컴파일
+def scan_build_tree() -> dict:
+    """
+    빌드 한 번 동안 재사용할 원본 / dist/ 디렉토리 목록
+
+    문제마다 파일을 하나씩 stat하지 않도록 디렉토리마다 scandir 한 번으로 읽는다.
+    빌드 전 상태이므로 변경 판정과 목록 / GC에만 쓴다.
+
+    Returns:
+        {'problems': 원본 파일이 있는 문제 ID, 'solutions': 비어 있지 않은 풀이가 있는 문제 ID,
+         'dist': 프로필 → dist/ 프로필 디렉토리의 파일 이름}
+    """
+    def entries(directory: Path) -> List[os.DirEntry]:
+        try:
+            with os.scandir(directory) as it:
+                return list(it)
+        except FileNotFoundError:
+            return []
+
+    solution_suffix = "_solution.tex"
+    solutions = set()
+    for entry in entries(SOLUTIONS_DIR):
+        if not entry.name.endswith(solution_suffix):
+            continue
+        try:
+            if entry.stat().st_size > 0:
+                solutions.add(entry.name[:-len(solution_suffix)])
+        except FileNotFoundError:
+            continue
+
+    return {
+        'problems': {entry.name[:-len(".tex")] for entry in entries(PROBLEMS_DIR)
+                     if entry.name.endswith(".tex") and entry.is_file()},
+        'solutions': solutions,
+        'dist': {profile: {entry.name for entry in entries(DIST_DIR / directory)}
+                 for profile, directory in PROFILE_DIRS.items()},
+    }
+
+
+def problem_output_files(problem_id: str) -> List[Path]:
+    """문제 하나가 dist/에 쓰는 payload 파일 (프로필 × 출력 형식)"""
+    files = []
+    for profile in problem_profiles(has_solution_file(problem_id)):
+        files += output_paths(DIST_DIR / PROFILE_DIRS[profile] / problem_id)
+    return files
+
+
+def has_problem_outputs(problem_id: str, tree: Optional[dict] = None) -> bool:
+    """문제의 payload 파일이 모두 있는지 (tree: scan_build_tree 결과, 없으면 파일마다 stat)"""
+    if tree is None:
+        return all(path.exists() for path in problem_output_files(problem_id))
+    suffixes = output_suffixes()
+    return all(
+        f"{problem_id}{suffix}" in tree['dist'][profile]
+        for profile in problem_profiles(problem_id in tree['solutions'])
+        for suffix in suffixes
+    )
+
+
+def is_problem_up_to_date(problem_id: str, problem_meta: dict, cache: dict,
+                          paranoid: bool = False,
+                          hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+                          backend: Optional[str] = None,
+                          retry_failed: bool = False,
+                          tree: Optional[dict] = None) -> bool:
+    """
+    캐시 키가 현재 입력과 같고 출력 파일이 모두 있으면 True
+
+    retry_failed이면 격리된 그림이 있는 문제는 변경이 없어도 다시 빌드 대상
+    tree: scan_build_tree 결과 (있으면 출력 파일 확인에 stat을 쓰지 않음)
+    """
+    combined_hash = compute_problem_hash(problem_id, problem_meta, cache, paranoid,
+                                         hash_algorithm, backend)
+    return (cache.get(f"problem_{problem_id}") == combined_hash
+            and has_problem_outputs(problem_id, tree)
+            and not (retry_failed and has_quarantined_figures(problem_id, backend)))
+
+
+# --git-since 인자 없이 사용 시: 캐시에 기록된 마지막 빌드 커밋 기준
+GIT_LAST_BUILD = "@last-build"
+GIT_LAST_BUILD_KEY = "git_last_build_commit"
+
+
+def run_git(*args: str) -> Optional[str]:
+    """저장소 루트에서 git 명령 실행 (실패 시 None)"""
+    try:
         result = subprocess.run(
-            ['pdflatex', '-interaction=nonstopmode', '-halt-on-error', tex_file.name],
-            cwd=tmpdir,
+            ['git', *args],
+            cwd=BASE_DIR,
             capture_output=True,
             text=True
         )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
 
-        if result.returncode != 0 or not pdf_file.exists():
-            print(f"    ❌ pdflatex 컴파일 실패")
-            return False
 
-        # pdf2svg 변환
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        result = subprocess.run(
-            ['pdf2svg', str(pdf_file), str(output_path)],
-            capture_output=True,
-            text=True
+def problem_id_from_path(rel_path: str) -> Optional[str]:
+    """저장소 기준 경로를 문제 ID로 변환 (문제 / 풀이 파일이 아니면 None)"""
+    path = BASE_DIR / rel_path
+    if path.suffix != '.tex':
+        return None
+    if path.parent == PROBLEMS_DIR:
+        return path.stem
+    if path.parent == SOLUTIONS_DIR and path.stem.endswith('_solution'):
+        return path.stem[:-len('_solution')]
+    return None
+
+
+def git_changed_problem_ids(ref: str) -> Optional[Set[str]]:
+    """
+    ref 이후 변경된 문제 ID (커밋, 스테이징, 작업 트리, 추적 안 된 파일 포함)
+
+    파일 시스템을 해시하는 대신 git이 이미 알고 있는 변경 정보를 사용한다.
+
+    Returns:
+        문제 ID 집합, git을 쓸 수 없거나 ref가 잘못되었으면 None
+    """
+    problems_rel = PROBLEMS_DIR.relative_to(BASE_DIR).as_posix()
+    changed = run_git('diff', '--name-only', '--no-renames', ref, '--', problems_rel)
+    untracked = run_git('ls-files', '--others', '--exclude-standard', '--', problems_rel)
+    if changed is None or untracked is None:
+        return None
+
+    problem_ids = set()
+    for rel_path in (changed + untracked).splitlines():
+        problem_id = problem_id_from_path(rel_path.strip())
+        if problem_id:
+            problem_ids.add(problem_id)
+    return problem_ids
+
+
+def problem_cache_entries(problem_id: str, cache: dict) -> dict:
+    """문제 빌드에 필요한 캐시 항목만 추출 (워커 전달용)"""
+    # DIST_SETTLED_KEY: 빌드하면 지우는 항목이라 이전 값이 있어야 업데이트로 돌아옴
+    keys = [f"problem_{problem_id}", DIST_SETTLED_KEY] + [
+        file_cache_key(path) for path in problem_source_files(problem_id)
+    ]
+    return {k: cache[k] for k in keys if k in cache}
+
+
+_MISSING = object()
+
+
+class BuildCache(MutableMapping):
+    """
+    SQLite(WAL) 기반 빌드 캐시
+
+    dict처럼 쓰되 항목을 바꿀 때마다 바로 커밋하므로, 빌드가 중단되어도
+    그때까지 완료된 문제 / 그림의 기록이 남아 다음 빌드가 이어서 진행한다.
+    WAL 모드라 빌드 중에도 다른 프로세스가 일관된 스냅샷을 읽을 수 있고,
+    동시에 실행된 빌드의 쓰기는 SQLite 잠금으로 항목 단위로 직렬화된다.
+    읽기는 열 때 올려둔 메모리 사본에서 처리한다.
+    """
+
+    def __init__(self, path: Path = CACHE_FILE):
+        self.path = path
+        self._conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        # 값마다 json.loads를 부르지 않고 한 배열로 묶어 한 번에 디코딩 (항목 수만큼 호출 비용)
+        rows = self._conn.execute("SELECT key, value FROM cache").fetchall()
+        values = json.loads(f"[{','.join(value for _, value in rows)}]")
+        self._data = dict(zip((key for key, _ in rows), values))
+        self._undo: Optional[List[Tuple[str, object]]] = None
+
+    def __getitem__(self, key: str):
+        return self._data[key]
+
+    def get(self, key: str, default=None):
+        return self._data.get(key, default)
+
+    def __setitem__(self, key: str, value):
+        self._remember(key)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+            (key, json.dumps(value))
         )
+        self._data[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self._data:
+            raise KeyError(key)
+        self._remember(key)
+        self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remember(self, key: str):
+        """트랜잭션 중이면 롤백용으로 이전 값 기록"""
+        if self._undo is not None:
+            self._undo.append((key, self._data.get(key, _MISSING)))
+
+    @contextmanager
+    def transaction(self):
+        """블록 안의 변경을 한 번에 커밋 (예외가 나면 모두 취소)"""
+        if self._undo is not None:
+            yield
+            return
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._undo = []
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            for key, value in reversed(self._undo):
+                if value is _MISSING:
+                    self._data.pop(key, None)
+                else:
+                    self._data[key] = value
+            raise
+        else:
+            self._conn.execute("COMMIT")
+        finally:
+            self._undo = None
+
+    def update(self, *args, **kwargs):
+        """여러 항목을 하나의 트랜잭션으로 갱신"""
+        with self.transaction():
+            super().update(*args, **kwargs)
+
+    def close(self):
+        """WAL 내용을 본 파일에 반영하고 연결 종료"""
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._conn.close()
+
+
+def _cache_transaction(cache: dict):
+    """BuildCache이면 트랜잭션, 워커의 dict 사본이면 아무것도 하지 않는 컨텍스트"""
+    if isinstance(cache, BuildCache):
+        return cache.transaction()
+    return nullcontext()
+
+
+@traced()
+def load_cache() -> BuildCache:
+    """빌드 캐시 열기 (이전 JSON 캐시가 있으면 한 번 가져온 뒤 삭제)"""
+    # 동시에 시작한 빌드가 변환을 중복하지 않도록 잠금
+    with file_lock(CACHE_FILE):
+        is_new = not CACHE_FILE.exists()
+        cache = BuildCache(CACHE_FILE)
+        if is_new and LEGACY_CACHE_FILE.exists():
+            with open(LEGACY_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache.update(json.load(f))
+            LEGACY_CACHE_FILE.unlink()
+            print(f"📦 이전 빌드 캐시 변환: {LEGACY_CACHE_FILE.name} → {CACHE_FILE.name}")
+    return cache
+
+
+def read_cache_snapshot() -> dict:
+    """
+    빌드 캐시를 읽기 전용으로 읽은 dict 사본 (--plan용)
+
+    load_cache와 달리 이전 JSON 캐시를 변환 / 삭제하거나 저장소에 쓰지 않는다.
+    """
+    if CACHE_FILE.exists():
+        conn = sqlite3.connect(f"{CACHE_FILE.resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+        try:
+            return {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM cache")}
+        finally:
+            conn.close()
+    if LEGACY_CACHE_FILE.exists():
+        with open(LEGACY_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache: BuildCache):
+    """
+    빌드 캐시 닫기
+
+    항목은 바뀔 때마다 이미 커밋되어 있으므로 WAL 체크포인트만 수행
+    """
+    cache.close()
+
+
+def normalize_tikz_code(tikz_code: str) -> str:
+    """
+    캐시 키용 TikZ 코드 정규화
+
+    줄 앞뒤 공백, 빈 줄, 주석 전용 줄은 결과 그림에 영향을 주지 않으므로 제거
+    """
+    lines = []
+    for line in tikz_code.split('\n'):
+        line = line.strip()
+        if not line or line.startswith('%'):
+            continue
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def compute_figure_key(tikz_code: str, backend: Optional[str] = None) -> str:
+    """그림 캐시 키: (정규화된 TikZ 코드 + 템플릿 + 툴체인 버전)의 SHA256"""
+    sha256 = hashlib.sha256()
+    for part in (normalize_tikz_code(tikz_code), STANDALONE_TEMPLATE, get_toolchain_version(backend)):
+        sha256.update(part.encode('utf-8'))
+        sha256.update(b'\0')
+    return sha256.hexdigest()
+
+
+@traced()
+def restore_stored_figure(figure_key: str, output_path: Path) -> bool:
+    """그림 저장소에 있는 SVG를 output_path로 복사 (없으면 False)"""
+    stored_svg = FIGURE_STORE_DIR / f"{figure_key}.svg"
+    if not stored_svg.exists():
+        return False
+
+    # 업로드 중에도 완전한 파일만 보이도록 임시 파일에 쓴 뒤 교체
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_svg = output_path.with_suffix(f".{os.getpid()}.tmp")
+    shutil.copyfile(stored_svg, tmp_svg)
+    os.replace(tmp_svg, output_path)
+    print(f"    ♻️  그림 저장소에서 재사용 ({figure_key[:12]})")
+    return True
+
+
+@traced()
+def store_figure(figure_key: str, svg_path: Path):
+    """컴파일된 SVG를 그림 저장소에 등록"""
+    stored_svg = FIGURE_STORE_DIR / f"{figure_key}.svg"
+
+    # 병렬 빌드에서도 안전하도록 임시 파일에 쓴 뒤 교체
+    FIGURE_STORE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_svg = stored_svg.with_suffix(f".{os.getpid()}.tmp")
+    shutil.copyfile(svg_path, tmp_svg)
+    os.replace(tmp_svg, stored_svg)
+
+
+def is_quarantined(figure_key: str) -> bool:
+    """이전 빌드에서 컴파일에 실패해 격리된 그림인지 확인"""
+    return (QUARANTINE_DIR / f"{figure_key}.log").exists()
 
-        if result.returncode != 0:
-            print(f"    ❌ pdf2svg 변환 실패: {result.stderr}")
-            return False
 
-        return True
+def quarantine_figure(figure_key: str, svg_filename: str, log: str):
+    """컴파일 실패 그림을 실패 로그와 함께 격리"""
+    QUARANTINE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(QUARANTINE_DIR / f"{figure_key}.log", 'w', encoding='utf-8') as f:
+        f.write(f"% {svg_filename}\n{log}\n")
 
 
-def process_tikz_in_content(content: str, problem_id: str) -> Tuple[str, List[str]]:
+def release_figure(figure_key: str):
+    """격리 해제 (재시도 성공 시)"""
+    quarantine_file = QUARANTINE_DIR / f"{figure_key}.log"
+    if quarantine_file.exists():
+        quarantine_file.unlink()
+
+
+def has_quarantined_figures(problem_id: str, backend: Optional[str] = None) -> bool:
+    """풀이의 그림 중 격리된 것이 있는지 (--retry-failed 재빌드 판정)"""
+    solution_file = SOLUTIONS_DIR / f"{problem_id}_solution.tex"
+    if not solution_file.exists():
+        return False
+
+    with open(solution_file, 'r', encoding='utf-8') as f:
+        solution = f.read()
+    return any(is_quarantined(compute_figure_key(match.group(), backend))
+               for match in TIKZ_PATTERN.finditer(solution))
+
+
+@traced()
+def process_tikz_in_content(content: str, problem_id: str, batch: bool = False,
+                            retry_failed: bool = False,
+                            timings: Optional[Dict[str, float]] = None,
+                            retryable: Optional[List[str]] = None) -> Tuple[str, List[str]]:
     """
     content에서 tikzpicture를 찾아 SVG로 변환하고 마커로 대체
 
+    그림 저장소에는 컴파일 결과를 그대로 두고, dist/svg에 쓸 때마다 최적화한다
+    (최적화 규칙이 바뀌어도 TeX를 다시 실행하지 않음).
+
+    Args:
+        batch: True이면 저장소에 없는 그림들을 한 문서로 묶어 한 번에 컴파일
+        retry_failed: True이면 격리된 그림도 다시 컴파일
+        timings: 주어지면 컴파일한 그림의 소요 시간(초)을 그림 키별로 기록
+        retryable: 주어지면 실행 파일이 없어 (returncode 127) 실패해
+            격리하지 않은 그림의 키를 추가
+
     Returns:
         (변환된 content, 생성된 SVG 파일명 리스트)
     """
@@ -133,24 +668,82 @@ def process_tikz_in_content(content: str, problem_id: str) -> Tuple[str, List[st
     if not tikz_matches:
         return content, []
 
+    svg_filenames = [f"{problem_id}_fig{n}.svg" for n in range(1, len(tikz_matches) + 1)]
+    succeeded = [False] * len(tikz_matches)
+    pending = []  # 컴파일이 필요한 그림 인덱스
+
+    for idx, match in enumerate(tikz_matches):
+        svg_filename = svg_filenames[idx]
+        print(f"    [{idx + 1}/{len(tikz_matches)}] {svg_filename} 변환 중...")
+
+        figure_key = compute_figure_key(match.group())
+        if restore_stored_figure(figure_key, DIST_SVG_DIR / svg_filename):
+            build_trace.count('figures_restored')
+            succeeded[idx] = True
+        elif is_quarantined(figure_key) and not retry_failed:
+            build_trace.count('figures_quarantined')
+            print(f"    🚫 이전에 실패한 그림 ({figure_key[:12]}), 소스 변경 전까지 스킵")
+        else:
+            pending.append((idx, figure_key))
+
+    if pending:
+        tikz_codes = [tikz_matches[idx].group() for idx, _ in pending]
+        svg_paths = [DIST_SVG_DIR / svg_filenames[idx] for idx, _ in pending]
+
+        if batch and len(pending) > 1:
+            print(f"    📚 {len(pending)}개 그림 묶음 컴파일")
+            start = time.perf_counter()
+            results = compile_tikz_batch_to_svg(tikz_codes, svg_paths)
+            # 묶음 컴파일은 그림별 시간을 알 수 없으므로 균등 분배
+            durations = [(time.perf_counter() - start) / len(pending)] * len(pending)
+        else:
+            results = []
+            durations = []
+            for tikz_code, svg_path in zip(tikz_codes, svg_paths):
+                start = time.perf_counter()
+                results.append(compile_tikz_to_svg(tikz_code, svg_path))
+                durations.append(time.perf_counter() - start)
+
+        if timings is not None:
+            for (_, figure_key), seconds in zip(pending, durations):
+                timings[figure_key] = round(seconds, 3)
+
+        for (idx, figure_key), svg_path, ok in zip(pending, svg_paths, results):
+            if ok:
+                build_trace.count('figures_compiled')
+                store_figure(figure_key, svg_path)
+                release_figure(figure_key)
+                succeeded[idx] = True
+            else:
+                build_trace.count('figures_failed')
+                log, is_retryable = pop_failure(svg_path)
+                if is_retryable:
+                    # 그림이 아니라 실행 환경 문제이므로 격리하지 않고 다음 빌드에서 다시 시도
+                    build_trace.count('figures_retryable')
+                    print(f"    ⚠️  {svg_path.name} 실행 환경 문제로 실패, 다음 빌드에서 재시도")
+                    if retryable is not None:
+                        retryable.append(figure_key)
+                else:
+                    quarantine_figure(figure_key, svg_path.name, log)
+
     svg_files = []
     new_content = content
 
-    # 뒤에서부터 처리 (인덱스 유지)
-    for idx, match in enumerate(reversed(tikz_matches)):
-        fig_num = len(tikz_matches) - idx
-        svg_filename = f"{problem_id}_fig{fig_num}.svg"
-        svg_path = DIST_SVG_DIR / svg_filename
-
-        tikz_code = match.group()
-
-        print(f"    [{fig_num}/{len(tikz_matches)}] {svg_filename} 변환 중...")
+    # 뒤에서부터 대체 (인덱스 유지)
+    for idx in reversed(range(len(tikz_matches))):
+        match = tikz_matches[idx]
+        svg_filename = svg_filenames[idx]
 
-        if compile_tikz_to_svg(tikz_code, svg_path):
+        if succeeded[idx]:
             # tikzpicture를 SVG 마커로 대체
             svg_marker = f"% [SVG: {svg_filename}]"
             new_content = new_content[:match.start()] + svg_marker + new_content[match.end():]
             svg_files.append(svg_filename)
+            with span("optimize_svg"):
+                before, after = optimize_svg_file(DIST_SVG_DIR / svg_filename)
+            build_trace.count('svg_bytes_before', before)
+            build_trace.count('svg_bytes_after', after)
+            build_trace.count('bytes_written', after)
             print(f"    ✅ {svg_filename} 생성 완료")
         else:
             print(f"    ⚠️  {svg_filename} 변환 실패, 원본 유지")
@@ -158,6 +751,7 @@ def process_tikz_in_content(content: str, problem_id: str) -> Tuple[str, List[st
     return new_content, list(reversed(svg_files))
 
 
+@traced()
 def load_problem_content(problem_id: str) -> str:
     """문제 내용 로드 (원본 유지)"""
     problem_file = PROBLEMS_DIR / f"{problem_id}.tex"
@@ -171,6 +765,7 @@ def load_problem_content(problem_id: str) -> str:
     return ""
 
 
+@traced()
 def extract_solution_text(solution_content: str) -> str:
     """
     solution에서 tikzpicture 환경을 제거하고 설명 텍스트만 추출
@@ -186,31 +781,16 @@ def extract_solution_text(solution_content: str) -> str:
     content_lines = [line for line in lines if not line.strip().startswith('%')]
     text = '\n'.join(content_lines)
 
-    # tikzpicture 환경 제거
-    text = re.sub(
-        r'\\begin\{tikzpicture\}.*?\\end\{tikzpicture\}',
-        '',
-        text,
-        flags=re.DOTALL
-    )
-
-    # center, figure 등 환경 제거
-    text = re.sub(r'\\begin\{center\}', '', text)
-    text = re.sub(r'\\end\{center\}', '', text)
-    text = re.sub(r'\\begin\{figure\}(\[.*?\])?', '', text)
-    text = re.sub(r'\\end\{figure\}', '', text)
+    # tikzpicture / center / figure 환경, "답" 패턴 제거 및 공백 정리
+    for pattern, replacement, flags in SOLUTION_TEXT_RULES:
+        text = re.sub(pattern, replacement, text, flags=flags)
 
-    # "답" 패턴 제거 (답안은 이미 metadata에 있음)
-    text = re.sub(r'답\s*[:：]\s*[^\\\n]+\\\\?', '', text)
-    text = re.sub(r'답\s+[^\\\n]+\\\\?', '', text)
-
-    # 연속된 공백/줄바꿈 정리
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
     text = text.strip()
 
     return text if text else ""
 
 
+@traced()
 def load_solution_content(problem_id: str) -> str:
     """풀이 내용 로드 (원본 유지)"""
     solution_file = SOLUTIONS_DIR / f"{problem_id}_solution.tex"
@@ -220,75 +800,653 @@ def load_solution_content(problem_id: str) -> str:
     return ""
 
 
-def build_problem_json(problem_id: str, metadata: dict, cache: Dict[str, str]) -> Optional[dict]:
+def build_problem_json(problem_id: str, problem_meta: dict, cache: dict,
+                       batch: bool = False, retry_failed: bool = False,
+                       paranoid: bool = False,
+                       hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+                       tree: Optional[dict] = None) -> Optional[dict]:
     """
     단일 문제의 JSON 파일 생성
 
+    Args:
+        problem_meta: problems_metadata.json의 이 문제 항목
+        batch: 풀이의 그림들을 한 번의 pdflatex 실행으로 묶어 컴파일
+        retry_failed: 격리된 그림도 다시 컴파일
+        paranoid: stat 비교 없이 항상 전체 해시 계산
+        hash_algorithm: 파일 해시 알고리즘 (sha256 / blake2b)
+        tree: scan_build_tree 결과 (있으면 출력 파일 확인에 stat을 쓰지 않음)
+
     Returns:
         변경사항이 있으면 문제 데이터 dict, 없으면 None
     """
-    print(f"\n📄 문제 {problem_id} 처리 중...")
+    with span("build_problem_json", problem=problem_id):
+        print(f"\n📄 문제 {problem_id} 처리 중...")
+
+        # 캐시 키 계산 (원본 / 메타데이터 / 템플릿 / 빌더 버전, stat이 같으면 캐시된 파일 해시 사용)
+        combined_hash = compute_problem_hash(problem_id, problem_meta, cache, paranoid, hash_algorithm)
+
+        cache_key = f"problem_{problem_id}"
+
+        # 캐시 확인 (증분 빌드, --retry-failed이면 격리된 그림이 있는 문제는 다시 빌드)
+        if (cache.get(cache_key) == combined_hash and has_problem_outputs(problem_id, tree)
+                and not (retry_failed and has_quarantined_figures(problem_id))):
+            print(f"  ⏭️  변경 없음, 스킵")
+            return None
+
+        start = time.perf_counter()
+
+        # 문제 내용 로드
+        content = load_problem_content(problem_id)
+        solution = load_solution_content(problem_id)
+
+        # 풀이에서 tikzpicture 처리
+        figure_timings = {}
+        retryable_figures = []
+        if solution:
+            solution, svg_files = process_tikz_in_content(
+                solution, problem_id, batch=batch, retry_failed=retry_failed,
+                timings=figure_timings, retryable=retryable_figures
+            )
+            # 풀이 설명 텍스트 추출
+            solution_text = extract_solution_text(solution)
+        else:
+            svg_files = []
+            solution_text = ""
+
+        # 통합 데이터 (프로필별로 필요한 필드만 나눠 저장)
+        has_solution = has_solution_file(problem_id)
+        problem_data = {
+            **problem_meta,
+            'content': content,
+            'solution': solution,
+            'solution_text': solution_text,  # 설명 텍스트 추가
+            'svg_files': svg_files,
+            'has_solution': has_solution
+        }
+
+        # 프로필 × 출력 형식별 저장 (임시 파일에 쓴 뒤 교체)
+        profiles = problem_profiles(has_solution)
+        with span("write_problem_json"):
+            for profile in profiles:
+                output_stem = DIST_DIR / PROFILE_DIRS[profile] / problem_id
+                output_stem.parent.mkdir(parents=True, exist_ok=True)
+                payload = project(problem_data, profile, problem_meta)
+                build_trace.count('bytes_written', write_payload(output_stem, payload))
+            # 풀이가 사라졌으면 풀이 payload도 삭제 (형식별 파일은 write_payload가 정리)
+            if not has_solution:
+                for path in output_paths(DIST_DIR / PROFILE_DIRS['solution'] / problem_id):
+                    if path.exists():
+                        path.unlink()
+
+        # 캐시 업데이트 (해시 + 스케줄링용 소요 시간 + GC용 SVG 목록)
+        # 한 트랜잭션으로 커밋: 해시만 기록되고 SVG 목록이 이전 값이면 GC가 살아 있는 SVG를 삭제
+        with _cache_transaction(cache):
+            # 환경 문제로 실패한 그림이 있으면 해시를 비워 다음 빌드에서 다시 빌드
+            cache[cache_key] = None if retryable_figures else combined_hash
+            # dist/가 바뀌었으므로 다음 빌드는 GC / 사전 압축을 건너뛰지 않음
+            cache[DIST_SETTLED_KEY] = None
+            cache[f"svg_files_{problem_id}"] = svg_files
+            cache[f"time_problem_{problem_id}"] = round(time.perf_counter() - start, 3)
+            cache[f"profile_bytes_{problem_id}"] = profile_sizes(problem_data, problem_meta)
+            for figure_key, seconds in figure_timings.items():
+                cache[f"time_figure_{figure_key}"] = seconds
+
+        print(f"  ✅ {problem_id} 생성 완료 ({', '.join(profiles)})")
+
+        return problem_data
+
+
+def estimate_problem_cost(problem_id: str, cache: dict, default_figure_cost: float,
+                          backend: Optional[str] = None) -> float:
+    """
+    문제 빌드 예상 소요 시간 (초)
 
-    # 파일 경로
-    problem_file = PROBLEMS_DIR / f"{problem_id}.tex"
+    그림 저장소에 있거나 격리된 그림은 비용 0, 기록된 그림은 기록된 시간,
+    처음 보는 그림은 default_figure_cost로 계산한다.
+    """
     solution_file = SOLUTIONS_DIR / f"{problem_id}_solution.tex"
-    output_file = DIST_PROBLEMS_DIR / f"{problem_id}.json"
+    if not solution_file.exists():
+        return BASE_PROBLEM_COST
 
-    # 파일 해시 계산
-    problem_hash = compute_file_hash(problem_file)
-    solution_hash = compute_file_hash(solution_file)
-    combined_hash = hashlib.sha256(f"{problem_hash}{solution_hash}".encode()).hexdigest()
+    with open(solution_file, 'r', encoding='utf-8') as f:
+        solution = f.read()
 
-    cache_key = f"problem_{problem_id}"
-
-    # 캐시 확인 (증분 빌드)
-    if cache.get(cache_key) == combined_hash and output_file.exists():
-        print(f"  ⏭️  변경 없음, 스킵")
+    cost = BASE_PROBLEM_COST
+    for match in TIKZ_PATTERN.finditer(solution):
+        figure_key = compute_figure_key(match.group(), backend)
+        if (FIGURE_STORE_DIR / f"{figure_key}.svg").exists() or is_quarantined(figure_key):
+            continue
+        cost += cache.get(f"time_figure_{figure_key}", default_figure_cost)
+    return cost
+
+
+def get_available_memory_mb() -> Optional[int]:
+    """사용 가능한 메모리 (MB), 알 수 없으면 None"""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
         return None
 
-    # 문제 내용 로드
-    content = load_problem_content(problem_id)
-    solution = load_solution_content(problem_id)
-
-    # 풀이에서 tikzpicture 처리
-    if solution:
-        solution, svg_files = process_tikz_in_content(solution, problem_id)
-        # 풀이 설명 텍스트 추출
-        solution_text = extract_solution_text(solution)
-    else:
-        svg_files = []
-        solution_text = ""
-
-    # 메타데이터 찾기
-    problem_meta = next(
-        (p for p in metadata['problems'] if p['id'] == problem_id),
-        {'id': problem_id}
-    )
 
-    # 통합 데이터
-    problem_data = {
-        **problem_meta,
-        'content': content,
-        'solution': solution,
-        'solution_text': solution_text,  # 설명 텍스트 추가
-        'svg_files': svg_files
+def worker_memory_budget_mb(memory_mb: int = DEFAULT_MEMORY_MB) -> int:
+    """
+    워커 1개의 메모리 예산 (MB)
+
+    워커는 그림 명령을 한 번에 하나씩 실행하므로 파이썬 프로세스 + 그림 메모리 제한
+    (RLIMIT_AS, --figure-memory)까지 커질 수 있다. 제한이 없으면 WORKER_MEMORY_MB.
+    """
+    if not memory_mb:
+        return WORKER_MEMORY_MB
+    return WORKER_PYTHON_MB + memory_mb
+
+
+def cap_jobs_by_memory(jobs: int, memory_mb: int = DEFAULT_MEMORY_MB) -> int:
+    """사용 가능한 메모리로 감당할 수 있는 워커 수로 제한 (memory_mb: 그림 메모리 제한)"""
+    available_mb = get_available_memory_mb()
+    if available_mb is None:
+        return jobs
+    return max(1, min(jobs, available_mb // worker_memory_budget_mb(memory_mb)))
+
+
+def default_figure_cost(cache: dict) -> float:
+    """기록이 없는 그림의 예상 컴파일 시간: 기록된 그림 시간의 평균"""
+    figure_times = [v for k, v in cache.items() if k.startswith("time_figure_")]
+    return sum(figure_times) / len(figure_times) if figure_times else DEFAULT_FIGURE_COST
+
+
+def estimate_wall_time(costs: List[float], jobs: int) -> float:
+    """Longest Job First로 jobs개 워커에 나눠 실행할 때의 예상 소요 시간 (초)"""
+    loads = [0.0] * max(1, jobs)
+    for cost in sorted(costs, reverse=True):
+        loads[loads.index(min(loads))] += cost
+    return max(loads)
+
+
+@traced()
+def schedule_longest_first(problem_ids: List[str], cache: dict,
+                           backend: Optional[str] = None) -> Tuple[List[str], float]:
+    """
+    예상 비용이 큰 문제부터 실행하도록 정렬 (Longest Job First)
+
+    Returns:
+        (실행 순서, 예상 총 작업량 초)
+    """
+    default_cost = default_figure_cost(cache)
+    costs = {pid: estimate_problem_cost(pid, cache, default_cost, backend) for pid in problem_ids}
+    # 비용이 같으면 원래 순서 유지 (sorted는 안정 정렬)
+    order = sorted(problem_ids, key=lambda pid: -costs[pid])
+    return order, sum(costs.values())
+
+
+# 워커 프로세스 전역 상태 (ProcessPoolExecutor initializer에서 설정)
+_worker_meta_index: Dict[str, dict] = {}
+_worker_options: dict = {}
+
+
+def _init_worker(meta_index: Dict[str, dict], options: dict, scratch_root: Path,
+                 renderer_options: dict, tracing: bool = False):
+    """
+    워커 프로세스 초기화 - 메타데이터와 빌드 옵션을 한 번만 전달
+
+    워커마다 재사용 작업 디렉토리를 가진 FigureRenderer를 띄워 두고
+    빌드가 끝날 때까지 그림 컴파일에 사용한다 (디렉토리는 부모가 정리).
+    """
+    global _worker_meta_index, _worker_options
+    _worker_meta_index = meta_index
+    _worker_options = options
+    # fork로 복사된 부모의 span / 카운터는 버리고 워커 것만 기록
+    build_trace.reset(tracing)
+    FigureRenderer(workers=1, scratch_root=scratch_root / f"pid{os.getpid()}",
+                   **renderer_options).start()
+
+
+def _build_problem_worker(problem_id: str,
+                          cache_entries: dict) -> Tuple[Optional[dict], dict, dict]:
+    """
+    워커 프로세스에서 단일 문제 빌드
+
+    Args:
+        cache_entries: problem_cache_entries로 추출한 이 문제의 캐시 항목
+
+    Returns:
+        (문제 데이터 또는 None, 캐시 업데이트 dict, 기록된 span / 카운터)
+    """
+    local_cache = dict(cache_entries)
+    problem_meta = _worker_meta_index.get(problem_id, {'id': problem_id})
+    result = build_problem_json(problem_id, problem_meta, local_cache, **_worker_options)
+    updates = {k: v for k, v in local_cache.items() if cache_entries.get(k) != v}
+    return result, updates, build_trace.drain()
+
+
+@traced()
+def build_problems(problem_ids: List[str], metadata: dict, cache: dict,
+                   jobs: int = 1, renderer_options: Optional[dict] = None,
+                   tree: Optional[dict] = None, **options) -> List[Optional[dict]]:
+    """
+    문제 목록 빌드 (jobs > 1이면 프로세스 풀 사용)
+
+    그림은 빌드 동안 유지되는 FigureRenderer 워커가 컴파일한다.
+    병렬 빌드는 예상 비용이 큰 문제부터 제출하고 (Longest Job First),
+    캐시 업데이트는 문제가 끝나는 대로 커밋해 중단되어도 진행 상황이 남는다.
+    결과는 problem_ids 순서로 반환되므로 순차 빌드와 동일한 dist/ 출력을 생성한다.
+    renderer_options는 FigureRenderer(백엔드, 시간 / 메모리 제한)에,
+    options는 build_problem_json에 그대로 전달된다.
+    tree(scan_build_tree 결과)는 변경 없는 문제를 stat 없이 걸러내는 데만 쓴다.
+
+    Returns:
+        problem_ids 순서의 결과 리스트 (변경 없으면 None)
+    """
+    renderer_options = renderer_options or {}
+    meta_index = index_problem_metadata(metadata)
+
+    if jobs <= 1 or len(problem_ids) <= 1:
+        with FigureRenderer(workers=1, **renderer_options):
+            return [
+                build_problem_json(pid, meta_index.get(pid, {'id': pid}), cache, tree=tree,
+                                   **options)
+                for pid in problem_ids
+            ]
+
+    # 변경 없는 문제는 워커에 보내지 않음 (stat 비교로 빠르게 판정)
+    hash_options = {k: options[k] for k in ('paranoid', 'hash_algorithm', 'retry_failed')
+                    if k in options}
+    dirty_ids = [
+        pid for pid in problem_ids
+        if not is_problem_up_to_date(pid, meta_index.get(pid, {'id': pid}), cache,
+                                     backend=renderer_options.get('backend'), tree=tree,
+                                     **hash_options)
+    ]
+    print(f"🔍 변경된 문제: {len(dirty_ids)}개 / {len(problem_ids)}개")
+    if not dirty_ids:
+        return [None] * len(problem_ids)
+
+    order, total_cost = schedule_longest_first(dirty_ids, cache, renderer_options.get('backend'))
+    print(f"📐 예상 작업량: {total_cost:.1f}초 / 워커 {jobs}개 ≈ {total_cost / jobs:.1f}초")
+
+    scratch_root = Path(tempfile.mkdtemp(prefix="build_incremental_"))
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(meta_index, options, scratch_root, renderer_options,
+                                           build_trace.is_enabled())) as executor:
+            futures = {
+                executor.submit(_build_problem_worker, pid, problem_cache_entries(pid, cache)): pid
+                for pid in order
+            }
+            results_by_id = {}
+            try:
+                for future in as_completed(futures):
+                    result, updates, telemetry = future.result()
+                    cache.update(updates)
+                    build_trace.merge(telemetry)
+                    results_by_id[futures[future]] = result
+            except BaseException:
+                # 중단 시 대기 중인 문제는 버림 (완료된 문제는 이미 캐시에 커밋됨)
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        shutil.rmtree(scratch_root, ignore_errors=True)
+
+    return [results_by_id.get(pid) for pid in problem_ids]
+
+
+# 문제 ID별 캐시 항목 접두사 (문제가 사라지면 GC 대상)
+PROBLEM_CACHE_PREFIXES = ("problem_", "time_problem_", "svg_files_", "profile_bytes_")
+
+# dist/가 마지막 빌드 그대로일 때 재사용할 GC / 사전 압축 / 크기 합계 (문제를 빌드하거나 목록이 바뀌면 비움)
+DIST_SETTLED_KEY = "dist_settled"
+
+# dist/metadata의 [입력 해시, 목록 크기] (입력이 같으면 다시 쓰지 않음)
+DIST_METADATA_KEY = "dist_metadata_input"
+
+# 이보다 오래된 임시 파일은 중단된 빌드가 남긴 것으로 보고 정리 (초)
+STALE_TMP_SECONDS = 3600
+
+# --trace 기본 출력 파일 (Chrome / Perfetto trace)
+DEFAULT_TRACE_FILE = BASE_DIR / "build_trace.json"
+
+# watch 모드에서 원본 stat을 다시 비교하는 주기 (초, 이벤트가 없을 때)
+WATCH_POLL_INTERVAL = 0.3
+
+
+def live_svg_files(problem_id: str, cache: dict) -> List[str]:
+    """문제 JSON이 참조하는 SVG 파일 목록 (캐시에 없으면 dist payload에서 읽음)"""
+    svg_files = cache.get(f"svg_files_{problem_id}")
+    if svg_files is not None:
+        return svg_files
+
+    payload = read_payload(DIST_PROBLEMS_DIR / problem_id)
+    return payload.get('svg_files', []) if isinstance(payload, dict) else []
+
+
+def find_garbage(live_ids: List[str], cache: dict,
+                 svg_overrides: Optional[Dict[str, List[str]]] = None,
+                 tree: Optional[dict] = None) -> Tuple[List[Path], List[str]]:
+    """
+    현재 문제 목록에서 도달할 수 없는 dist/ 파일과 빌드 캐시 항목 찾기
+
+    살아 있는 산출물: 원본 파일이 있는 문제의 프로필별 payload (현재 출력 형식들)와 그 svg_files.
+    삭제된 문제, 그림이 줄어든 풀이의 SVG, 중단된 빌드의 임시 파일이 대상이다.
+
+    Args:
+        svg_overrides: 문제 ID → 빌드 후 SVG 목록 (--plan에서 다시 빌드할 문제용)
+        tree: scan_build_tree 결과 (있으면 풀이 유무를 stat 없이 판정)
+
+    Returns:
+        (삭제할 파일 경로, 삭제할 캐시 키)
+    """
+    svg_overrides = svg_overrides or {}
+    has_solution = (lambda pid: pid in tree['solutions']) if tree else has_solution_file
+    suffixes = output_suffixes()
+    live_payloads = {profile: set() for profile in PROFILE_DIRS}
+    for pid in live_ids:
+        for profile in problem_profiles(has_solution(pid)):
+            live_payloads[profile].update(f"{pid}{suffix}" for suffix in suffixes)
+    live_svgs = {
+        name for pid in live_ids
+        for name in svg_overrides.get(pid, live_svg_files(pid, cache))
     }
+    garbage_files = []
+    now = time.time()
 
-    # JSON 파일 저장
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(problem_data, f, ensure_ascii=False, indent=2)
+    payload_suffixes = tuple(FORMAT_SUFFIXES.values())
+    directories = [(DIST_DIR / PROFILE_DIRS[profile], live_payloads[profile], payload_suffixes)
+                   for profile in PROFILE_DIRS]
+    directories.append((DIST_SVG_DIR, live_svgs, ('.svg',)))
+
+    for directory, live_names, suffixes in directories:
+        if not directory.exists():
+            continue
+        for path in directory.iterdir():
+            if not path.is_file() or path.name in live_names:
+                continue
+            if path.suffix == '.tmp':
+                # 다른 빌드가 쓰는 중일 수 있으므로 오래된 것만
+                if now - path.stat().st_mtime < STALE_TMP_SECONDS:
+                    continue
+            elif path.suffix not in suffixes:
+                continue
+            garbage_files.append(path)
+
+    # 문제 / 원본 파일 단위 캐시 항목
+    live_id_set = set(live_ids)
+    live_sources = {
+        file_cache_key(path) for pid in live_ids for path in problem_source_files(pid)
+    }
+    stale_keys = []
+    for key in cache:
+        if key.startswith("file_"):
+            if key not in live_sources:
+                stale_keys.append(key)
+            continue
+        for prefix in PROBLEM_CACHE_PREFIXES:
+            if key.startswith(prefix):
+                if key[len(prefix):] not in live_id_set:
+                    stale_keys.append(key)
+                break
+
+    return garbage_files, stale_keys
 
-    # 캐시 업데이트
-    cache[cache_key] = combined_hash
 
-    print(f"  ✅ {output_file.name} 생성 완료")
+@traced()
+def collect_garbage(live_ids: List[str], cache: dict,
+                    tree: Optional[dict] = None) -> Dict[str, int]:
+    """
+    도달할 수 없는 dist/ 파일과 빌드 캐시 항목 삭제 (find_garbage 참고)
+
+    Returns:
+        {'files': 삭제한 파일 수, 'bytes': 회수한 바이트, 'cache_entries': 삭제한 캐시 항목 수}
+    """
+    garbage_files, stale_keys = find_garbage(live_ids, cache, tree=tree)
+    stats = {'files': 0, 'bytes': 0, 'cache_entries': len(stale_keys)}
+
+    for path in garbage_files:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        stats['files'] += 1
+        stats['bytes'] += size
 
-    return problem_data
+    with cache.transaction():
+        for key in stale_keys:
+            del cache[key]
 
+    return stats
+
+
+@traced()
+def load_metadata() -> dict:
+    """problems_metadata.json 로드 (공유 잠금)"""
+    with file_lock(METADATA_FILE, shared=True):
+        with open(METADATA_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def dist_metadata_inputs(metadata: dict, missing_file_ids: List[str],
+                         tree: Optional[dict] = None) -> Tuple[List[dict], List[bool], str]:
+    """
+    dist/metadata에 들어갈 문제 항목, 풀이 유무, 입력 해시
+
+    입력 해시: 메타데이터 항목, 풀이 유무, 빌더 / 출력 형식 / 프로필 설정
+    tree: scan_build_tree 결과 (있으면 풀이 유무를 stat 없이 판정)
+    """
+    missing = set(missing_file_ids)
+    filtered_problems = [p for p in metadata['problems'] if p['id'] not in missing]
+    has_solution = (lambda pid: pid in tree['solutions']) if tree else has_solution_file
+    solution_flags = [has_solution(p['id']) for p in filtered_problems]
+
+    input_hash = hashlib.sha256(json.dumps(
+        [BUILDER_VERSION, format_signature(), profile_signature(), solution_flags, filtered_problems],
+        ensure_ascii=False
+    ).encode('utf-8')).hexdigest()
+    return filtered_problems, solution_flags, input_hash
+
+
+def is_dist_metadata_current(input_hash: str, cache: dict) -> bool:
+    """dist/metadata가 같은 입력으로 쓰였고 파일이 모두 있으면 True"""
+    previous = cache.get(DIST_METADATA_KEY)
+    return bool(previous and previous[0] == input_hash
+                and all(path.exists() for path in output_paths(DIST_METADATA_STEM)))
+
+
+@traced()
+def write_dist_metadata(metadata: dict, missing_file_ids: List[str],
+                        cache: Optional[dict] = None, tree: Optional[dict] = None) -> int:
+    """
+    dist/metadata.json 저장 (원본 파일이 존재하는 문제만 포함, 확장자는 출력 형식별)
+
+    cache가 있으면 입력 해시(dist_metadata_inputs)와 목록 크기를 기록해 입력이 같으면 다시 만들지 않고,
+    다시 썼으면 dist/ 정리 완료 표시(DIST_SETTLED_KEY)를 지운다.
+    tree: scan_build_tree 결과 (있으면 풀이 유무를 stat 없이 판정)
+
+    Returns:
+        포함된 문제 수
+    """
+    filtered_problems, solution_flags, input_hash = dist_metadata_inputs(
+        metadata, missing_file_ids, tree)
+    if cache is not None and is_dist_metadata_current(input_hash, cache):
+        build_trace.count('profile_bytes_list', cache[DIST_METADATA_KEY][1])
+        return len(filtered_problems)
+
+    dist_metadata = {
+        'total_problems': len(filtered_problems),
+        'problems': [
+            project({**p, 'has_solution': flag}, 'list', p)
+            for p, flag in zip(filtered_problems, solution_flags)
+        ]
+    }
+    list_bytes = json_size(dist_metadata)
+    build_trace.count('bytes_written', write_payload(DIST_METADATA_STEM, dist_metadata))
+    build_trace.count('profile_bytes_list', list_bytes)
+    if cache is not None:
+        with _cache_transaction(cache):
+            cache[DIST_METADATA_KEY] = [input_hash, list_bytes]
+            cache[DIST_SETTLED_KEY] = None
+    return len(filtered_problems)
+
+
+def normalize_problem_id(value: str) -> str:
+    """'7' → '007' (숫자가 아니면 그대로)"""
+    value = value.strip()
+    return f"{int(value):03d}" if value.isdigit() else value
+
+
+def parse_id_range(value: str) -> Tuple[int, int]:
+    """'200-260' → (200, 260)"""
+    match = re.fullmatch(r'\s*(\d+)\s*-\s*(\d+)\s*', value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"범위 형식 오류: {value} (예: 200-260)")
+    low, high = int(match.group(1)), int(match.group(2))
+    if low > high:
+        raise argparse.ArgumentTypeError(f"범위 시작이 끝보다 큼: {value}")
+    return low, high
+
+
+def select_problem_ids(problem_ids: List[str], meta_index: Dict[str, dict],
+                       ids: Optional[List[str]] = None,
+                       id_range: Optional[Tuple[int, int]] = None,
+                       has_tikz: bool = False) -> List[str]:
+    """
+    선택자로 빌드 대상 축소 (여러 선택자는 모두 만족해야 함)
+
+    Args:
+        ids: 문제 ID 목록
+        id_range: (시작, 끝) 번호 범위 (양끝 포함)
+        has_tikz: 메타데이터의 has_tikz가 참인 문제만
+    """
+    selected = problem_ids
+    if ids is not None:
+        wanted = {normalize_problem_id(pid) for pid in ids}
+        unknown = wanted - set(problem_ids)
+        if unknown:
+            print(f"⚠️  빌드할 수 없는 ID (메타데이터 / 파일 없음): {', '.join(sorted(unknown))}")
+        selected = [pid for pid in selected if pid in wanted]
+    if id_range is not None:
+        low, high = id_range
+        selected = [pid for pid in selected if pid.isdigit() and low <= int(pid) <= high]
+    if has_tikz:
+        selected = [pid for pid in selected if meta_index.get(pid, {}).get('has_tikz')]
+    return selected
+
+
+@traced()
+def resolve_build_targets(metadata: dict, cache: dict, git_since: Optional[str] = None,
+                          ids: Optional[List[str]] = None,
+                          id_range: Optional[Tuple[int, int]] = None,
+                          has_tikz: bool = False, tree: Optional[dict] = None) -> dict:
+    """
+    빌드 대상 결정: 파일 없는 문제 제외 → 선택자 → git 변경 정보
+
+    tree: scan_build_tree 결과 (있으면 파일 존재 확인에 stat을 쓰지 않음)
+
+    Returns:
+        {'problem_ids': 검사할 문제, 'live_ids': 원본이 있는 전체 문제 (GC 기준),
+         'missing_ids': 파일 없는 문제, 'git_skipped': git 기준으로 제외한 문제 수,
+         'git_head': 다음 --git-since의 기준으로 기록할 커밋 (없으면 None)}
+    """
+    missing_file_ids = []
+    problem_ids = []
+
+    for problem in metadata['problems']:
+        problem_id = problem['id']
+
+        # 파일 존재 확인
+        if tree is not None:
+            exists = problem_id in tree['problems']
+        else:
+            exists = (PROBLEMS_DIR / f"{problem_id}.tex").exists()
+        if not exists:
+            missing_file_ids.append(problem_id)
+            print(f"\n📄 문제 {problem_id} 처리 중...")
+            print(f"  ⚠️  파일 없음, 제외")
+            continue
+
+        problem_ids.append(problem_id)
+
+    # GC 기준 (빌드 대상을 줄여도 살아 있는 문제는 그대로)
+    live_ids = list(problem_ids)
+
+    # 선택자로 빌드 대상 축소
+    has_selector = ids is not None or id_range is not None or has_tikz
+    if has_selector:
+        problem_ids = select_problem_ids(problem_ids, index_problem_metadata(metadata),
+                                         ids=ids, id_range=id_range, has_tikz=has_tikz)
+        print(f"\n🎯 선택된 문제: {len(problem_ids)}개 / {len(live_ids)}개")
+
+    # git 변경 정보로 빌드 대상 축소
+    git_head = None
+    git_skipped = 0
+    if git_since is not None:
+        git_head = (run_git('rev-parse', 'HEAD') or "").strip() or None
+        ref = cache.get(GIT_LAST_BUILD_KEY) if git_since == GIT_LAST_BUILD else git_since
+        changed_ids = git_changed_problem_ids(ref) if ref else None
+
+        if changed_ids is None:
+            print(f"\n⚠️  git 변경 정보를 쓸 수 없음 (기준: {ref or '기록 없음'}), 전체 검사")
+        else:
+            # 변경되지 않았더라도 출력 파일이 없는 문제는 빌드
+            selected_ids = [
+                pid for pid in problem_ids
+                if pid in changed_ids
+                or not has_problem_outputs(pid, tree)
+            ]
+            print(f"\n🌿 git 기준 {ref[:12]} 이후 변경: {len(selected_ids)}개 문제")
+            git_skipped = len(problem_ids) - len(selected_ids)
+            problem_ids = selected_ids
+
+    return {
+        'problem_ids': problem_ids,
+        'live_ids': live_ids,
+        'missing_ids': missing_file_ids,
+        'git_skipped': git_skipped,
+        # 일부만 빌드했으면 기록하지 않음
+        'git_head': None if has_selector else git_head,
+    }
+
+
+@traced()
+def build_all(jobs: int = 1, batch: bool = False, backend: str = DEFAULT_BACKEND,
+              timeout: float = DEFAULT_TIMEOUT, memory_mb: int = DEFAULT_MEMORY_MB,
+              retry_failed: bool = False, paranoid: bool = False,
+              hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+              git_since: Optional[str] = None, gc: bool = True,
+              ids: Optional[List[str]] = None,
+              id_range: Optional[Tuple[int, int]] = None,
+              has_tikz: bool = False, metrics_file: Optional[Path] = None,
+              svg_sprite: bool = False, precompress: bool = True):
+    """
+    전체 빌드 프로세스
+
+    Args:
+        jobs: 병렬 워커 수 (1이면 순차 빌드)
+        batch: 문제별 그림 묶음 컴파일
+        backend: 렌더링 백엔드 (pdf2svg / dvisvgm)
+        timeout: 그림 컴파일 명령당 시간 제한 (초, 0이면 제한 없음)
+        memory_mb: 그림 컴파일 명령당 메모리 제한 (MB, 0이면 제한 없음)
+        retry_failed: 격리된 (이전에 실패한) 그림도 다시 컴파일
+        paranoid: stat 비교 없이 모든 원본 파일을 해시, dist/가 그대로여도 GC / 사전 압축
+        hash_algorithm: 파일 해시 알고리즘 (sha256 / blake2b)
+        git_since: git ref 이후 변경된 문제만 빌드 (GIT_LAST_BUILD이면 마지막 빌드 커밋 기준)
+        gc: 빌드 후 도달할 수 없는 dist/ 파일과 캐시 항목 정리
+        ids / id_range / has_tikz: 빌드 대상 선택자 (dist/metadata.json은 항상 전체 기준)
+        metrics_file: 실행 지표 저장 경로 (.prom이면 Prometheus textfile, 그 외는 JSON lines)
+        svg_sprite: 글리프를 공유 스프라이트로 모은 그림을 dist/svg-sprite/에 생성
+        precompress: dist/의 텍스트 파일마다 .br / .gz 사전 압축본 동기화
+    """
+    start = time.perf_counter()
+    # 실행 지표의 단계별 소요 시간은 span 합계로 계산
+    if metrics_file:
+        build_trace.enable()
 
-def build_all():
-    """전체 빌드 프로세스"""
     print("=" * 70)
     print("증분 빌드 시스템 - 원본 보존 방식")
     print("=" * 70)
@@ -300,52 +1458,105 @@ def build_all():
 
     # 메타데이터 로드
     print(f"\n📋 메타데이터 로드: {METADATA_FILE}")
-    with open(METADATA_FILE, 'r', encoding='utf-8') as f:
-        metadata = json.load(f)
+    metadata = load_metadata()
 
     # 캐시 로드
     cache = load_cache()
     print(f"📦 빌드 캐시 로드: {len(cache)} 항목")
 
-    # 각 문제 처리
-    built_problems = []
-    skipped_count = 0
-    missing_file_ids = []
-
-    for problem in metadata['problems']:
-        problem_id = problem['id']
-
-        # 파일 존재 확인
-        problem_file = PROBLEMS_DIR / f"{problem_id}.tex"
-        if not problem_file.exists():
-            missing_file_ids.append(problem_id)
-            print(f"\n📄 문제 {problem_id} 처리 중...")
-            print(f"  ⚠️  파일 없음, 제외")
-            continue
+    # 프리앰블 포맷 덤프 준비 (워커들이 공유)
+    format_file = ensure_preamble_format(backend)
+    if format_file:
+        print(f"🧩 프리앰블 포맷: {format_file.name}")
 
-        result = build_problem_json(problem_id, metadata, cache)
+    # 원본 / dist/ 디렉토리 목록 (문제마다 stat하지 않고 변경 판정, 목록, GC에서 재사용)
+    tree = scan_build_tree()
 
+    # 빌드 대상 결정
+    targets = resolve_build_targets(metadata, cache, git_since=git_since,
+                                    ids=ids, id_range=id_range, has_tikz=has_tikz, tree=tree)
+    problem_ids = targets['problem_ids']
+    missing_file_ids = targets['missing_ids']
+    built_problems = []
+    skipped_count = targets['git_skipped']
+
+    if jobs > 1:
+        capped_jobs = cap_jobs_by_memory(jobs, memory_mb)
+        if capped_jobs < jobs:
+            print(f"\n⚠️  사용 가능 메모리 부족: 워커 {jobs}개 → {capped_jobs}개 "
+                  f"(워커당 {worker_memory_budget_mb(memory_mb)} MB)")
+            jobs = capped_jobs
+        print(f"\n⚙️  병렬 빌드: {jobs}개 워커")
+
+    renderer_options = {'backend': backend, 'timeout': timeout, 'memory_mb': memory_mb}
+
+    for result in build_problems(problem_ids, metadata, cache, jobs=jobs,
+                                 renderer_options=renderer_options, tree=tree,
+                                 batch=batch, retry_failed=retry_failed,
+                                 paranoid=paranoid, hash_algorithm=hash_algorithm):
         if result:
             built_problems.append(result)
         else:
             skipped_count += 1
 
-    # 전체 메타데이터 저장 (파일이 존재하는 문제만 포함)
-    filtered_problems = [
-        p for p in metadata['problems']
-        if p['id'] not in missing_file_ids
-    ]
+    # 전체 메타데이터 저장 (파일이 존재하는 문제만 포함, 입력이 같으면 다시 쓰지 않음)
+    total_problems = write_dist_metadata(metadata, missing_file_ids, cache, tree)
 
-    dist_metadata = {
-        'total_problems': len(filtered_problems),
-        'problems': [
-            {k: v for k, v in p.items() if k != 'content' and k != 'solution'}
-            for p in filtered_problems
-        ]
-    }
+    # 마지막 GC / 사전 압축 이후 dist/가 그대로면 (빌드한 문제도, 바뀐 목록도 없음) 다시 훑지 않음
+    # (paranoid이면 dist/를 직접 고친 경우에 대비해 항상 다시 훑음)
+    settled = {} if paranoid else dict(cache.get(DIST_SETTLED_KEY) or {})
+    settled_steps = []
+
+    # 도달할 수 없는 산출물 정리
+    gc_stats = None
+    if gc:
+        if settled.get('gc'):
+            gc_stats = {'files': 0, 'bytes': 0, 'cache_entries': 0}
+            settled_steps.append("GC")
+        else:
+            gc_stats = collect_garbage(targets['live_ids'], cache, tree)
+            settled['gc'] = True
+            if gc_stats['files']:
+                settled.pop('precompress', None)
+
+    # 공유 글리프 스프라이트 (dist/svg 기준으로 동기화)
+    sprite_stats = None
+    if svg_sprite:
+        sprite_stats = build_sprite(DIST_SVG_DIR, DIST_SVG_SPRITE_DIR)
+        settled.pop('precompress', None)
+
+    # 사전 압축 (GC / 스프라이트 뒤: 사라진 원본의 압축본도 함께 정리)
+    compress_stats = None
+    if precompress:
+        signature = precompress_signature()
+        if settled.get('precompress', {}).get('signature') == signature:
+            compress_stats = settled['precompress']['stats']
+            settled_steps.append("사전 압축")
+        else:
+            with span("precompress"):
+                compress_stats = precompress_dir(DIST_DIR)
+            # 생략한 빌드의 지표용 (새로 압축 / 삭제한 파일은 없음)
+            settled['precompress'] = {
+                'signature': signature,
+                'stats': {**compress_stats, 'compressed': 0, 'removed': 0},
+            }
+
+    if settled_steps:
+        print(f"\n🧹 dist/ 변경 없음: {' / '.join(settled_steps)} 생략")
+
+    # 프로필별 payload 크기 (문제마다 빌드할 때 기록한 값의 합계, dist/가 그대로면 지난 합계)
+    if 'profile_totals' not in settled:
+        settled['profile_totals'] = summarize_sizes(
+            cache[f"profile_bytes_{pid}"] for pid in targets['live_ids']
+            if f"profile_bytes_{pid}" in cache
+        )
+    profile_totals = dict(settled['profile_totals'])
+    profile_totals['list'] = int(build_trace.counters().get('profile_bytes_list', 0))
+    cache[DIST_SETTLED_KEY] = settled
 
-    with open(DIST_METADATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(dist_metadata, f, ensure_ascii=False, indent=2)
+    # 다음 --git-since 빌드의 기준 커밋 기록 (일부만 빌드했으면 기록하지 않음)
+    if targets['git_head']:
+        cache[GIT_LAST_BUILD_KEY] = targets['git_head']
 
     # 캐시 저장
     save_cache(cache)
@@ -357,12 +1568,508 @@ def build_all():
     print(f"  스킵: {skipped_count}개 (변경 없음)")
     if missing_file_ids:
         print(f"  제외: {len(missing_file_ids)}개 (파일 없음: {', '.join(missing_file_ids)})")
-    print(f"  총 문제: {len(filtered_problems)}개")
+    if gc_stats and (gc_stats['files'] or gc_stats['cache_entries']):
+        print(f"  정리: 파일 {gc_stats['files']}개 ({gc_stats['bytes'] / 1024:.1f} KB 회수), "
+              f"캐시 항목 {gc_stats['cache_entries']}개")
+    counters = build_trace.counters()
+    if counters.get('svg_bytes_before'):
+        before, after = counters['svg_bytes_before'], counters['svg_bytes_after']
+        print(f"  SVG 최적화: {before / 1024:.1f} KB → {after / 1024:.1f} KB "
+              f"(-{(1 - after / before) * 100:.1f}%)")
+    if sprite_stats and sprite_stats['source_bytes']:
+        print(f"  스프라이트: 그림 {sprite_stats['figures']}개 + 글리프 {sprite_stats['glyphs']}개, "
+              f"{sprite_stats['source_bytes'] / 1024:.1f} KB → {sprite_stats['sprite_bytes'] / 1024:.1f} KB "
+              f"(-{(1 - sprite_stats['sprite_bytes'] / sprite_stats['source_bytes']) * 100:.1f}%)")
+    if compress_stats and compress_stats['source_bytes']:
+        print(f"  사전 압축: {compress_stats['files']}개 파일 (새로 압축 {compress_stats['compressed']}개), "
+              f"{compress_stats['source_bytes'] / 1024:.1f} KB → "
+              f"{compress_stats['smallest_bytes'] / 1024:.1f} KB "
+              f"(-{(1 - compress_stats['smallest_bytes'] / compress_stats['source_bytes']) * 100:.1f}%)")
+    if profile_totals['full']:
+        full = profile_totals['full']
+        print(f"  프로필 크기 (문제 {profile_totals['problems']}개, 나누기 전 통합 JSON {full / 1024:.1f} KB 기준):")
+        for profile in problem_profiles():
+            print(f"    {profile:<8} {profile_totals[profile] / 1024:>8.1f} KB "
+                  f"(-{(1 - profile_totals[profile] / full) * 100:.1f}%)")
+        print(f"    {'list':<8} {profile_totals['list'] / 1024:>8.1f} KB (metadata.json)")
+    print(f"  총 문제: {total_problems}개")
     print(f"\n출력 디렉토리:")
-    print(f"  {DIST_PROBLEMS_DIR}/")
+    for profile in problem_profiles():
+        print(f"  {DIST_DIR / PROFILE_DIRS[profile]}/")
     print(f"  {DIST_SVG_DIR}/")
     print("=" * 70)
 
+    if metrics_file:
+        write_build_metrics(Path(metrics_file), built=len(built_problems), skipped=skipped_count,
+                            missing=len(missing_file_ids), total=total_problems,
+                            gc_stats=gc_stats, compress_stats=compress_stats,
+                            profile_totals=profile_totals, seconds=time.perf_counter() - start)
+
+
+def write_build_metrics(path: Path, built: int, skipped: int, missing: int, total: int,
+                        gc_stats: Optional[dict], seconds: float,
+                        compress_stats: Optional[dict] = None,
+                        profile_totals: Optional[dict] = None):
+    """빌드 실행 지표 저장 (워커 카운터 / span은 build_trace에 병합된 상태)"""
+    counters = build_trace.counters()
+    metrics = RunMetrics('build')
+
+    metrics.set('duration_seconds', round(seconds, 3), '빌드 전체 경과 시간 (초)')
+    metrics.set('problems_total', total, 'dist/metadata.json에 포함된 문제 수')
+    metrics.set('problems_built', built, '다시 빌드한 문제 수')
+    metrics.set('problems_skipped', skipped, '변경 없어 스킵한 문제 수')
+    metrics.set('problems_missing', missing, '원본 파일이 없어 제외한 문제 수')
+    metrics.set('cache_hit_ratio', round(skipped / (built + skipped), 4) if built + skipped else 1,
+                '문제 단위 캐시 적중률 (스킵 / 검사)')
+
+    metrics.set('files_scanned', counters.get('files_scanned', 0), 'stat으로 검사한 원본 파일 수 (검사 횟수)')
+    metrics.set('files_hashed', counters.get('files_hashed', 0), 'stat이 달라 전체 해시한 파일 수')
+    metrics.set('bytes_hashed', counters.get('bytes_hashed', 0), '해시하느라 읽은 바이트')
+
+    restored = counters.get('figures_restored', 0)
+    compiled = counters.get('figures_compiled', 0)
+    failed = counters.get('figures_failed', 0)
+    metrics.set('figures_restored', restored, '그림 저장소에서 복사한 그림 수')
+    metrics.set('figures_compiled', compiled, '컴파일한 그림 수')
+    metrics.set('figures_failed', failed, '컴파일에 실패한 그림 수 (격리 + 재시도 대기)')
+    metrics.set('figures_retryable', counters.get('figures_retryable', 0),
+                '실행 파일이 없어 실패해 격리하지 않고 다음 빌드에서 다시 시도할 그림 수')
+    metrics.set('figures_quarantined', counters.get('figures_quarantined', 0),
+                '이전 실패로 스킵한 그림 수')
+    figures = restored + compiled + failed
+    metrics.set('figure_store_hit_ratio', round(restored / figures, 4) if figures else 1,
+                '그림 저장소 적중률 (복사 / 필요한 그림)')
+
+    metrics.set('bytes_written', counters.get('bytes_written', 0), 'dist/에 쓴 JSON / SVG 바이트')
+    metrics.set('svg_bytes_before_optimize', counters.get('svg_bytes_before', 0),
+                'dist/svg에 쓴 그림의 최적화 전 바이트')
+    metrics.set('svg_bytes_after_optimize', counters.get('svg_bytes_after', 0),
+                'dist/svg에 쓴 그림의 최적화 후 바이트')
+    if gc_stats:
+        metrics.set('gc_files', gc_stats['files'], 'GC로 삭제한 파일 수')
+        metrics.set('gc_bytes', gc_stats['bytes'], 'GC로 회수한 바이트')
+        metrics.set('gc_cache_entries', gc_stats['cache_entries'], 'GC로 삭제한 캐시 항목 수')
+    if compress_stats:
+        metrics.set('precompressed_files', compress_stats['files'], '사전 압축본이 있는 dist/ 파일 수')
+        metrics.set('precompress_source_bytes', compress_stats['source_bytes'],
+                    '사전 압축한 파일의 원본 바이트')
+        metrics.set('precompress_bytes', compress_stats['gz_bytes'], '인코딩별 사전 압축본 바이트',
+                    encoding='gzip')
+        if compress_stats['br_bytes']:
+            metrics.set('precompress_bytes', compress_stats['br_bytes'], '인코딩별 사전 압축본 바이트',
+                        encoding='br')
+
+    if profile_totals:
+        for profile in ('full', *problem_profiles(), 'list'):
+            metrics.set('profile_bytes', profile_totals[profile],
+                        '프로필별 payload JSON 바이트 합계 (full: 나누기 전 통합 payload)', profile=profile)
+
+    metrics.set_stages(build_trace.summarize())
+    metrics.write(path)
+
+
+def plan_problem_figures(problem_id: str, cache: dict, default_cost: float,
+                         backend: Optional[str] = None,
+                         retry_failed: bool = False) -> List[dict]:
+    """
+    문제를 다시 빌드할 때 그림별로 일어날 일
+
+    Returns:
+        [{'svg', 'key', 'action': stored(저장소에서 복사) / compile / quarantined, 'seconds'}]
+    """
+    solution_file = SOLUTIONS_DIR / f"{problem_id}_solution.tex"
+    if not solution_file.exists():
+        return []
+
+    with open(solution_file, 'r', encoding='utf-8') as f:
+        solution = f.read()
+
+    figures = []
+    for n, match in enumerate(TIKZ_PATTERN.finditer(solution), start=1):
+        figure_key = compute_figure_key(match.group(), backend)
+        if (FIGURE_STORE_DIR / f"{figure_key}.svg").exists():
+            action, seconds = 'stored', 0.0
+        elif is_quarantined(figure_key) and not retry_failed:
+            action, seconds = 'quarantined', 0.0
+        else:
+            action = 'compile'
+            seconds = cache.get(f"time_figure_{figure_key}", default_cost)
+        figures.append({
+            'svg': f"{problem_id}_fig{n}.svg",
+            'key': figure_key[:12],
+            'action': action,
+            'seconds': round(seconds, 3),
+        })
+    return figures
+
+
+def plan_build(jobs: int = 1, backend: str = DEFAULT_BACKEND,
+               memory_mb: int = DEFAULT_MEMORY_MB,
+               retry_failed: bool = False, paranoid: bool = False,
+               hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+               git_since: Optional[str] = None, gc: bool = True,
+               ids: Optional[List[str]] = None,
+               id_range: Optional[Tuple[int, int]] = None,
+               has_tikz: bool = False, as_json: bool = False) -> dict:
+    """
+    빌드 계획 (dry-run): 변경 감지만 하고 다시 빌드 / 삭제 / 유지될 대상과 예상 시간 출력
+
+    캐시는 읽기 전용으로 연 사본으로만 검사하므로 아무것도 쓰지 않는다 (이전 JSON 캐시도 변환하지 않음).
+    예상 시간은 기록된 그림별 컴파일 시간으로 Longest Job First 배치를 계산한 값.
+
+    Returns:
+        계획 dict (as_json이면 JSON으로 출력, 진행 메시지는 stderr로)
+    """
+    with redirect_stdout(sys.stderr if as_json else sys.stdout):
+        metadata = load_metadata()
+        meta_index = index_problem_metadata(metadata)
+        cache = read_cache_snapshot()
+
+        targets = resolve_build_targets(metadata, cache, git_since=git_since,
+                                        ids=ids, id_range=id_range, has_tikz=has_tikz)
+
+    rebuild_ids = []
+    unchanged_ids = []
+    for pid in targets['problem_ids']:
+        if is_problem_up_to_date(pid, meta_index[pid], cache, paranoid, hash_algorithm, backend,
+                                 retry_failed):
+            unchanged_ids.append(pid)
+        else:
+            rebuild_ids.append(pid)
+
+    default_cost = default_figure_cost(cache)
+    figures = {pid: plan_problem_figures(pid, cache, default_cost, backend, retry_failed)
+               for pid in rebuild_ids}
+    costs = [BASE_PROBLEM_COST + sum(f['seconds'] for f in figures[pid]) for pid in rebuild_ids]
+    jobs = cap_jobs_by_memory(jobs, memory_mb) if jobs > 1 else 1
+
+    # 다시 빌드한 뒤의 SVG 목록 기준으로 GC 대상 계산
+    svg_after = {
+        pid: [f['svg'] for f in figures[pid] if f['action'] != 'quarantined']
+        for pid in rebuild_ids
+    }
+    garbage_files, stale_keys = (find_garbage(targets['live_ids'], cache, svg_after)
+                                 if gc else ([], []))
+
+    # 입력이 같으면 빌드가 dist/metadata를 다시 쓰지 않음
+    _, _, metadata_input_hash = dist_metadata_inputs(metadata, targets['missing_ids'])
+    metadata_writes = ([] if is_dist_metadata_current(metadata_input_hash, cache)
+                       else [path.name for path in output_paths(DIST_METADATA_STEM)])
+
+    plan = {
+        'problems': {
+            'rebuild': rebuild_ids,
+            'unchanged': unchanged_ids,
+            'missing': targets['missing_ids'],
+        },
+        'figures': {
+            action: [f['svg'] for pid in rebuild_ids for f in figures[pid] if f['action'] == action]
+            for action in ('compile', 'stored', 'quarantined')
+        },
+        'dist': {
+            'write': [path.relative_to(DIST_DIR).as_posix() for pid in rebuild_ids
+                      for path in problem_output_files(pid)]
+                     + [f"svg/{name}" for pid in rebuild_ids for name in svg_after[pid]]
+                     + metadata_writes,
+            'delete': [path.relative_to(DIST_DIR).as_posix() for path in garbage_files],
+            'delete_bytes': sum(path.stat().st_size for path in garbage_files),
+        },
+        'cache_entries_to_delete': len(stale_keys),
+        'estimate': {
+            'jobs': jobs,
+            'cpu_seconds': round(sum(costs), 2),
+            'wall_seconds': round(estimate_wall_time(costs, jobs), 2) if costs else 0.0,
+        },
+    }
+
+    if as_json:
+        print(json.dumps(plan, ensure_ascii=False, indent=2))
+        return plan
+
+    print("\n" + "=" * 70)
+    print("📝 빌드 계획 (실제로 빌드하지 않음)")
+    print("=" * 70)
+    print(f"  다시 빌드: {len(rebuild_ids)}개 문제")
+    if rebuild_ids:
+        print(f"    {', '.join(rebuild_ids[:20])}{' ...' if len(rebuild_ids) > 20 else ''}")
+    print(f"  변경 없음: {len(unchanged_ids)}개")
+    if targets['missing_ids']:
+        print(f"  제외: {len(targets['missing_ids'])}개 (파일 없음)")
+    print(f"  그림: 컴파일 {len(plan['figures']['compile'])}개, "
+          f"저장소 재사용 {len(plan['figures']['stored'])}개, "
+          f"격리 스킵 {len(plan['figures']['quarantined'])}개")
+    print(f"  dist 쓰기: {len(plan['dist']['write'])}개 파일")
+    if gc:
+        print(f"  dist 삭제: {len(plan['dist']['delete'])}개 파일 "
+              f"({plan['dist']['delete_bytes'] / 1024:.1f} KB), 캐시 항목 {len(stale_keys)}개")
+        for name in plan['dist']['delete'][:20]:
+            print(f"    🗑️  {name}")
+    print(f"  예상 시간: {plan['estimate']['wall_seconds']:.1f}초 "
+          f"(워커 {jobs}개, 총 작업량 {plan['estimate']['cpu_seconds']:.1f}초)")
+    print("=" * 70)
+    return plan
+
+
+def snapshot_sources() -> Dict[Path, Tuple[int, int]]:
+    """watch 대상 파일(문제 / 풀이 / 메타데이터)의 (크기, mtime_ns)"""
+    snapshot = {}
+    for path in [METADATA_FILE, *PROBLEMS_DIR.glob("*.tex"), *SOLUTIONS_DIR.glob("*.tex")]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def watch(batch: bool = False, backend: str = DEFAULT_BACKEND,
+          timeout: float = DEFAULT_TIMEOUT, memory_mb: int = DEFAULT_MEMORY_MB,
+          retry_failed: bool = False, paranoid: bool = False,
+          hash_algorithm: str = DEFAULT_HASH_ALGORITHM, gc: bool = True):
+    """
+    원본을 저장할 때마다 바뀐 문제만 다시 빌드 (Ctrl-C로 종료)
+
+    메타데이터, 빌드 캐시, 그림 렌더러(스크래치 디렉토리, 프리앰블 포맷)를
+    메모리에 유지하므로 저장 직후 해당 문제의 JSON / SVG만 갱신된다.
+    메타데이터가 바뀌면 항목이 달라진 문제와 dist/metadata.json을 갱신한다.
+    """
+    wakeup = threading.Event()
+    observer = None
+    if Observer is not None:
+        handler = FileSystemEventHandler()
+        handler.on_any_event = lambda event: wakeup.set()
+        observer = Observer()
+        observer.schedule(handler, str(METADATA_FILE.parent), recursive=True)
+        observer.start()
+
+    metadata = load_metadata()
+    meta_index = index_problem_metadata(metadata)
+    cache = load_cache()
+    options = {'batch': batch, 'retry_failed': retry_failed,
+               'paranoid': paranoid, 'hash_algorithm': hash_algorithm}
+    snapshot = snapshot_sources()
+
+    mode = "파일 시스템 이벤트" if observer else f"{WATCH_POLL_INTERVAL:g}초 간격 stat 비교"
+    print(f"\n👀 변경 감시 중 ({mode}) - Ctrl-C로 종료")
+
+    try:
+        with FigureRenderer(workers=1, backend=backend, timeout=timeout, memory_mb=memory_mb):
+            while True:
+                # 이벤트가 오면 바로, 아니면 주기적으로 (놓친 이벤트 대비) stat 비교
+                wakeup.wait(WATCH_POLL_INTERVAL if observer is None else 1.0)
+                wakeup.clear()
+
+                current = snapshot_sources()
+                changed = {p for p in current.keys() | snapshot.keys()
+                           if current.get(p) != snapshot.get(p)}
+                if not changed:
+                    continue
+                structure_changed = METADATA_FILE in changed or current.keys() != snapshot.keys()
+                snapshot = current
+                start = time.perf_counter()
+
+                if METADATA_FILE in changed:
+                    metadata = load_metadata()
+                    meta_index = index_problem_metadata(metadata)
+                    candidate_ids = list(meta_index)
+                else:
+                    candidate_ids = sorted({
+                        pid for pid in (problem_id_from_path(p.relative_to(BASE_DIR).as_posix())
+                                        for p in changed)
+                        if pid in meta_index
+                    })
+
+                live_ids = [pid for pid in meta_index if PROBLEMS_DIR / f"{pid}.tex" in current]
+                live_set = set(live_ids)
+                built_ids = []
+                for pid in candidate_ids:
+                    if pid not in live_set or is_problem_up_to_date(
+                            pid, meta_index[pid], cache, paranoid, hash_algorithm,
+                            retry_failed=retry_failed):
+                        continue
+                    if build_problem_json(pid, meta_index[pid], cache, **options):
+                        built_ids.append(pid)
+
+                if structure_changed:
+                    missing_ids = [pid for pid in meta_index if pid not in live_set]
+                    write_dist_metadata(metadata, missing_ids, cache)
+                    if gc:
+                        collect_garbage(live_ids, cache)
+
+                if built_ids or structure_changed:
+                    elapsed = time.perf_counter() - start
+                    print(f"⚡ 재빌드: {', '.join(built_ids) or '메타데이터만'} ({elapsed:.2f}초)")
+    except KeyboardInterrupt:
+        print("\n👋 감시 종료")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+        save_cache(cache)
+
+
+def benchmark_all_backends():
+    """현재 풀이 파일들의 그림을 백엔드별로 렌더링하여 시간 / 크기 비교"""
+    tikz_codes = []
+    for solution_file in sorted(SOLUTIONS_DIR.glob("*_solution.tex")):
+        with open(solution_file, 'r', encoding='utf-8') as f:
+            tikz_codes.extend(m.group() for m in TIKZ_PATTERN.finditer(f.read()))
+
+    print("=" * 70)
+    print(f"렌더링 백엔드 벤치마크: 그림 {len(tikz_codes)}개")
+    print("=" * 70)
+
+    report = benchmark_backends(tikz_codes)
+
+    print(f"\n{'백엔드':<10} {'성공':>8} {'시간(s)':>10} {'그림당(ms)':>12} {'SVG(KB)':>10}")
+    for backend, r in report.items():
+        per_figure = r['seconds'] / r['figures'] * 1000 if r['figures'] else 0
+        print(f"{backend:<10} {r['succeeded']:>4}/{r['figures']:<3} {r['seconds']:>10.2f} "
+              f"{per_figure:>12.1f} {r['svg_bytes'] / 1024:>10.1f}")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='증분 빌드 시스템',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='병렬 워커 수 (기본: CPU 개수, 1이면 순차 빌드)')
+    parser.add_argument('--batch', action='store_true',
+                        help='문제별 그림을 한 번의 pdflatex 실행으로 묶어 컴파일')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f'렌더링 백엔드 (기본: {DEFAULT_BACKEND}, 환경변수 TIKZ_BACKEND)')
+    parser.add_argument('--figure-timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'그림 컴파일 명령당 시간 제한 초 (기본: {DEFAULT_TIMEOUT:g}, 0이면 제한 없음)')
+    parser.add_argument('--figure-memory', type=int, default=DEFAULT_MEMORY_MB,
+                        help=f'그림 컴파일 명령당 메모리 제한 MB (기본: {DEFAULT_MEMORY_MB}, 0이면 제한 없음)')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='이전에 실패해 격리된 그림도 다시 컴파일')
+    parser.add_argument('--paranoid', action='store_true',
+                        help='stat 비교 없이 모든 원본 파일을 해시 (dist/ GC / 사전 압축도 생략하지 않음)')
+    parser.add_argument('--hash', choices=HASH_ALGORITHMS, default=DEFAULT_HASH_ALGORITHM,
+                        help=f'파일 해시 알고리즘 (기본: {DEFAULT_HASH_ALGORITHM}, blake2b가 더 빠름)')
+    parser.add_argument('--git-since', '--since', nargs='?', const=GIT_LAST_BUILD, metavar='REF',
+                        help='git REF 이후 변경된 문제만 빌드 (REF 생략 시 마지막 빌드 커밋)')
+    parser.add_argument('--ids', nargs='+', metavar='ID',
+                        help='지정한 문제만 빌드 (예: --ids 245 246)')
+    parser.add_argument('--range', dest='id_range', type=parse_id_range, metavar='START-END',
+                        help='번호 범위의 문제만 빌드 (예: --range 200-260)')
+    parser.add_argument('--has-tikz', action='store_true',
+                        help='TikZ 그림이 있는 문제만 빌드')
+    parser.add_argument('--plan', action='store_true',
+                        help='빌드하지 않고 다시 빌드 / 삭제될 대상과 예상 시간만 출력')
+    parser.add_argument('--json', action='store_true',
+                        help='--plan 결과를 JSON으로 출력')
+    parser.add_argument('--watch', action='store_true',
+                        help='빌드 후 원본 변경을 감시하며 바뀐 문제만 즉시 다시 빌드')
+    parser.add_argument('--no-gc', action='store_true',
+                        help='빌드 후 도달할 수 없는 dist/ 파일 / 캐시 항목을 정리하지 않음')
+    parser.add_argument('--svg-sprite', action='store_true',
+                        help='글리프를 공유 스프라이트(glyphs.svg)로 모은 그림을 dist/svg-sprite/에 생성 '
+                             '(<img>가 아닌 인라인 / <object> 표시용)')
+    parser.add_argument('--no-precompress', action='store_true',
+                        help='dist/ 파일의 .br / .gz 사전 압축본을 만들지 않음')
+    parser.add_argument('--format', nargs='+', choices=list(FORMAT_SUFFIXES), metavar='FORMAT',
+                        help='문제 / 메타데이터 출력 형식 (json, msgpack, cbor 중 여러 개, '
+                             '기본: json, 환경변수 DIST_FORMATS)')
+    parser.add_argument('--print-profile', action='store_true',
+                        help='인쇄용 전체 payload를 dist/print/에 생성 (환경변수 DIST_PRINT_PROFILE=1)')
+    parser.add_argument('--pretty', action='store_true',
+                        help='JSON을 들여써서 저장 (디버그용, 환경변수 DIST_PRETTY=1)')
+    parser.add_argument('--trace', nargs='?', const=str(DEFAULT_TRACE_FILE), metavar='FILE',
+                        help='단계별 span을 Chrome / Perfetto trace로 저장하고 합계 표 출력 '
+                             f'(기본: {DEFAULT_TRACE_FILE.name})')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='cProfile 결과를 FILE에 저장하고 상위 함수 출력 (--jobs 1 권장)')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='실행 지표 저장 (FILE.prom이면 Prometheus textfile, 그 외는 JSON lines 추가)')
+    parser.add_argument('--benchmark-backends', action='store_true',
+                        help='기존 그림으로 백엔드별 시간 / SVG 크기 비교 후 종료')
+
+    args = parser.parse_args()
+
+    # 출력 형식 / 프로필 (캐시 키에 포함되므로 빌드 / 계획 전에 설정)
+    configure_output(args.format, True if args.pretty else None)
+    configure_profiles(True if args.print_profile else None)
+    missing = missing_packages()
+    if missing:
+        print(f"❌ 출력 형식에 필요한 패키지가 없습니다: pip install {' '.join(missing)}")
+        sys.exit(1)
+
+    if args.benchmark_backends:
+        benchmark_all_backends()
+        return
+
+    if args.plan:
+        plan_build(
+            jobs=max(1, args.jobs),
+            backend=args.backend,
+            memory_mb=args.figure_memory,
+            retry_failed=args.retry_failed,
+            paranoid=args.paranoid,
+            hash_algorithm=args.hash,
+            git_since=args.git_since,
+            gc=not args.no_gc,
+            ids=args.ids,
+            id_range=args.id_range,
+            has_tikz=args.has_tikz,
+            as_json=args.json
+        )
+        return
+
+    if args.trace:
+        build_trace.enable()
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+
+    build_all(
+        jobs=max(1, args.jobs),
+        batch=args.batch,
+        backend=args.backend,
+        timeout=args.figure_timeout,
+        memory_mb=args.figure_memory,
+        retry_failed=args.retry_failed,
+        paranoid=args.paranoid,
+        hash_algorithm=args.hash,
+        git_since=args.git_since,
+        gc=not args.no_gc,
+        ids=args.ids,
+        id_range=args.id_range,
+        has_tikz=args.has_tikz,
+        metrics_file=args.metrics,
+        svg_sprite=args.svg_sprite,
+        precompress=not args.no_precompress
+    )
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"\n🔬 cProfile 저장: {args.profile} (병렬 빌드는 부모 프로세스만 포함)")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+
+    if args.trace:
+        build_trace.write_chrome_trace(Path(args.trace))
+        build_trace.print_summary()
+        print(f"🧭 trace 저장: {args.trace} (https://ui.perfetto.dev 에서 열기)")
+    if args.trace or args.metrics:
+        build_trace.reset()
+
+    if args.watch:
+        watch(
+            batch=args.batch,
+            backend=args.backend,
+            timeout=args.figure_timeout,
+            memory_mb=args.figure_memory,
+            retry_failed=args.retry_failed,
+            paranoid=args.paranoid,
+            hash_algorithm=args.hash,
+            gc=not args.no_gc
+        )
+
 
 if __name__ == '__main__':
-    build_all()
+    main()
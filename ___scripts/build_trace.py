@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+빌드 단계 추적 (span) 및 카운터
+
+build_incremental.py / tikz_render.py의 단계별 소요 시간을 span으로 기록하고
+Chrome / Perfetto에서 열 수 있는 trace 파일(Trace Event Format)과
+단계별 합계 표를 출력한다. 추적을 켜지 않으면 span은 아무 일도 하지 않는다.
+카운터(컴파일한 그림 수, 쓴 바이트 등)는 항상 기록되며 실행 지표에 쓰인다.
+
+사용법:
+    import build_trace
+
+    build_trace.enable()
+    with build_trace.span("build_problem_json", problem=problem_id):
+        ...
+
+    @build_trace.traced()
+    def compute_file_hash(...):
+        ...
+
+    build_trace.write_chrome_trace(Path("build_trace.json"))
+    build_trace.print_summary()
+
+    # trace 파일 보기: https://ui.perfetto.dev 또는 chrome://tracing 에서 열기
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+_enabled = False
+_events: List[dict] = []
+_counters: Dict[str, float] = {}
+
+
+def enable(enabled: bool = True):
+    """추적 켜기 / 끄기 (기록된 span은 유지)"""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset(enabled: bool = False):
+    """기록된 span / 카운터를 비우고 추적 상태 설정 (워커 프로세스 초기화용)"""
+    global _enabled
+    _enabled = enabled
+    _events.clear()
+    _counters.clear()
+
+
+def count(name: str, value: float = 1):
+    """카운터 증가"""
+    _counters[name] = _counters.get(name, 0) + value
+
+
+def counters() -> Dict[str, float]:
+    """현재 카운터 값"""
+    return dict(_counters)
+
+
+@contextmanager
+def span(name: str, category: str = "build", **args):
+    """
+    블록 실행 시간을 span으로 기록
+
+    Args:
+        name: 단계 이름 (합계 표의 행)
+        category: trace 뷰어의 분류
+        args: trace 뷰어에 표시할 추가 정보 (문제 ID 등)
+    """
+    if not _enabled:
+        yield
+        return
+
+    start_us = time.time_ns() // 1000
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start_us,
+            'dur': (time.perf_counter_ns() - start) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_native_id(),
+            'args': args,
+        })
+
+
+def traced(name: Optional[str] = None, category: str = "build") -> Callable:
+    """함수 호출 전체를 span으로 기록하는 데코레이터 (이름 기본값: 함수 이름)"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def drain() -> dict:
+    """지금까지 기록된 span / 카운터를 꺼내고 비움 (워커 → 부모 전달용)"""
+    telemetry = {'events': list(_events), 'counters': dict(_counters)}
+    _events.clear()
+    _counters.clear()
+    return telemetry
+
+
+def merge(telemetry: dict):
+    """다른 프로세스에서 drain()한 span / 카운터 병합"""
+    _events.extend(telemetry['events'])
+    for name, value in telemetry['counters'].items():
+        count(name, value)
+
+
+def write_chrome_trace(path: Path):
+    """Chrome / Perfetto Trace Event Format으로 저장"""
+    main_pid = os.getpid()
+    process_names = [
+        {
+            'name': 'process_name',
+            'ph': 'M',
+            'pid': pid,
+            'args': {'name': 'build' if pid == main_pid else f'worker {pid}'},
+        }
+        for pid in sorted({event['pid'] for event in _events})
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': process_names + _events, 'displayTimeUnit': 'ms'}, f)
+
+
+def summarize() -> List[Dict[str, float]]:
+    """
+    단계별 합계 (총 시간 내림차순)
+
+    Returns:
+        [{'name', 'count', 'total_ms', 'mean_ms', 'max_ms'}]
+    """
+    stats: Dict[str, List[float]] = {}
+    for event in _events:
+        stats.setdefault(event['name'], []).append(event['dur'] / 1000)
+
+    rows = [
+        {
+            'name': name,
+            'count': len(durations),
+            'total_ms': sum(durations),
+            'mean_ms': sum(durations) / len(durations),
+            'max_ms': max(durations),
+        }
+        for name, durations in stats.items()
+    ]
+    return sorted(rows, key=lambda row: -row['total_ms'])
+
+
+def print_summary(top: int = 15):
+    """총 시간 상위 단계 표 출력 (병렬 빌드는 워커 합계라 실제 경과 시간보다 클 수 있음)"""
+    rows = summarize()
+    if not rows:
+        return
+
+    print("\n" + "=" * 70)
+    print(f"⏱️  단계별 소요 시간 (상위 {min(top, len(rows))}개, 워커 합계)")
+    print("=" * 70)
+    print(f"{'단계':<32} {'횟수':>7} {'합계(ms)':>11} {'평균(ms)':>9} {'최대(ms)':>9}")
+    for row in rows[:top]:
+        print(f"{row['name']:<32} {row['count']:>7} {row['total_ms']:>11.1f} "
+              f"{row['mean_ms']:>9.2f} {row['max_ms']:>9.1f}")
+    print("=" * 70)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프로세스 간 파일 잠금
+
+빌드 / 업로드 / 메타데이터 스크립트를 동시에 실행해도 공유 파일
+(빌드 캐시, 업로드 캐시, problems_metadata.json)을 안전하게 읽고 쓰도록
+대상 파일 옆의 {파일}.lock 으로 잠근다. 파일마다 잠금이 따로라서
+서로 다른 파일을 쓰는 작업은 동시에 진행된다.
+
+- 공유 잠금 (shared=True): 여러 프로세스가 동시에 읽기
+- 배타 잠금 (기본): 한 프로세스만 읽기-수정-쓰기
+- POSIX는 flock을 사용하므로 잠금을 가진 프로세스가 죽으면 커널이 바로 해제한다.
+  flock이 없는 환경(Windows)은 잠금 파일 생성(O_EXCL)으로 대신하며 (공유 잠금도 배타로 동작),
+  STALE_LOCK_SECONDS보다 오래된 잠금 파일은 죽은 프로세스가 남긴 것으로 보고 회수한다.
+
+사용법:
+    from file_lock import file_lock, write_json_atomic
+
+    with file_lock(METADATA_FILE, shared=True):
+        metadata = json.load(...)
+
+    with file_lock(UPLOAD_CACHE_FILE):
+        cache = _read_upload_cache()
+        cache.update(updates)
+        write_json_atomic(UPLOAD_CACHE_FILE, cache, indent=2)
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# 잠금 대기 시간 (초)
+DEFAULT_LOCK_TIMEOUT = float(os.environ.get('FILE_LOCK_TIMEOUT', '600'))
+
+# 잠금 파일 방식에서 이보다 오래된 잠금은 회수 (초)
+STALE_LOCK_SECONDS = 3600
+
+POLL_INTERVAL = 0.1
+
+
+class LockTimeout(TimeoutError):
+    """대기 시간 안에 잠금을 얻지 못함"""
+
+
+def lock_path_for(path: Path) -> Path:
+    """대상 파일의 잠금 파일 경로"""
+    return path.with_name(path.name + '.lock')
+
+
+def _owner_info() -> dict:
+    """잠금 파일에 기록할 소유 프로세스 정보"""
+    return {
+        'pid': os.getpid(),
+        'host': socket.gethostname(),
+        'command': Path(sys.argv[0]).name,
+        'time': time.time(),
+    }
+
+
+def _read_owner(lock_file: Path) -> Optional[dict]:
+    """잠금 파일의 소유 프로세스 정보 (없거나 공유 잠금이면 None)"""
+    try:
+        return json.loads(lock_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _describe_owner(owner: Optional[dict]) -> str:
+    if not owner:
+        return "다른 프로세스"
+    return f"{owner.get('command') or '?'} (pid {owner.get('pid')}, {owner.get('host')})"
+
+
+def _acquire_flock(lock_file: Path, shared: bool, timeout: float) -> int:
+    """flock으로 잠금 (파일 디스크립터 반환)"""
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+    mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    deadline = time.monotonic() + timeout
+    waiting = False
+
+    while True:
+        try:
+            fcntl.flock(fd, mode | fcntl.LOCK_NB)
+            break
+        except BlockingIOError:
+            if not waiting:
+                print(f"🔒 잠금 대기: {lock_file.name} - {_describe_owner(_read_owner(lock_file))}")
+                waiting = True
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                raise LockTimeout(f"{lock_file}: {timeout:g}초 안에 잠금을 얻지 못함")
+            time.sleep(POLL_INTERVAL)
+
+    # 배타 잠금이면 대기하는 쪽에 보여줄 소유 정보 기록
+    if not shared:
+        os.ftruncate(fd, 0)
+        os.write(fd, json.dumps(_owner_info()).encode('utf-8'))
+    return fd
+
+
+def _release_flock(fd: int, shared: bool):
+    if not shared:
+        os.ftruncate(fd, 0)
+    fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+
+
+def _acquire_lockfile(lock_file: Path, timeout: float):
+    """잠금 파일 생성으로 배타 잠금 (flock이 없는 환경)"""
+    deadline = time.monotonic() + timeout
+    waiting = False
+
+    while True:
+        try:
+            fd = os.open(lock_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            owner = _read_owner(lock_file)
+            try:
+                locked_at = (owner or {}).get('time') or lock_file.stat().st_mtime
+            except FileNotFoundError:
+                continue  # 방금 해제됨
+
+            if time.time() - locked_at > STALE_LOCK_SECONDS:
+                print(f"⚠️  오래된 잠금 회수: {lock_file.name} - {_describe_owner(owner)}")
+                try:
+                    lock_file.unlink()
+                except FileNotFoundError:
+                    pass
+                continue
+
+            if not waiting:
+                print(f"🔒 잠금 대기: {lock_file.name} - {_describe_owner(owner)}")
+                waiting = True
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"{lock_file}: {timeout:g}초 안에 잠금을 얻지 못함")
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(_owner_info(), f)
+        return
+
+
+@contextmanager
+def file_lock(path: Path, shared: bool = False, timeout: float = DEFAULT_LOCK_TIMEOUT):
+    """
+    path에 대한 프로세스 간 잠금
+
+    Args:
+        path: 잠글 대상 파일 (실제 잠금은 {path}.lock)
+        shared: True면 공유(읽기) 잠금, False면 배타(쓰기) 잠금
+        timeout: 잠금 대기 시간 (초), 넘으면 LockTimeout
+    """
+    lock_file = lock_path_for(Path(path))
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+
+    if fcntl is not None:
+        fd = _acquire_flock(lock_file, shared, timeout)
+        try:
+            yield
+        finally:
+            _release_flock(fd, shared)
+    else:
+        _acquire_lockfile(lock_file, timeout)
+        try:
+            yield
+        finally:
+            try:
+                lock_file.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def write_json_atomic(path: Path, data, **dump_kwargs):
+    """
+    JSON 파일을 임시 파일에 쓴 뒤 교체
+
+    읽는 쪽(업로드, 웹 서버 등)은 잠금 없이도 항상 완전한 파일을 본다.
+    """
+    path = Path(path)
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_kwargs)
+    os.replace(tmp_file, path)
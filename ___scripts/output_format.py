@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dist/ 출력 형식 (문제 / 메타데이터 payload 인코딩)
+
+build_incremental.py가 dist/problems/{id}.* 와 dist/metadata.* 를 쓸 때 사용한다.
+
+- json    : 공백 없는 JSON (기본, 웹 앱이 읽는 형식)
+- msgpack : MessagePack (pip install msgpack)
+- cbor    : CBOR (pip install cbor2)
+
+여러 형식을 함께 쓰면 같은 이름에 확장자만 다른 파일이 나란히 생긴다.
+들여쓰기한 JSON은 디버그용 (--pretty 또는 환경변수 DIST_PRETTY=1)에서만 쓴다.
+형식 설정은 빌드 캐시 키에 포함되므로 바꾸면 한 번 전체 재빌드된다.
+
+사용법:
+    python3 output_format.py                 # dist/의 payload로 형식별 크기 / 파싱 시간 비교
+    python3 output_format.py --repeat 20     # 파싱 시간 측정 반복 횟수
+"""
+
+import argparse
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # 선택 의존성
+    cbor2 = None
+
+BASE_DIR = Path(__file__).parent.parent
+DIST_DIR = BASE_DIR / "dist"
+
+# 형식 이름 → 확장자
+FORMAT_SUFFIXES = {'json': '.json', 'msgpack': '.msgpack', 'cbor': '.cbor'}
+
+# 형식 이름 → 필요한 패키지 (pip 이름)
+FORMAT_PACKAGES = {'msgpack': 'msgpack', 'cbor': 'cbor2'}
+
+DEFAULT_FORMATS = ['json']
+
+# 출력 설정 (환경변수로 워커 프로세스에도 전달)
+DIST_FORMATS = [name for name in os.getenv('DIST_FORMATS', ','.join(DEFAULT_FORMATS)).split(',')
+                if name in FORMAT_SUFFIXES]
+DIST_PRETTY = os.getenv('DIST_PRETTY', '') == '1'
+
+
+def _module_for(name: str):
+    return {'msgpack': msgpack, 'cbor': cbor2}.get(name, json)
+
+
+def missing_packages(formats: Optional[Sequence[str]] = None) -> List[str]:
+    """선택한 형식(기본: 현재 설정) 중 패키지가 설치되지 않은 것의 pip 이름"""
+    formats = DIST_FORMATS if formats is None else formats
+    return [FORMAT_PACKAGES[name] for name in formats
+            if name in FORMAT_PACKAGES and _module_for(name) is None]
+
+
+def configure(formats: Optional[Sequence[str]] = None, pretty: Optional[bool] = None):
+    """출력 형식 설정 (환경변수에도 기록해 워커 프로세스가 같은 설정을 쓰도록)"""
+    global DIST_FORMATS, DIST_PRETTY
+    if formats is not None:
+        DIST_FORMATS = list(dict.fromkeys(formats))
+        os.environ['DIST_FORMATS'] = ','.join(DIST_FORMATS)
+    if pretty is not None:
+        DIST_PRETTY = pretty
+        os.environ['DIST_PRETTY'] = '1' if pretty else ''
+
+
+def format_signature() -> str:
+    """빌드 캐시 키에 들어가는 출력 설정"""
+    return f"output-{'+'.join(DIST_FORMATS)}{'-pretty' if DIST_PRETTY else ''}"
+
+
+def output_suffixes() -> List[str]:
+    """현재 설정으로 쓰는 확장자"""
+    return [FORMAT_SUFFIXES[name] for name in DIST_FORMATS]
+
+
+def output_paths(stem: Path) -> List[Path]:
+    """확장자 없는 경로(dist/problems/245) → 현재 설정으로 쓰는 파일들"""
+    return [stem.with_name(stem.name + suffix) for suffix in output_suffixes()]
+
+
+def encode(data, name: str, pretty: bool = False) -> bytes:
+    """payload를 형식 name으로 인코딩"""
+    if name == 'json':
+        if pretty:
+            text = json.dumps(data, ensure_ascii=False, indent=2)
+        else:
+            text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        return text.encode('utf-8')
+    if name == 'msgpack':
+        return msgpack.packb(data, use_bin_type=True)
+    if name == 'cbor':
+        return cbor2.dumps(data)
+    raise ValueError(f"알 수 없는 출력 형식: {name}")
+
+
+def decoder_for(name: str) -> Callable[[bytes], object]:
+    if name == 'json':
+        return json.loads
+    if name == 'msgpack':
+        return lambda raw: msgpack.unpackb(raw, raw=False)
+    if name == 'cbor':
+        return cbor2.loads
+    raise ValueError(f"알 수 없는 출력 형식: {name}")
+
+
+def read_payload(stem: Path) -> Optional[object]:
+    """확장자 없는 경로의 payload를 읽을 수 있는 첫 형식으로 디코딩 (없으면 None)"""
+    for name, suffix in FORMAT_SUFFIXES.items():
+        path = stem.with_name(stem.name + suffix)
+        if _module_for(name) is None or not path.exists():
+            continue
+        try:
+            return decoder_for(name)(path.read_bytes())
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, path)
+
+
+def write_payload(stem: Path, data) -> int:
+    """
+    현재 설정의 모든 형식으로 저장하고 쓰지 않는 형식의 파일은 삭제
+
+    Args:
+        stem: 확장자 없는 경로 (dist/problems/245, dist/metadata)
+
+    Returns:
+        쓴 바이트 합계
+    """
+    written = 0
+    for name, suffix in FORMAT_SUFFIXES.items():
+        path = stem.with_name(stem.name + suffix)
+        if name in DIST_FORMATS:
+            encoded = encode(data, name, pretty=DIST_PRETTY)
+            _write_atomic(path, encoded)
+            written += len(encoded)
+        elif path.exists():
+            path.unlink()
+    return written
+
+
+def compare_formats(payloads: List[object], repeat: int = 10) -> List[Dict[str, float]]:
+    """
+    payload 묶음을 형식별로 인코딩해 크기 / gzip 크기 / 파싱 시간 비교
+
+    Returns:
+        [{'format', 'bytes', 'gzip_bytes', 'parse_ms'}] (parse_ms: 전체 디코딩의 최소 시간)
+    """
+    candidates = [('json (pretty)', 'json', True), ('json', 'json', False)]
+    candidates += [(name, name, False) for name in ('msgpack', 'cbor') if _module_for(name) is not None]
+
+    rows = []
+    for label, name, pretty in candidates:
+        encoded = [encode(data, name, pretty=pretty) for data in payloads]
+        decode = decoder_for(name)
+        best = float('inf')
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            for raw in encoded:
+                decode(raw)
+            best = min(best, time.perf_counter() - start)
+        rows.append({
+            'format': label,
+            'bytes': sum(len(raw) for raw in encoded),
+            'gzip_bytes': sum(len(gzip.compress(raw, compresslevel=9, mtime=0)) for raw in encoded),
+            'parse_ms': best * 1000,
+        })
+    return rows
+
+
+def load_dist_payloads(dist_dir: Path = DIST_DIR) -> List[object]:
+    """dist/의 JSON payload (metadata.json + 문제 / 풀이 / 인쇄 payload)"""
+    paths = [dist_dir / "metadata.json"]
+    for subdir in ("problems", "solutions", "print"):
+        paths += sorted((dist_dir / subdir).glob("*.json"))
+    payloads = []
+    for path in paths:
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                payloads.append(json.load(f))
+    return payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='dist/ payload의 형식별 크기 / 파싱 시간 비교',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--dir', type=Path, default=DIST_DIR,
+                        help=f'비교할 dist 디렉토리 (기본: {DIST_DIR}, JSON 출력이 있어야 함)')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='파싱 시간 측정 반복 횟수 (최소값 사용, 기본: 10)')
+
+    args = parser.parse_args()
+
+    payloads = load_dist_payloads(args.dir)
+    if not payloads:
+        print(f"❌ JSON payload가 없습니다: {args.dir}")
+        print("   먼저 build_incremental.py를 실행하세요.")
+        return
+
+    for package in missing_packages(['msgpack', 'cbor']):
+        print(f"⚠️  {package} 패키지가 없어 비교에서 제외합니다 (pip install {package})")
+
+    rows = compare_formats(payloads, args.repeat)
+    baseline = rows[0]['bytes']
+
+    print("\n" + "=" * 70)
+    print(f"📦 출력 형식 비교 (payload {len(payloads)}개)")
+    print("=" * 70)
+    print(f"{'형식':<16} {'크기(KB)':>10} {'비율':>7} {'gzip(KB)':>10} {'파싱(ms)':>10}")
+    for row in rows:
+        print(f"{row['format']:<16} {row['bytes'] / 1024:>10.1f} {row['bytes'] / baseline:>7.1%} "
+              f"{row['gzip_bytes'] / 1024:>10.1f} {row['parse_ms']:>10.2f}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+문제 payload 프로필 (필드 투영)
+
+빌드한 문제 하나의 전체 레코드(메타데이터 + content + solution + solution_text + svg_files)에서
+화면마다 필요한 필드만 골라 따로 저장한다.
+
+- list     : dist/metadata.json 항목 (메타데이터 + has_solution)
+- problem  : dist/problems/{id}.*  문제를 열 때 (본문, 그림 목록)
+- solution : dist/solutions/{id}.* 풀이를 열 때 지연 로드 (풀이 설명)
+- print    : dist/print/{id}.*     인쇄 / 내보내기용 전체 (--print-profile 또는 DIST_PRINT_PROFILE=1)
+
+필드 목록과 print 생성 여부는 빌드 캐시 키에 포함되므로 바꾸면 한 번 전체 재빌드된다.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+# 메타데이터 항목 전체를 뜻하는 필드 이름
+META_FIELDS = "@meta"
+
+# 빌드가 만드는 필드 (메타데이터 항목에 같은 이름이 있어도 @meta에는 넣지 않음)
+BUILT_FIELDS = ('content', 'solution', 'solution_text', 'svg_files', 'has_solution')
+
+# 프로필 → 필드 (순서대로)
+PROFILES: Dict[str, List[str]] = {
+    'list': [META_FIELDS, 'has_solution'],
+    'problem': ['id', 'content', 'svg_files', 'has_solution'],
+    'solution': ['id', 'solution_text'],
+    'print': [META_FIELDS, 'content', 'solution', 'solution_text', 'svg_files'],
+}
+
+# 문제별 payload를 쓰는 프로필 → dist/ 하위 디렉토리
+PROFILE_DIRS = {'problem': 'problems', 'solution': 'solutions', 'print': 'print'}
+
+# 인쇄용 payload 생성 (환경변수로 워커 프로세스에도 전달)
+DIST_PRINT_PROFILE = os.getenv('DIST_PRINT_PROFILE', '') == '1'
+
+
+def configure(print_profile: Optional[bool] = None):
+    """print 프로필 생성 여부 설정 (환경변수에도 기록)"""
+    global DIST_PRINT_PROFILE
+    if print_profile is not None:
+        DIST_PRINT_PROFILE = print_profile
+        os.environ['DIST_PRINT_PROFILE'] = '1' if print_profile else ''
+
+
+def profile_signature() -> str:
+    """빌드 캐시 키에 들어가는 프로필 설정"""
+    return json.dumps({'profiles': PROFILES, 'print': DIST_PRINT_PROFILE}, sort_keys=True)
+
+
+def problem_profiles(has_solution: bool = True) -> List[str]:
+    """문제 하나에 대해 payload를 쓰는 프로필 (풀이가 없으면 solution 제외)"""
+    names = ['problem']
+    if has_solution:
+        names.append('solution')
+    if DIST_PRINT_PROFILE:
+        names.append('print')
+    return names
+
+
+def _expand(fields: Iterable[str], meta: dict) -> List[str]:
+    expanded = []
+    for field in fields:
+        if field == META_FIELDS:
+            expanded += [k for k in meta if k not in BUILT_FIELDS]
+        else:
+            expanded.append(field)
+    return list(dict.fromkeys(expanded))
+
+
+def project(record: dict, profile: str, meta: dict) -> dict:
+    """
+    레코드에서 프로필의 필드만 추출
+
+    Args:
+        record: 메타데이터 + 빌드 필드
+        meta: 이 문제의 메타데이터 항목 (@meta 확장용)
+    """
+    return {k: record[k] for k in _expand(PROFILES[profile], meta) if k in record}
+
+
+def json_size(data) -> int:
+    """공백 없는 JSON으로 인코딩한 바이트 (프로필 크기 비교용)"""
+    return len(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def profile_sizes(record: dict, meta: dict) -> Dict[str, int]:
+    """
+    프로필별 JSON 바이트와 나누기 전 통합 payload 바이트
+
+    Returns:
+        {'full': 기존 dist/problems/{id}.json 크기, 'problem', 'solution', 'print'}
+        (풀이가 없으면 solution은 0)
+    """
+    sizes = {'full': json_size({k: v for k, v in record.items() if k != 'has_solution'})}
+    for profile in PROFILE_DIRS:
+        sizes[profile] = json_size(project(record, profile, meta))
+    if not record.get('has_solution'):
+        sizes['solution'] = 0
+    return sizes
+
+
+def summarize_sizes(rows: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """문제별 profile_sizes 합계 (+ 'problems': 문제 수)"""
+    totals = {'problems': 0, 'full': 0, **{profile: 0 for profile in PROFILE_DIRS}}
+    for row in rows:
+        totals['problems'] += 1
+        for key, value in row.items():
+            if key in totals:
+                totals[key] += value
+    return totals
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dist/ 사전 압축 (.br / .gz)
+
+빌드 끝에 dist/의 JSON / SVG 등 텍스트 파일마다 최대 압축률로 압축한
+{name}.br / {name}.gz 를 옆에 만든다. upload_to_r2.py가 이 파일들을 원본과 같은
+Content-Type + Content-Encoding으로 올리므로, 요청마다 엣지에서 압축하지 않고
+클라이언트는 가장 작은 바이트를 받는다.
+
+- 크기가 PRECOMPRESS_MIN_BYTES(기본 1024) 미만이거나 압축해도 작아지지 않는 파일은 만들지 않음
+- gzip은 mtime=0으로 압축해 같은 입력은 항상 같은 바이트 (업로드 해시가 바뀌지 않음)
+- 원본보다 새로운 압축 파일은 다시 압축하지 않음, 원본이 사라진 압축 파일은 삭제
+- brotli 패키지가 없으면 .gz만 만든다 (pip install brotli)
+
+사용법:
+    python3 precompress.py                  # dist/ 전체
+    python3 precompress.py --min-bytes 512  # 임계값 지정
+"""
+
+import argparse
+import gzip
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip만
+    brotli = None
+
+BASE_DIR = Path(__file__).parent.parent
+DIST_DIR = BASE_DIR / "dist"
+
+# 이보다 작은 파일은 압축 이득보다 요청 오버헤드가 큼
+PRECOMPRESS_MIN_BYTES = int(os.getenv('PRECOMPRESS_MIN_BYTES', '1024'))
+
+# 압축할 확장자 (이미 압축된 이미지 등은 제외)
+TEXT_SUFFIXES = {'.json', '.svg', '.html', '.css', '.js', '.txt', '.xml'}
+BINARY_SUFFIXES = {'.msgpack', '.cbor'}  # output_format.py의 바이너리 출력 (문자열이 많아 잘 줄어듦)
+COMPRESSIBLE_SUFFIXES = TEXT_SUFFIXES | BINARY_SUFFIXES
+
+# 압축 파일 확장자 → Content-Encoding
+ENCODINGS = {'.br': 'br', '.gz': 'gzip'}
+
+
+def compress_gzip(data: bytes, text: bool = True) -> bytes:
+    # mtime=0: 헤더에 시각이 들어가지 않도록
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data: bytes, text: bool = True) -> bytes:
+    return brotli.compress(data, quality=11, mode=brotli.MODE_TEXT if text else brotli.MODE_GENERIC)
+
+
+def available_compressors() -> Dict[str, object]:
+    """압축 파일 확장자 → 압축 함수 (brotli가 없으면 .gz만)"""
+    compressors = {'.gz': compress_gzip}
+    if brotli is not None:
+        compressors['.br'] = compress_brotli
+    return compressors
+
+
+def precompress_signature(min_bytes: int = PRECOMPRESS_MIN_BYTES) -> str:
+    """압축본 구성에 영향을 주는 설정 (바뀌면 dist/가 그대로여도 다시 동기화)"""
+    return f"precompress-{'+'.join(sorted(available_compressors()))}-{min_bytes}"
+
+
+def source_of(path: Path) -> Optional[Path]:
+    """압축 파일이면 원본 경로, 아니면 None"""
+    if path.suffix in ENCODINGS and Path(path.stem).suffix in COMPRESSIBLE_SUFFIXES:
+        return path.with_name(path.stem)
+    return None
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, path)
+
+
+def recompress_sibling(path: Path, min_bytes: int = PRECOMPRESS_MIN_BYTES) -> bool:
+    """
+    압축본 하나를 현재 원본으로 다시 만듦 (precompress_dir와 같은 규칙)
+
+    원본이 없거나 임계값보다 작거나 압축해도 작아지지 않으면 압축본을 삭제한다.
+
+    Returns:
+        압축본이 남아 있으면 True
+    """
+    source = source_of(path)
+    compressors = available_compressors()
+    data = source.read_bytes() if source is not None and source.exists() else None
+    compressed = None
+    if data is not None and len(data) >= min_bytes and path.suffix in compressors:
+        compressed = compressors[path.suffix](data, text=source.suffix in TEXT_SUFFIXES)
+    if compressed is None or len(compressed) >= len(data):
+        if path.exists():
+            path.unlink()
+        return False
+    _write_atomic(path, compressed)
+    return True
+
+
+def precompress_dir(dist_dir: Path = DIST_DIR,
+                    min_bytes: int = PRECOMPRESS_MIN_BYTES) -> Dict[str, int]:
+    """
+    dist_dir 아래 텍스트 파일의 .br / .gz 동기화
+
+    Returns:
+        {'files', 'compressed', 'removed', 'source_bytes', 'smallest_bytes', 'gz_bytes', 'br_bytes'}
+        (source_bytes / smallest_bytes: 압축본이 있는 파일의 원본 / 가장 작은 압축본 합계)
+    """
+    compressors = available_compressors()
+    stats = {'files': 0, 'compressed': 0, 'removed': 0,
+             'source_bytes': 0, 'smallest_bytes': 0, 'gz_bytes': 0, 'br_bytes': 0}
+    if not dist_dir.exists():
+        return stats
+
+    for path in sorted(dist_dir.rglob('*')):
+        if not path.is_file():
+            continue
+
+        source = source_of(path)
+        if source is not None:
+            # 원본이 사라졌거나 더 이상 만들지 않는 인코딩
+            if not source.exists() or path.suffix not in compressors:
+                path.unlink()
+                stats['removed'] += 1
+            continue
+        if path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+
+        source_stat = path.stat()
+        data = None
+        sizes = []
+        for suffix, compress in compressors.items():
+            target = path.with_name(path.name + suffix)
+            if source_stat.st_size < min_bytes:
+                if target.exists():
+                    target.unlink()
+                    stats['removed'] += 1
+                continue
+            if target.exists() and target.stat().st_mtime_ns >= source_stat.st_mtime_ns:
+                sizes.append((suffix, target.stat().st_size))
+                continue
+
+            if data is None:
+                data = path.read_bytes()
+            compressed = compress(data, text=path.suffix in TEXT_SUFFIXES)
+            if len(compressed) >= len(data):
+                if target.exists():
+                    target.unlink()
+                    stats['removed'] += 1
+                continue
+            _write_atomic(target, compressed)
+            stats['compressed'] += 1
+            sizes.append((suffix, len(compressed)))
+
+        if sizes:
+            stats['files'] += 1
+            stats['source_bytes'] += source_stat.st_size
+            stats['smallest_bytes'] += min(size for _, size in sizes)
+            for suffix, size in sizes:
+                stats['gz_bytes' if suffix == '.gz' else 'br_bytes'] += size
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='dist/ 사전 압축 (.br / .gz)',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--dir', type=Path, default=DIST_DIR,
+                        help=f'압축할 디렉토리 (기본: {DIST_DIR})')
+    parser.add_argument('--min-bytes', type=int, default=PRECOMPRESS_MIN_BYTES,
+                        help=f'이보다 작은 파일은 압축하지 않음 (기본: {PRECOMPRESS_MIN_BYTES}, '
+                             f'환경변수 PRECOMPRESS_MIN_BYTES)')
+
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("⚠️  brotli 패키지가 없어 .gz만 만듭니다 (pip install brotli)")
+
+    stats = precompress_dir(args.dir, args.min_bytes)
+    print(f"🗜️  압축: {stats['files']}개 파일 (새로 압축 {stats['compressed']}개, "
+          f"삭제 {stats['removed']}개)")
+    if stats['source_bytes']:
+        print(f"  {stats['source_bytes'] / 1024:.1f} KB → {stats['smallest_bytes'] / 1024:.1f} KB "
+              f"(-{(1 - stats['smallest_bytes'] / stats['source_bytes']) * 100:.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
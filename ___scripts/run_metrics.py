@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+실행 지표 내보내기 (CI 대시보드용)
+
+build_incremental.py / upload_to_r2.py가 한 번 실행될 때의 수치
+(스캔한 파일 수, 캐시 적중률, 컴파일 / 실패한 그림 수, 쓴 / 올린 바이트,
+단계별 소요 시간, 업로드 처리량)를 출력 문구 대신 기계가 읽는 형식으로 남긴다.
+
+- FILE.prom : Prometheus textfile collector 형식 (실행마다 덮어씀)
+              node_exporter --collector.textfile.directory 에 두면 바로 수집된다.
+- 그 외     : JSON lines (실행마다 한 줄 추가, 시계열로 쌓임)
+
+사용법:
+    from run_metrics import RunMetrics
+
+    metrics = RunMetrics('build')
+    metrics.set('problems_built', 12, '다시 빌드한 문제 수')
+    metrics.set('stage_seconds', 3.2, '단계별 소요 시간 (초)', stage='pdflatex')
+    metrics.write(Path('build_metrics.prom'))
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+from file_lock import file_lock
+
+METRIC_PREFIX = "problem_bank"
+
+PROMETHEUS_SUFFIX = ".prom"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RunMetrics:
+    """한 번의 실행에서 모은 지표 (모두 gauge)"""
+
+    def __init__(self, job: str):
+        """
+        Args:
+            job: 지표 이름 앞에 붙는 작업 이름 (build / upload)
+        """
+        self.job = job
+        self.timestamp = time.time()
+        self.samples: List[Tuple[str, Dict[str, str], Union[int, float]]] = []
+        self.descriptions: Dict[str, str] = {}
+
+    def set(self, name: str, value: Union[int, float], description: str = "", **labels):
+        """지표 값 기록 (labels: stage='pdflatex' 등)"""
+        value = value if isinstance(value, int) else float(value)
+        self.samples.append((name, {k: str(v) for k, v in labels.items()}, value))
+        if description:
+            self.descriptions.setdefault(name, description)
+
+    def set_stages(self, rows: List[dict]):
+        """build_trace.summarize() 결과를 단계별 소요 시간 / 호출 수로 기록"""
+        for row in rows:
+            self.set('stage_seconds', round(row['total_ms'] / 1000, 6),
+                     '단계별 소요 시간 합계 (초, 병렬 빌드는 워커 합계)', stage=row['name'])
+            self.set('stage_calls', row['count'], '단계별 호출 수', stage=row['name'])
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        samples = self.samples + [
+            ('last_run_timestamp_seconds', {}, round(self.timestamp, 3)),
+        ]
+        self.descriptions.setdefault('last_run_timestamp_seconds', '마지막 실행 시각 (unix time)')
+
+        seen = set()
+        for name, _, _ in samples:
+            if name in seen:
+                continue
+            seen.add(name)
+            full_name = f"{METRIC_PREFIX}_{self.job}_{name}"
+            if name in self.descriptions:
+                lines.append(f"# HELP {full_name} {self.descriptions[name]}")
+            lines.append(f"# TYPE {full_name} gauge")
+            for sample_name, labels, value in samples:
+                if sample_name != name:
+                    continue
+                label_text = ",".join(f'{k}="{_escape_label(v)}"' for k, v in sorted(labels.items()))
+                lines.append(f"{full_name}{{{label_text}}} {value}" if label_text
+                             else f"{full_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> dict:
+        """JSON lines 한 줄 (라벨이 있는 지표는 라벨 값별 dict)"""
+        values: Dict[str, object] = {}
+        for name, labels, value in self.samples:
+            if labels:
+                label_key = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+                if len(labels) == 1:
+                    label_key = next(iter(labels.values()))
+                values.setdefault(name, {})[label_key] = value
+            else:
+                values[name] = value
+
+        return {
+            'job': self.job,
+            'timestamp': datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat(timespec='seconds'),
+            'metrics': values,
+        }
+
+    def write(self, path: Path):
+        """
+        확장자에 따라 저장
+
+        .prom은 임시 파일에 쓴 뒤 교체 (수집기가 쓰는 중인 파일을 읽지 않도록),
+        그 외는 잠금을 잡고 JSON 한 줄 추가.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.suffix == PROMETHEUS_SUFFIX:
+            tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_file.write_text(self.to_prometheus(), encoding='utf-8')
+            os.replace(tmp_file, path)
+        else:
+            with file_lock(path):
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(self.to_json(), ensure_ascii=False) + "\n")
+
+        print(f"📈 실행 지표 저장: {path}")
@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVG 최적화 (pdf2svg / dvisvgm 출력 후처리)
+
+cairo(pdf2svg) 출력은 전체 정밀도 좌표, 매 요소에 반복되는 기본값 속성,
+그림마다 같은 수식 글리프 정의를 담고 있어 CDN이 보내는 파일 중 가장 크다.
+
+- 좌표 양자화: path d / transform / 좌표 / 선 굵기를 소수점 SVG_PRECISION 자리로
+- 중복 속성 제거: style → 표현 속성, 상속값 / 초기값과 같은 속성, 쓰이지 않는 id 삭제,
+  rgb(%) 색 → #rrggbb, 속성 없는 <g> 풀기
+- 글리프 중복 제거: 모양이 같은 <defs> 정의를 하나로 합치고 참조되지 않는 정의 삭제
+- 정규화: id를 처음 쓰이는 순서대로 d0, d1, …로 바꾸고 <defs>를 그 순서로 정렬,
+  속성 이름순 정렬, 주석 / <metadata> 제거 → 같은 TikZ는 항상 같은 바이트
+  (컴파일러가 실행마다 다른 id / 정의 순서를 내도 업로드 해시가 바뀌지 않음)
+- (선택) 공유 스프라이트: 여러 그림의 글리프를 glyphs.svg 하나로 모으고 그림은 외부 참조
+  (<img>로 띄우는 SVG는 외부 참조를 읽지 못하므로 별도 디렉토리에 생성)
+
+사용법:
+    from svg_optimize import optimize_svg_file
+
+    before, after = optimize_svg_file(Path("dist/svg/001_fig1.svg"))
+
+    python3 svg_optimize.py dist/svg/*.svg        # 파일 최적화 (제자리)
+    python3 svg_optimize.py --dry-run dist/svg/*.svg
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+ET.register_namespace('', SVG_NS)
+ET.register_namespace('xlink', XLINK_NS)
+
+HREF = f"{{{XLINK_NS}}}href"
+
+# 좌표 소수점 자리수 (pt 단위, 3이면 0.001pt)
+SVG_PRECISION = int(os.getenv('SVG_PRECISION', '3'))
+
+# 최적화 규칙을 바꾸면 올림 (빌드 캐시 키에 포함되어 그림이 다시 생성됨)
+OPTIMIZER_VERSION = "2"
+
+# 공유 스프라이트 파일 이름 (스프라이트 디렉토리 안)
+SPRITE_FILENAME = "glyphs.svg"
+
+# 상속되는 표현 속성과 초기값
+INHERITED_DEFAULTS = {
+    'fill': '#000',
+    'fill-opacity': '1',
+    'fill-rule': 'nonzero',
+    'clip-rule': 'nonzero',
+    'stroke': 'none',
+    'stroke-width': '1',
+    'stroke-opacity': '1',
+    'stroke-linecap': 'butt',
+    'stroke-linejoin': 'miter',
+    'stroke-miterlimit': '4',
+    'stroke-dasharray': 'none',
+    'stroke-dashoffset': '0',
+    'visibility': 'visible',
+}
+
+# 상속되지 않는 속성 중 초기값이면 지울 수 있는 것
+NON_INHERITED_DEFAULTS = {
+    'opacity': '1',
+}
+
+# 숫자를 양자화할 속성
+NUMERIC_ATTRIBUTES = {
+    'x', 'y', 'width', 'height', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'r', 'rx', 'ry',
+    'points', 'stroke-width', 'stroke-dasharray', 'stroke-dashoffset', 'font-size',
+}
+
+# 색을 담는 속성
+COLOR_ATTRIBUTES = {'fill', 'stroke', 'stop-color', 'flood-color', 'lighting-color', 'color'}
+
+# 공백이 의미 있는 요소
+TEXT_ELEMENTS = {'text', 'tspan', 'textPath', 'title', 'desc', 'style'}
+
+# 렌더링과 무관하고 생성 시각 / 도구 정보가 들어가는 요소
+VOLATILE_ELEMENTS = {'metadata'}
+
+# 정규화된 id 접두사
+CANONICAL_ID_PREFIX = "d"
+
+NUMBER_PATTERN = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+PATH_TOKEN_PATTERN = re.compile(r'[A-Za-z]|-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+RGB_PATTERN = re.compile(r'rgb\(\s*([^,]+?)\s*,\s*([^,]+?)\s*,\s*([^)]+?)\s*\)')
+URL_REF_PATTERN = re.compile(r'url\(#([^)]+)\)')
+MATRIX_PATTERN = re.compile(r'^matrix\(([^)]*)\)$')
+
+
+def optimizer_signature() -> str:
+    """최적화 규칙 + 정밀도 (빌드 캐시 키용)"""
+    return f"svg-optimize-{OPTIMIZER_VERSION}-p{SVG_PRECISION}"
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def format_number(value: float, precision: int = SVG_PRECISION) -> str:
+    """반올림 후 불필요한 0 제거 (0.500 → .5, -0 → 0)"""
+    text = f"{value:.{precision}f}".rstrip('0').rstrip('.')
+    if text in ('', '-0'):
+        return '0'
+    if text.startswith('0.'):
+        return text[1:]
+    if text.startswith('-0.'):
+        return '-' + text[2:]
+    return text
+
+
+def _quantize_numbers(text: str, precision: int) -> str:
+    return NUMBER_PATTERN.sub(lambda m: format_number(float(m.group()), precision), text)
+
+
+def compact_path(d: str, precision: int = SVG_PRECISION) -> str:
+    """path 데이터 양자화 + 구분자 최소화 ("M 1.50000 -2 L" → "M1.5-2L")"""
+    out = []
+    prev = ''
+    for token in PATH_TOKEN_PATTERN.findall(d):
+        if token.isalpha():
+            out.append(token)
+            prev = token
+            continue
+        number = format_number(float(token), precision)
+        if prev and not prev.isalpha():
+            # 앞 숫자와 붙으면 다른 숫자로 읽히는 경우만 공백
+            if not (number.startswith('-') or (number.startswith('.') and '.' in prev)):
+                out.append(' ')
+        out.append(number)
+        prev = number
+    return ''.join(out)
+
+
+def compact_transform(transform: str, precision: int = SVG_PRECISION) -> Optional[str]:
+    """transform 양자화 (항등 변환이면 None, 평행 이동만 있으면 translate)"""
+    transform = _quantize_numbers(transform.strip(), precision)
+    transform = re.sub(r'\s*,\s*|\s+', ' ', transform).replace('( ', '(').replace(' )', ')')
+
+    match = MATRIX_PATTERN.match(transform)
+    if match:
+        values = match.group(1).split(' ')
+        if len(values) == 6 and values[:4] == ['1', '0', '0', '1']:
+            if values[4:] == ['0', '0']:
+                return None
+            return f"translate({values[4]} {values[5]})" if values[5] != '0' else f"translate({values[4]})"
+    return transform
+
+
+def _channel(value: str) -> int:
+    value = value.strip()
+    if value.endswith('%'):
+        return max(0, min(255, round(float(value[:-1]) * 255 / 100)))
+    return max(0, min(255, round(float(value))))
+
+
+def compact_color(value: str) -> str:
+    """rgb(…) → #rrggbb → 가능하면 #rgb"""
+    match = RGB_PATTERN.fullmatch(value.strip())
+    if match:
+        value = '#' + ''.join(f"{_channel(c):02x}" for c in match.groups())
+    if re.fullmatch(r'#[0-9a-fA-F]{6}', value):
+        value = value.lower()
+        if value[1] == value[2] and value[3] == value[4] and value[5] == value[6]:
+            value = '#' + value[1] + value[3] + value[5]
+    return value
+
+
+def _expand_style(elem: ET.Element):
+    """style="a:b;c:d" → 표현 속성 (CSS가 없으므로 우선순위 차이 없음)"""
+    style = elem.attrib.pop('style', None)
+    if not style:
+        return
+    for declaration in style.split(';'):
+        if ':' not in declaration:
+            continue
+        name, value = (part.strip() for part in declaration.split(':', 1))
+        if name and value:
+            elem.set(name, value)
+
+
+def _normalize_attributes(elem: ET.Element, precision: int):
+    """요소 하나의 속성 양자화 / 정규화"""
+    _expand_style(elem)
+    for name, value in list(elem.attrib.items()):
+        if name == 'd':
+            elem.set(name, compact_path(value, precision))
+        elif name == 'transform':
+            transform = compact_transform(value, precision)
+            if transform is None:
+                del elem.attrib[name]
+            else:
+                elem.set(name, transform)
+        elif name in NUMERIC_ATTRIBUTES:
+            elem.set(name, re.sub(r'\s*,\s*|\s+', ' ', _quantize_numbers(value.strip(), precision)))
+        elif name in COLOR_ATTRIBUTES:
+            elem.set(name, compact_color(value))
+
+
+def _strip_redundant(elem: ET.Element, inherited: Dict[str, str]):
+    """
+    부모에서 물려받는 값 / 초기값과 같은 속성 삭제
+
+    inherited에 없는 속성은 값을 알 수 없는 것으로 보고 남긴다
+    (<defs> 안의 정의는 참조하는 <use>의 값을 물려받으므로 빈 dict로 시작).
+    """
+    local = _local(elem.tag)
+    if local == 'defs':
+        inherited = {}
+    else:
+        inherited = dict(inherited)
+        for name, default in NON_INHERITED_DEFAULTS.items():
+            if elem.get(name) == default:
+                del elem.attrib[name]
+        for name in INHERITED_DEFAULTS:
+            value = elem.get(name)
+            if value is None:
+                continue
+            if inherited.get(name) == value:
+                del elem.attrib[name]
+            else:
+                inherited[name] = value
+
+    for child in elem:
+        _strip_redundant(child, inherited)
+
+
+def _collect_references(root: ET.Element) -> Set[str]:
+    """href="#id" / url(#id)로 참조되는 id"""
+    referenced = set()
+    for elem in root.iter():
+        for name, value in elem.attrib.items():
+            if name in (HREF, 'href') and value.startswith('#'):
+                referenced.add(value[1:])
+            else:
+                referenced.update(URL_REF_PATTERN.findall(value))
+    return referenced
+
+
+def _element_references(elem: ET.Element) -> List[str]:
+    """요소 하나가 참조하는 id (속성 이름순)"""
+    references = []
+    for name in sorted(elem.attrib):
+        value = elem.attrib[name]
+        if name in (HREF, 'href') and value.startswith('#'):
+            references.append(value[1:])
+        else:
+            references.extend(URL_REF_PATTERN.findall(value))
+    return references
+
+
+def _rewrite_references(root: ET.Element, mapping: Dict[str, str]):
+    """id 참조를 mapping에 따라 교체"""
+    for elem in root.iter():
+        for name, value in list(elem.attrib.items()):
+            if name in (HREF, 'href') and value.startswith('#') and value[1:] in mapping:
+                elem.set(name, '#' + mapping[value[1:]])
+            elif 'url(#' in value:
+                elem.set(name, URL_REF_PATTERN.sub(
+                    lambda m: f"url(#{mapping.get(m.group(1), m.group(1))})", value))
+
+
+def _strip_unreferenced_ids(elem: ET.Element, referenced: Set[str]):
+    """참조되지 않는 id 삭제 (surface1 등, <defs> 정의는 _dedupe_definitions가 처리)"""
+    for child in elem:
+        if _local(child.tag) == 'defs':
+            continue
+        if child.get('id') and child.get('id') not in referenced:
+            del child.attrib['id']
+        _strip_unreferenced_ids(child, referenced)
+
+
+def _unwrap_plain_groups(parent: ET.Element):
+    """속성 없는 <g>를 풀고 빈 <g> / <defs> / d="" path 삭제"""
+    index = 0
+    while index < len(parent):
+        child = parent[index]
+        _unwrap_plain_groups(child)
+        local = _local(child.tag)
+        if local == 'g' and not child.attrib:
+            parent.remove(child)
+            for offset, grandchild in enumerate(list(child)):
+                parent.insert(index + offset, grandchild)
+            continue
+        if local in ('g', 'defs') and len(child) == 0 and not child.get('id'):
+            parent.remove(child)
+            continue
+        if local == 'path' and not child.get('d') and not child.get('id'):
+            parent.remove(child)
+            continue
+        index += 1
+
+
+def _definition_signature(elem: ET.Element) -> str:
+    """id를 뺀 정의 내용 (같으면 같은 글리프)"""
+    clone = ET.Element(elem.tag, {k: v for k, v in elem.attrib.items() if k != 'id'})
+    clone.extend(list(elem))
+    return ET.tostring(clone, encoding='unicode')
+
+
+def _dedupe_definitions(root: ET.Element) -> int:
+    """같은 모양의 <defs> 정의를 하나로 합치고 참조되지 않는 정의 삭제"""
+    removed = 0
+    for defs in root.iter(f"{{{SVG_NS}}}defs"):
+        canonical: Dict[str, str] = {}
+        mapping: Dict[str, str] = {}
+        for child in list(defs):
+            child_id = child.get('id')
+            if not child_id:
+                continue
+            signature = _definition_signature(child)
+            if signature in canonical:
+                mapping[child_id] = canonical[signature]
+                defs.remove(child)
+                removed += 1
+            else:
+                canonical[signature] = child_id
+        if mapping:
+            _rewrite_references(root, mapping)
+
+    referenced = _collect_references(root)
+    for defs in root.iter(f"{{{SVG_NS}}}defs"):
+        for child in list(defs):
+            if child.get('id') and child.get('id') not in referenced:
+                defs.remove(child)
+                removed += 1
+    return removed
+
+
+def _strip_whitespace(elem: ET.Element):
+    """요소 사이 공백 제거 (텍스트 요소 안은 유지)"""
+    if _local(elem.tag) in TEXT_ELEMENTS:
+        return
+    if elem.text is not None and not elem.text.strip():
+        elem.text = None
+    for child in elem:
+        if child.tail is not None and not child.tail.strip():
+            child.tail = None
+        _strip_whitespace(child)
+
+
+def _remove_volatile(parent: ET.Element):
+    """<metadata> 등 렌더링과 무관한 요소 삭제 (주석 / 처리 명령은 파서가 버림)"""
+    for child in list(parent):
+        if _local(child.tag) in VOLATILE_ELEMENTS:
+            parent.remove(child)
+        else:
+            _remove_volatile(child)
+
+
+def _body_references(elem: ET.Element, order: List[str]):
+    """<defs> 밖의 참조를 문서 순서대로 수집"""
+    for child in elem:
+        if _local(child.tag) == 'defs':
+            continue
+        for ref in _element_references(child):
+            if ref not in order:
+                order.append(ref)
+        _body_references(child, order)
+
+
+def canonicalize_ids(root: ET.Element):
+    """
+    id를 처음 쓰이는 순서대로 d0, d1, …로 바꾸고 <defs> 정의를 그 순서로 정렬
+
+    그리는 순서(본문)가 같으면 컴파일러가 정의를 내보낸 순서 / 이름과 무관하게 같은 결과가 된다.
+    정의 안에서 다른 정의를 참조하면 참조하는 정의 다음 순서를 받는다.
+    """
+    definitions = {elem.get('id'): elem for elem in root.iter() if elem.get('id')}
+    if not definitions:
+        return
+
+    order: List[str] = []
+    _body_references(root, order)
+    index = 0
+    while index < len(order):
+        definition = definitions.get(order[index])
+        if definition is not None:
+            for elem in definition.iter():
+                for ref in _element_references(elem):
+                    if ref not in order:
+                        order.append(ref)
+        index += 1
+    # 참조되지 않는 id (최적화 후에는 보통 없음)는 문서 순서로 뒤에
+    order += [elem_id for elem_id in definitions if elem_id not in order]
+
+    mapping = {}
+    for elem_id in order:
+        if elem_id in definitions:
+            mapping[elem_id] = f"{CANONICAL_ID_PREFIX}{len(mapping)}"
+    _rewrite_references(root, mapping)
+    for elem_id, elem in definitions.items():
+        elem.set('id', mapping[elem_id])
+
+    rank = {new_id: n for n, new_id in enumerate(mapping.values())}
+    for defs in root.iter(f"{{{SVG_NS}}}defs"):
+        children = list(defs)
+        children.sort(key=lambda child: rank.get(child.get('id'), len(rank)))
+        defs[:] = children
+
+
+def _sort_attributes(root: ET.Element):
+    """속성을 이름순으로 (ElementTree는 삽입 순서대로 씀)"""
+    for elem in root.iter():
+        if len(elem.attrib) > 1:
+            items = sorted(elem.attrib.items())
+            elem.attrib.clear()
+            elem.attrib.update(items)
+
+
+def optimize_tree(root: ET.Element, precision: int = SVG_PRECISION):
+    """파싱된 SVG를 제자리에서 최적화"""
+    for elem in root.iter():
+        _normalize_attributes(elem, precision)
+    root.attrib.pop('version', None)
+
+    _strip_redundant(root, INHERITED_DEFAULTS)
+
+    _unwrap_plain_groups(root)
+    _dedupe_definitions(root)
+    _strip_unreferenced_ids(root, _collect_references(root))
+    _unwrap_plain_groups(root)
+    _strip_whitespace(root)
+
+    _remove_volatile(root)
+    canonicalize_ids(root)
+
+
+def serialize(root: ET.Element) -> str:
+    """속성을 정렬해 직렬화 (같은 트리는 항상 같은 바이트)"""
+    _sort_attributes(root)
+    # ElementTree는 빈 요소를 " />"로 씀 (속성 값 안의 >는 이스케이프되므로 안전)
+    return ET.tostring(root, encoding='unicode').replace(' />', '/>') + "\n"
+
+
+def optimize_svg(svg_text: str, precision: int = SVG_PRECISION) -> str:
+    """SVG 문자열 최적화"""
+    root = ET.fromstring(svg_text.encode('utf-8'))
+    optimize_tree(root, precision)
+    return serialize(root)
+
+
+def _write_atomic(path: Path, text: str):
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(text, encoding='utf-8')
+    os.replace(tmp_file, path)
+
+
+def optimize_svg_file(path: Path, precision: int = SVG_PRECISION,
+                      dry_run: bool = False) -> Tuple[int, int]:
+    """
+    SVG 파일을 제자리에서 최적화
+
+    파싱할 수 없는 파일은 그대로 둔다.
+
+    Returns:
+        (최적화 전 바이트, 최적화 후 바이트)
+    """
+    original = path.read_text(encoding='utf-8')
+    before = len(original.encode('utf-8'))
+    try:
+        optimized = optimize_svg(original, precision)
+    except ET.ParseError as e:
+        print(f"    ⚠️  SVG 최적화 건너뜀 ({path.name}): {e}")
+        return before, before
+
+    after = len(optimized.encode('utf-8'))
+    if not dry_run and optimized != original:
+        _write_atomic(path, optimized)
+    return before, after
+
+
+def _sprite_id(elem: ET.Element) -> str:
+    return "g" + hashlib.sha256(_definition_signature(elem).encode('utf-8')).hexdigest()[:12]
+
+
+def build_sprite(svg_dir: Path, sprite_dir: Path) -> Dict[str, int]:
+    """
+    svg_dir의 그림들에서 <use>로 쓰는 글리프 정의를 sprite_dir/glyphs.svg로 모으고,
+    글리프를 외부 참조(glyphs.svg#id)하는 그림을 sprite_dir에 생성
+
+    스프라이트 id는 글리프 내용 해시라 그림이 바뀌지 않으면 출력도 같고,
+    원본보다 새로운 스프라이트 그림은 다시 만들지 않는다.
+
+    Returns:
+        {'figures', 'glyphs', 'source_bytes', 'sprite_bytes'}
+    """
+    sprite_dir.mkdir(parents=True, exist_ok=True)
+    sprite_file = sprite_dir / SPRITE_FILENAME
+
+    # 기존 스프라이트의 글리프 (다시 만들지 않는 그림용)
+    known: Dict[str, ET.Element] = {}
+    if sprite_file.exists():
+        try:
+            for elem in ET.parse(sprite_file).getroot().iter():
+                if elem.get('id'):
+                    known[elem.get('id')] = elem
+        except ET.ParseError:
+            known = {}
+
+    live_glyphs: Dict[str, ET.Element] = {}
+    source_names = set()
+    stats = {'figures': 0, 'glyphs': 0, 'source_bytes': 0, 'sprite_bytes': 0}
+    ref_pattern = re.compile(re.escape(SPRITE_FILENAME) + r'#([\w-]+)')
+
+    for source in sorted(svg_dir.glob("*.svg")):
+        source_names.add(source.name)
+        target = sprite_dir / source.name
+        stats['figures'] += 1
+        stats['source_bytes'] += source.stat().st_size
+
+        if target.exists() and target.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+            ids = ref_pattern.findall(target.read_text(encoding='utf-8'))
+            if all(glyph_id in known for glyph_id in ids):
+                live_glyphs.update((glyph_id, known[glyph_id]) for glyph_id in ids)
+                stats['sprite_bytes'] += target.stat().st_size
+                continue
+
+        try:
+            root = ET.parse(source).getroot()
+        except ET.ParseError as e:
+            print(f"    ⚠️  스프라이트 건너뜀 ({source.name}): {e}")
+            continue
+
+        used = {
+            elem.get(HREF, elem.get('href', ''))[1:]
+            for elem in root.iter(f"{{{SVG_NS}}}use")
+        }
+        mapping = {}
+        for defs in root.iter(f"{{{SVG_NS}}}defs"):
+            for child in list(defs):
+                if child.get('id') in used:
+                    glyph_id = _sprite_id(child)
+                    mapping[child.get('id')] = glyph_id
+                    live_glyphs[glyph_id] = child
+                    defs.remove(child)
+        for elem in root.iter(f"{{{SVG_NS}}}use"):
+            key = HREF if elem.get(HREF) is not None else 'href'
+            local_id = elem.get(key, '')[1:]
+            if local_id in mapping:
+                elem.set(key, f"{SPRITE_FILENAME}#{mapping[local_id]}")
+        _unwrap_plain_groups(root)
+
+        text = serialize(root)
+        if not target.exists() or target.read_text(encoding='utf-8') != text:
+            _write_atomic(target, text)
+        stats['sprite_bytes'] += len(text.encode('utf-8'))
+
+    # 원본이 사라진 그림 정리
+    for target in sprite_dir.glob("*.svg"):
+        if target.name != SPRITE_FILENAME and target.name not in source_names:
+            target.unlink()
+
+    sprite = ET.Element(f"{{{SVG_NS}}}svg")
+    defs = ET.SubElement(sprite, f"{{{SVG_NS}}}defs")
+    for glyph_id in sorted(live_glyphs):
+        glyph = live_glyphs[glyph_id]
+        clone = ET.SubElement(defs, glyph.tag, {**glyph.attrib, 'id': glyph_id})
+        clone.extend(list(glyph))
+    text = serialize(sprite)
+    if not sprite_file.exists() or sprite_file.read_text(encoding='utf-8') != text:
+        _write_atomic(sprite_file, text)
+
+    stats['glyphs'] = len(live_glyphs)
+    stats['sprite_bytes'] += len(text.encode('utf-8'))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='SVG 최적화 (좌표 양자화, 중복 속성 / 글리프 제거)',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('files', nargs='+', type=Path, help='최적화할 SVG 파일')
+    parser.add_argument('--precision', type=int, default=SVG_PRECISION,
+                        help=f'좌표 소수점 자리수 (기본: {SVG_PRECISION}, 환경변수 SVG_PRECISION)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='파일을 바꾸지 않고 크기만 비교')
+
+    args = parser.parse_args()
+
+    total_before = total_after = 0
+    for path in args.files:
+        before, after = optimize_svg_file(path, args.precision, dry_run=args.dry_run)
+        total_before += before
+        total_after += after
+        print(f"  {path.name}: {before / 1024:.1f} KB → {after / 1024:.1f} KB")
+
+    if total_before:
+        print(f"\n🪶 합계: {total_before / 1024:.1f} KB → {total_after / 1024:.1f} KB "
+              f"(-{(1 - total_after / total_before) * 100:.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
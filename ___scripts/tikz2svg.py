@@ -10,16 +10,16 @@ solution 파일들의 tikzpicture 환경을 SVG로 변환하고,
     python3 tikz2svg.py 245                # 245_solution.tex만 처리
     python3 tikz2svg.py 245 246            # 여러 파일 처리
     python3 tikz2svg.py --check            # 변환 필요한 파일 확인만
+    python3 tikz2svg.py --jobs 4           # TeX 워커 4개로 병렬 변환
 """
 
 import argparse
 import os
-import re
 import shutil
-import subprocess
-import tempfile
 from pathlib import Path
 
+from tikz_render import BACKENDS, DEFAULT_BACKEND, TIKZ_PATTERN, FigureRenderer, compile_tikz_many
+
 
 # 기준 디렉토리
 BASE_DIR = Path(__file__).parent.parent
@@ -27,21 +27,6 @@ PROBLEMS_DIR = BASE_DIR / "problems"
 SOLUTIONS_DIR = PROBLEMS_DIR / "solutions"
 SVG_OUTPUT_DIR = BASE_DIR / "web_app" / "data" / "svg"
 
-# standalone LaTeX 템플릿
-STANDALONE_TEMPLATE = r"""\documentclass[tikz,border=5pt]{standalone}
-\usepackage{tkz-euclide}
-\usepackage{xcolor}
-\begin{document}
-%s
-\end{document}
-"""
-
-# tikzpicture 환경 패턴
-TIKZ_PATTERN = re.compile(
-    r'\\begin\{tikzpicture\}.*?\\end\{tikzpicture\}',
-    re.DOTALL
-)
-
 
 def find_tikz_in_file(filepath: Path) -> list[tuple[int, str]]:
     """파일에서 모든 tikzpicture 환경을 찾아 반환"""
@@ -55,46 +40,6 @@ def find_tikz_in_file(filepath: Path) -> list[tuple[int, str]]:
     return matches
 
 
-def compile_tikz_to_svg(tikz_code: str, output_path: Path) -> bool:
-    """tikzpicture 코드를 SVG로 변환"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        tex_file = tmpdir / "figure.tex"
-        pdf_file = tmpdir / "figure.pdf"
-
-        # standalone tex 파일 생성
-        tex_content = STANDALONE_TEMPLATE % tikz_code
-        with open(tex_file, 'w', encoding='utf-8') as f:
-            f.write(tex_content)
-
-        # pdflatex 컴파일
-        result = subprocess.run(
-            ['pdflatex', '-interaction=nonstopmode', '-halt-on-error', tex_file.name],
-            cwd=tmpdir,
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0 or not pdf_file.exists():
-            print(f"  ❌ pdflatex 컴파일 실패")
-            print(f"     에러: {result.stdout[-500:] if result.stdout else result.stderr[-500:]}")
-            return False
-
-        # pdf2svg 변환
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        result = subprocess.run(
-            ['pdf2svg', str(pdf_file), str(output_path)],
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0:
-            print(f"  ❌ pdf2svg 변환 실패: {result.stderr}")
-            return False
-
-        return True
-
-
 def get_svg_reference(svg_filename: str, for_web: bool = True) -> str:
     """SVG 참조 코드 생성"""
     if for_web:
@@ -131,13 +76,17 @@ def process_solution_file(problem_id: str, dry_run: bool = False) -> dict:
     results = []
     new_content = content
 
-    for idx, tikz_code in tikz_matches:
-        svg_filename = f"{problem_id}_fig{idx + 1}.svg"
-        svg_path = SVG_OUTPUT_DIR / svg_filename
+    svg_filenames = [f"{problem_id}_fig{idx + 1}.svg" for idx, _ in tikz_matches]
+    print(f"  {len(tikz_matches)}개 tikzpicture 변환 중...")
 
-        print(f"  [{idx + 1}/{len(tikz_matches)}] {svg_filename} 변환 중...")
+    # 렌더러 워커들에 분배하여 컴파일
+    compiled = compile_tikz_many(
+        [tikz_code for _, tikz_code in tikz_matches],
+        [SVG_OUTPUT_DIR / svg_filename for svg_filename in svg_filenames]
+    )
 
-        if compile_tikz_to_svg(tikz_code, svg_path):
+    for (idx, tikz_code), svg_filename, ok in zip(tikz_matches, svg_filenames, compiled):
+        if ok:
             # tikzpicture를 SVG 참조로 대체
             svg_ref = get_svg_reference(svg_filename)
             new_content = new_content.replace(tikz_code, svg_ref, 1)
@@ -187,12 +136,16 @@ def main():
   python3 tikz2svg.py 245 246            # 여러 파일 처리
   python3 tikz2svg.py --check            # 변환 필요한 파일 확인만
   python3 tikz2svg.py --list             # tikz 포함 파일 목록
+  python3 tikz2svg.py --jobs 4           # TeX 워커 4개로 병렬 변환
         """
     )
 
     parser.add_argument('problem_ids', nargs='*', help='처리할 문제 번호')
     parser.add_argument('--check', action='store_true', help='변환 필요한 파일 확인만')
     parser.add_argument('--list', action='store_true', help='tikz 포함 파일 목록 출력')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='TeX 워커 수 (기본: 1)')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f'렌더링 백엔드 (기본: {DEFAULT_BACKEND}, 환경변수 TIKZ_BACKEND)')
 
     args = parser.parse_args()
 
@@ -225,23 +178,25 @@ def main():
     total_success = 0
     total_fail = 0
 
-    for problem_id in problem_ids:
-        print(f"📄 {problem_id}_solution.tex 처리 중...")
-        result = process_solution_file(problem_id, dry_run=args.check)
-
-        if result["status"] == "not_found":
-            print(f"  ⚠️  파일 없음")
-        elif result["status"] == "no_tikz":
-            print(f"  ℹ️  tikzpicture 없음")
-        elif result["status"] == "needs_conversion":
-            print(f"  📊 {result['tikz_count']}개 tikzpicture 발견")
-        elif result["status"] == "processed":
-            for r in result["results"]:
-                if r["success"]:
-                    total_success += 1
-                else:
-                    total_fail += 1
-        print()
+    # 변환 동안 TeX 워커 풀 유지
+    with FigureRenderer(workers=args.jobs, backend=args.backend):
+        for problem_id in problem_ids:
+            print(f"📄 {problem_id}_solution.tex 처리 중...")
+            result = process_solution_file(problem_id, dry_run=args.check)
+
+            if result["status"] == "not_found":
+                print(f"  ⚠️  파일 없음")
+            elif result["status"] == "no_tikz":
+                print(f"  ℹ️  tikzpicture 없음")
+            elif result["status"] == "needs_conversion":
+                print(f"  📊 {result['tikz_count']}개 tikzpicture 발견")
+            elif result["status"] == "processed":
+                for r in result["results"]:
+                    if r["success"]:
+                        total_success += 1
+                    else:
+                        total_fail += 1
+            print()
 
     if not args.check:
         print("=" * 40)
@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TikZ → SVG 렌더링 공통 모듈
+
+build_incremental.py와 tikz2svg.py가 함께 사용하는 컴파일 로직
+
+- standalone 템플릿과 tikzpicture 패턴
+- 툴체인 버전 조회
+- 렌더링 백엔드: pdf2svg (PDF 경유) 또는 dvisvgm (DVI 경유)
+- 외부 명령 제한: 그림당 시간 / 메모리 제한, 초과 시 프로세스 그룹 종료
+- 프리앰블 포맷 덤프 (.fmt): tkz-euclide/tikz/xcolor 로딩을 한 번만 수행
+- compile_tikz_to_svg(tikz_code, output_path) -> bool
+- compile_tikz_batch_to_svg(tikz_codes, output_paths) -> List[bool]
+- FigureRenderer: 빌드 동안 유지되는 렌더링 워커 풀 (워커별 재사용 작업 디렉토리)
+- benchmark_backends: 백엔드별 소요 시간 / SVG 크기 비교
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from build_trace import span, traced
+
+# 기준 디렉토리
+BASE_DIR = Path(__file__).parent.parent
+
+# 포맷 덤프 저장 위치
+FORMAT_CACHE_DIR = BASE_DIR / ".figure_cache" / "fmt"
+
+# standalone LaTeX 템플릿
+STANDALONE_TEMPLATE = r"""\documentclass[tikz,border=5pt]{standalone}
+\usepackage{tkz-euclide}
+\usepackage{xcolor}
+\begin{document}
+%s
+\end{document}
+"""
+
+# 렌더링 백엔드
+#   pdf2svg: pdflatex → PDF → pdf2svg
+#   dvisvgm: pdflatex(DVI 모드) → DVI → dvisvgm
+BACKENDS = ('pdf2svg', 'dvisvgm')
+DEFAULT_BACKEND = os.getenv('TIKZ_BACKEND', 'pdf2svg')
+
+# DVI 모드에서 PGF가 dvisvgm 전용 드라이버를 사용하도록 지정
+DVISVGM_DRIVER_LINE = "\\def\\pgfsysdriver{pgfsys-dvisvgm.def}\n"
+
+# 포맷 덤프 자체를 읽지 못했을 때의 pdflatex 메시지 (이때만 기본 템플릿으로 다시 컴파일)
+#   I can't find the format file `x.fmt'! / ---! x.fmt was written by ... / doesn't match ...
+#   (Fatal format file error; I'm stymied)
+FORMAT_LOAD_ERROR_PATTERN = re.compile(
+    r"can't find the format|^---! .*\.fmt |Fatal format file error",
+    re.MULTILINE
+)
+
+# 그림당 외부 명령 제한 (환경변수로 기본값 변경 가능, 0이면 제한 없음)
+DEFAULT_TIMEOUT = float(os.getenv('TIKZ_TIMEOUT', '120'))      # 초
+DEFAULT_MEMORY_MB = int(os.getenv('TIKZ_MEMORY_MB', '2048'))    # MB
+
+# tikzpicture 환경 패턴
+TIKZ_PATTERN = re.compile(
+    r'\\begin\{tikzpicture\}.*?\\end\{tikzpicture\}',
+    re.DOTALL
+)
+
+_toolchain_versions: Dict[str, str] = {}
+
+# 포맷 덤프 사용 불가로 판정된 백엔드 (이번 프로세스에서는 다시 시도하지 않음)
+_format_disabled: Set[str] = set()
+
+# 현재 활성화된 렌더러 (없으면 그림마다 임시 디렉토리 사용)
+_active_renderer: Optional['FigureRenderer'] = None
+
+# 실패한 그림의 로그 (출력 경로 → (로그, 재시도 가능 여부)), pop_failure로 회수
+_failure_logs: Dict[Path, Tuple[str, bool]] = {}
+
+# 메모리 제한 래퍼: 셸에서 ulimit -v(KB)를 건 뒤 명령으로 교체 (POSIX 전용, Windows는 제한 없음)
+# preexec_fn은 스레드가 있는 프로세스(FigureRenderer.map)에서 교착될 수 있어 쓰지 않는다.
+# ulimit -v를 지원하지 않는 셸에서는 제한 없이 실행
+MEMORY_LIMIT_WRAPPER = 'ulimit -v {kb} 2>/dev/null; exec "$0" "$@"'
+
+# 그림이 아니라 실행 환경 때문에 실패한 경우의 returncode (실행 파일 없음)
+MISSING_EXECUTABLE_RETURNCODE = 127
+
+
+def get_backend() -> str:
+    """현재 렌더링 백엔드 (활성 렌더러 설정 우선)"""
+    if _active_renderer is not None:
+        return _active_renderer.backend
+    return DEFAULT_BACKEND
+
+
+def _get_limits() -> Tuple[float, int]:
+    """현재 적용할 (시간 제한 초, 메모리 제한 MB) - 활성 렌더러 설정 우선"""
+    if _active_renderer is not None:
+        return _active_renderer.timeout, _active_renderer.memory_mb
+    return DEFAULT_TIMEOUT, DEFAULT_MEMORY_MB
+
+
+def _kill_process_group(proc: subprocess.Popen):
+    """프로세스와 그 자식들(pdflatex가 띄운 프로세스 포함)을 모두 종료"""
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _run_limited(cmd: List[str], cwd: Optional[Path] = None,
+                 env: Optional[dict] = None) -> subprocess.CompletedProcess:
+    """
+    시간 / 메모리 제한을 걸고 외부 명령 실행
+
+    새 세션(프로세스 그룹)에서 실행하여 시간 초과 시 그룹 전체를 종료한다.
+    메모리 제한(주소 공간)은 MEMORY_LIMIT_WRAPPER 셸을 거쳐 명령과 그 자식에 적용된다.
+    실행 파일이 없으면 returncode 127인 결과를 돌려준다.
+    """
+    timeout, memory_mb = _get_limits()
+
+    argv = cmd
+    if memory_mb and os.name == 'posix':
+        argv = ['/bin/sh', '-c', MEMORY_LIMIT_WRAPPER.format(kb=memory_mb * 1024), *cmd]
+
+    try:
+        proc = subprocess.Popen(
+            argv,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace',
+            start_new_session=True
+        )
+    except OSError as e:
+        return subprocess.CompletedProcess(cmd, MISSING_EXECUTABLE_RETURNCODE, "", str(e))
+
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout or None)
+    except subprocess.TimeoutExpired:
+        _kill_process_group(proc)
+        stdout, stderr = proc.communicate()
+        stderr = f"{stderr}\n시간 초과: {timeout:g}초 제한, 프로세스 그룹 종료"
+        return subprocess.CompletedProcess(cmd, -signal.SIGKILL, stdout, stderr)
+
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+def is_environment_failure(returncode: int) -> bool:
+    """그림 자체가 아니라 실행 환경 때문에 실패했는지 (실행 파일 없음, 127)"""
+    return returncode == MISSING_EXECUTABLE_RETURNCODE
+
+
+def is_timeout(returncode: int) -> bool:
+    """시간 제한을 넘겨 프로세스 그룹을 종료했는지 (그림 실패로 보고 격리)"""
+    return returncode == -signal.SIGKILL
+
+
+def _record_failure(output_path: Path, log: str, retryable: bool = False):
+    """그림 실패 로그 기록 (retryable: 환경 문제로 실패해 다음 빌드에서 다시 시도할 그림)"""
+    _failure_logs[output_path] = (log, retryable)
+
+
+def pop_failure(output_path: Path) -> Tuple[str, bool]:
+    """output_path 그림의 마지막 실패 (로그, 재시도 가능 여부)를 꺼냄 (없으면 ("", False))"""
+    return _failure_logs.pop(output_path, ("", False))
+
+
+def _first_output_line(cmd: List[str]) -> str:
+    """명령 실행 결과의 첫 줄 (실행 불가 시 "unknown")"""
+    result = _run_limited(cmd)
+    lines = result.stdout.splitlines()
+    return lines[0].strip() if lines else "unknown"
+
+
+def _executable_signature(name: str) -> str:
+    """버전 옵션이 없는 실행 파일의 식별 문자열 (경로 + 크기 + mtime, 없으면 missing)"""
+    path = shutil.which(name)
+    if path is None:
+        return f"{name} missing"
+    stat = os.stat(path)
+    return f"{path} {stat.st_size} {int(stat.st_mtime)}"
+
+
+def get_toolchain_version(backend: Optional[str] = None) -> str:
+    """툴체인 버전 문자열 (캐시 키에 포함, 프로세스당 백엔드별 한 번만 조회)"""
+    backend = backend or get_backend()
+    if backend not in _toolchain_versions:
+        parts = [_first_output_line(['pdflatex', '--version']), backend]
+        if backend == 'dvisvgm':
+            parts.append(_first_output_line(['dvisvgm', '--version']))
+        else:
+            # pdf2svg는 --version이 없으므로 설치 / 교체되면 바뀌는 실행 파일 정보 사용
+            parts.append(_executable_signature('pdf2svg'))
+        _toolchain_versions[backend] = " | ".join(parts)
+    return _toolchain_versions[backend]
+
+
+def _document_template(backend: str) -> str:
+    """백엔드에 맞는 standalone 문서 템플릿"""
+    if backend == 'dvisvgm':
+        return DVISVGM_DRIVER_LINE + STANDALONE_TEMPLATE
+    return STANDALONE_TEMPLATE
+
+
+def get_format_name(backend: Optional[str] = None) -> str:
+    """프리앰블 + 툴체인 버전으로 결정되는 포맷 이름"""
+    backend = backend or get_backend()
+    preamble = _document_template(backend).split(r'\begin{document}')[0]
+    key = hashlib.sha256(
+        f"{preamble}\0{get_toolchain_version(backend)}".encode('utf-8')
+    ).hexdigest()
+    return f"figpreamble-{backend}-{key[:16]}"
+
+
+def ensure_preamble_format(backend: Optional[str] = None) -> Optional[Path]:
+    """
+    프리앰블 포맷 덤프 생성 (이미 있으면 재사용)
+
+    mylatexformat으로 \\begin{document} 직전까지 로드한 상태를 .fmt로 저장한다.
+    툴체인 버전이나 백엔드가 바뀌면 포맷 이름이 달라지므로 자동으로 다시 생성된다.
+
+    Returns:
+        .fmt 파일 경로, 생성 실패 시 None
+    """
+    backend = backend or get_backend()
+    if backend in _format_disabled:
+        return None
+
+    format_name = get_format_name(backend)
+    format_file = FORMAT_CACHE_DIR / f"{format_name}.fmt"
+    if format_file.exists():
+        return format_file
+
+    FORMAT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        preamble_file = tmpdir / "preamble.tex"
+        with open(preamble_file, 'w', encoding='utf-8') as f:
+            f.write(_document_template(backend) % "")
+
+        cmd = ['pdflatex', '-ini', '-interaction=nonstopmode', '-halt-on-error',
+               f'-jobname={format_name}']
+        if backend == 'dvisvgm':
+            cmd.append('-output-format=dvi')
+        cmd += ['&pdflatex', 'mylatexformat.ltx', preamble_file.name]
+
+        with span("ensure_preamble_format", "tex", backend=backend):
+            result = _run_limited(cmd, cwd=tmpdir)
+
+        built_format = tmpdir / f"{format_name}.fmt"
+        if result.returncode != 0 or not built_format.exists():
+            print(f"    ⚠️  프리앰블 포맷 생성 실패, 기본 템플릿 사용")
+            _format_disabled.add(backend)
+            return None
+
+        # 병렬 빌드에서도 안전하도록 임시 파일에 복사 후 교체
+        tmp_format = format_file.with_suffix(f".{os.getpid()}.tmp")
+        shutil.copyfile(built_format, tmp_format)
+        os.replace(tmp_format, format_file)
+
+    return format_file
+
+
+def _run_pdflatex(tmpdir: Path, tex_file: Path, format_file: Optional[Path],
+                  dvi: bool = False) -> subprocess.CompletedProcess:
+    """figure.tex를 pdflatex로 컴파일 (format_file이 있으면 포맷 덤프 사용)"""
+    cmd = ['pdflatex', '-interaction=nonstopmode', '-halt-on-error']
+    if dvi:
+        cmd.append('-output-format=dvi')
+    env = None
+    if format_file is not None:
+        cmd.append(f'-fmt={format_file.stem}')
+        env = {**os.environ, 'TEXFORMATS': f"{format_file.parent}{os.pathsep}"}
+    cmd.append(tex_file.name)
+
+    with span("pdflatex", "tex", format=format_file is not None):
+        return _run_limited(cmd, cwd=tmpdir, env=env)
+
+
+def is_format_load_failure(result: subprocess.CompletedProcess) -> bool:
+    """pdflatex가 포맷 덤프를 읽지 못해 실패했는지 (그림 오류 / 시간 초과와 구분)"""
+    if is_environment_failure(result.returncode) or is_timeout(result.returncode):
+        return False
+    return bool(FORMAT_LOAD_ERROR_PATTERN.search(f"{result.stdout}\n{result.stderr}"))
+
+
+def _compile_document(tmpdir: Path, body: str,
+                      quiet: bool = False) -> Tuple[Optional[Path], str, int]:
+    """
+    body를 standalone 문서로 컴파일하여 PDF(또는 DVI) 경로 반환
+
+    프리앰블 포맷 덤프가 있으면 이를 사용해 컴파일하고,
+    포맷 파일을 읽지 못했거나 맞지 않을 때만 기본 템플릿으로 다시 시도한다
+    (그림 자체의 오류로 실패하면 pdflatex를 두 번 실행하지 않음).
+
+    Returns:
+        (PDF/DVI 경로 또는 실패 시 None, 실패 로그, pdflatex returncode)
+    """
+    backend = get_backend()
+    dvi = backend == 'dvisvgm'
+
+    tex_file = tmpdir / "figure.tex"
+    pdf_file = tmpdir / ("figure.dvi" if dvi else "figure.pdf")
+
+    # 재사용 작업 디렉토리에 남은 이전 결과 제거
+    if pdf_file.exists():
+        pdf_file.unlink()
+
+    # standalone tex 파일 생성
+    tex_content = _document_template(backend) % body
+    with open(tex_file, 'w', encoding='utf-8') as f:
+        f.write(tex_content)
+
+    # pdflatex 컴파일 (포맷 덤프 우선)
+    format_file = ensure_preamble_format(backend)
+    result = _run_pdflatex(tmpdir, tex_file, format_file, dvi=dvi)
+
+    if format_file is not None and (result.returncode != 0 or not pdf_file.exists()) \
+            and is_format_load_failure(result):
+        # 포맷이 오래되었거나 맞지 않는 경우: 기본 템플릿으로 재시도
+        result = _run_pdflatex(tmpdir, tex_file, None, dvi=dvi)
+        if result.returncode == 0 and pdf_file.exists():
+            print(f"    ⚠️  프리앰블 포맷 사용 불가, 기본 템플릿으로 컴파일")
+            _format_disabled.add(backend)
+
+    if result.returncode != 0 or not pdf_file.exists():
+        log = f"{result.stdout[-2000:]}\n{result.stderr[-2000:]}".strip()
+        if not quiet:
+            print(f"    ❌ pdflatex 컴파일 실패")
+            print(f"       에러: {result.stdout[-500:] if result.stdout else result.stderr[-500:]}")
+        return None, log, result.returncode or 1
+
+    return pdf_file, "", 0
+
+
+def _pdf_page_to_svg(pdf_file: Path, output_path: Path, page: int = 1) -> bool:
+    """PDF(또는 DVI)의 지정 페이지를 현재 백엔드로 SVG 변환"""
+    backend = get_backend()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if backend == 'dvisvgm':
+        # --no-fonts: pdf2svg와 같이 글리프를 path로 출력
+        cmd = ['dvisvgm', f'--page={page}', '--no-fonts', '--exact-bbox',
+               f'--output={output_path}', str(pdf_file)]
+    else:
+        cmd = ['pdf2svg', str(pdf_file), str(output_path), str(page)]
+
+    with span(backend, "tex", page=page):
+        result = _run_limited(cmd)
+
+    if result.returncode != 0 or not output_path.exists():
+        print(f"    ❌ {backend} 변환 실패: {result.stderr}")
+        _record_failure(output_path, result.stderr, is_environment_failure(result.returncode))
+        return False
+
+    return True
+
+
+@contextmanager
+def _scratch_dir() -> Iterator[Path]:
+    """활성 렌더러의 작업 디렉토리를 빌리거나, 없으면 임시 디렉토리 생성"""
+    if _active_renderer is not None:
+        with _active_renderer.acquire_scratch() as scratch:
+            yield scratch
+    else:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+
+def _compile_in_dir(tmpdir: Path, tikz_code: str, output_path: Path) -> bool:
+    """작업 디렉토리 tmpdir에서 tikzpicture 코드를 SVG로 변환"""
+    pdf_file, log, returncode = _compile_document(tmpdir, tikz_code)
+    if pdf_file is None:
+        _record_failure(output_path, log, is_environment_failure(returncode))
+        return False
+
+    return _pdf_page_to_svg(pdf_file, output_path)
+
+
+def compile_tikz_to_svg(tikz_code: str, output_path: Path) -> bool:
+    """tikzpicture 코드를 SVG로 변환"""
+    with span("compile_tikz_to_svg", "tex", output=output_path.name), _scratch_dir() as tmpdir:
+        return _compile_in_dir(tmpdir, tikz_code, output_path)
+
+
+@traced(category="tex")
+def compile_tikz_batch_to_svg(tikz_codes: List[str], output_paths: List[Path]) -> List[bool]:
+    """
+    여러 tikzpicture를 한 문서의 페이지로 묶어 한 번에 컴파일
+
+    standalone의 tikz 옵션은 tikzpicture마다 페이지를 하나씩 만들므로
+    n번째 페이지를 output_paths[n]으로 변환한다.
+    묶음 컴파일이 실패하면 절반으로 나누어 다시 시도하여 실패한 그림만 골라낸다.
+    실행 파일이 없으면 나누지 않고 모두 재시도 가능한 실패로 기록하고,
+    시간 초과면 나누어도 단계마다 제한 시간을 기다리므로 그림별로 컴파일해 멈춘 그림만 골라낸다.
+
+    Returns:
+        그림별 성공 여부 리스트
+    """
+    if not tikz_codes:
+        return []
+    if len(tikz_codes) == 1:
+        return [compile_tikz_to_svg(tikz_codes[0], output_paths[0])]
+
+    with _scratch_dir() as tmpdir:
+        pdf_file, log, returncode = _compile_document(tmpdir, '\n\n'.join(tikz_codes), quiet=True)
+        if pdf_file is not None:
+            return [
+                _pdf_page_to_svg(pdf_file, output_path, page)
+                for page, output_path in enumerate(output_paths, start=1)
+            ]
+
+    if is_environment_failure(returncode):
+        print(f"    ❌ {len(tikz_codes)}개 묶음 컴파일 실패 (실행 환경 문제)")
+        for output_path in output_paths:
+            _record_failure(output_path, log, retryable=True)
+        return [False] * len(tikz_codes)
+
+    if is_timeout(returncode):
+        print(f"    ⚠️  {len(tikz_codes)}개 묶음 컴파일 시간 초과, 그림별로 컴파일")
+        return [compile_tikz_to_svg(code, path) for code, path in zip(tikz_codes, output_paths)]
+
+    # 이분 탐색으로 실패한 그림 격리
+    print(f"    ⚠️  {len(tikz_codes)}개 묶음 컴파일 실패, 분할하여 재시도")
+    mid = len(tikz_codes) // 2
+    return (compile_tikz_batch_to_svg(tikz_codes[:mid], output_paths[:mid])
+            + compile_tikz_batch_to_svg(tikz_codes[mid:], output_paths[mid:]))
+
+
+def compile_tikz_many(tikz_codes: List[str], output_paths: List[Path]) -> List[bool]:
+    """
+    여러 그림을 개별 컴파일 (활성 렌더러가 있으면 워커들에 분배)
+
+    Returns:
+        그림별 성공 여부 리스트
+    """
+    if _active_renderer is not None:
+        return _active_renderer.map(tikz_codes, output_paths)
+    return [compile_tikz_to_svg(code, path) for code, path in zip(tikz_codes, output_paths)]
+
+
+class FigureRenderer:
+    """
+    빌드 동안 유지되는 그림 렌더링 서비스
+
+    워커마다 재사용 작업 디렉토리를 하나씩 두고 그림을 분배한다.
+    그림마다 임시 디렉토리를 만들고 지우는 비용을 없애며,
+    with 블록 안에서는 모듈의 compile_tikz_to_svg가 이 렌더러를 사용한다.
+
+    사용법:
+        with FigureRenderer(workers=4) as renderer:
+            renderer.compile_tikz_to_svg(tikz_code, output_path)
+            renderer.map(tikz_codes, output_paths)
+    """
+
+    def __init__(self, workers: int = 1, scratch_root: Optional[Path] = None,
+                 backend: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT,
+                 memory_mb: int = DEFAULT_MEMORY_MB):
+        """
+        Args:
+            workers: 동시에 실행할 TeX 워커 수
+            scratch_root: 작업 디렉토리 위치 (없으면 임시 디렉토리를 만들고 종료 시 삭제)
+            backend: 렌더링 백엔드 (BACKENDS 중 하나, 기본: DEFAULT_BACKEND)
+            timeout: 외부 명령 1회당 시간 제한 (초, 0이면 제한 없음)
+            memory_mb: 외부 명령 1회당 메모리 제한 (MB, 0이면 제한 없음)
+        """
+        backend = backend or DEFAULT_BACKEND
+        if backend not in BACKENDS:
+            raise ValueError(f"알 수 없는 렌더링 백엔드: {backend} (가능: {', '.join(BACKENDS)})")
+
+        self.backend = backend
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.workers = max(1, workers)
+        self._owns_root = scratch_root is None
+        self.scratch_root = Path(tempfile.mkdtemp(prefix="tikz_render_")) if scratch_root is None else scratch_root
+        self._slots: List[Path] = []
+        self._slot_lock = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._previous: Optional['FigureRenderer'] = None
+
+        for i in range(self.workers):
+            slot = self.scratch_root / f"worker{i}"
+            slot.mkdir(parents=True, exist_ok=True)
+            self._slots.append(slot)
+
+    def start(self) -> 'FigureRenderer':
+        """워커 풀 시작 및 모듈 기본 렌더러로 등록"""
+        global _active_renderer
+        if self.workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._previous = _active_renderer
+        _active_renderer = self
+        return self
+
+    def close(self):
+        """워커 풀 종료 및 작업 디렉토리 정리"""
+        global _active_renderer
+        if _active_renderer is self:
+            _active_renderer = self._previous
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._owns_root:
+            shutil.rmtree(self.scratch_root, ignore_errors=True)
+
+    def __enter__(self) -> 'FigureRenderer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @contextmanager
+    def acquire_scratch(self) -> Iterator[Path]:
+        """비어 있는 워커 작업 디렉토리를 빌림 (모두 사용 중이면 대기)"""
+        with self._slot_lock:
+            while not self._slots:
+                self._slot_lock.wait()
+            slot = self._slots.pop()
+        try:
+            yield slot
+        finally:
+            with self._slot_lock:
+                self._slots.append(slot)
+                self._slot_lock.notify()
+
+    def compile_tikz_to_svg(self, tikz_code: str, output_path: Path) -> bool:
+        """모듈 함수와 같은 규약: tikzpicture 코드를 SVG로 변환"""
+        with self.acquire_scratch() as scratch:
+            return _compile_in_dir(scratch, tikz_code, output_path)
+
+    def map(self, tikz_codes: List[str], output_paths: List[Path]) -> List[bool]:
+        """여러 그림을 워커들에 분배하여 컴파일 (입력 순서대로 결과 반환)"""
+        if self._executor is None or len(tikz_codes) <= 1:
+            return [self.compile_tikz_to_svg(code, path) for code, path in zip(tikz_codes, output_paths)]
+        return list(self._executor.map(self.compile_tikz_to_svg, tikz_codes, output_paths))
+
+
+def benchmark_backends(tikz_codes: List[str], backends: Optional[List[str]] = None) -> Dict[str, dict]:
+    """
+    같은 그림들을 백엔드별로 렌더링하여 소요 시간과 SVG 크기 비교
+
+    포맷 덤프 생성은 측정 전에 미리 수행하여 그림 렌더링 시간만 잰다.
+
+    Returns:
+        {backend: {'figures', 'succeeded', 'seconds', 'svg_bytes'}}
+    """
+    report = {}
+
+    for backend in backends or BACKENDS:
+        with tempfile.TemporaryDirectory() as outdir:
+            outdir = Path(outdir)
+            with FigureRenderer(workers=1, backend=backend):
+                ensure_preamble_format(backend)
+
+                succeeded = 0
+                svg_bytes = 0
+                start = time.perf_counter()
+                for idx, tikz_code in enumerate(tikz_codes, start=1):
+                    output_path = outdir / f"fig{idx}.svg"
+                    if compile_tikz_to_svg(tikz_code, output_path):
+                        succeeded += 1
+                        svg_bytes += output_path.stat().st_size
+                seconds = time.perf_counter() - start
+
+        report[backend] = {
+            'figures': len(tikz_codes),
+            'succeeded': succeeded,
+            'seconds': seconds,
+            'svg_bytes': svg_bytes,
+        }
+
+    return report
@@ -5,6 +5,8 @@ R2 증분 업로드 스크립트
 
 dist/ 디렉토리의 파일들을 Cloudflare R2에 업로드
 변경된 파일만 업로드 (파일 해시 기반)
+빌드가 만든 사전 압축본(.br / .gz)은 원본의 Content-Type과 Content-Encoding을 붙여 업로드
+(원본보다 오래된 압축본은 다시 압축해서 올리고, 로컬에서 사라진 압축본은 R2에서도 삭제)
 
 환경변수 필요:
     export R2_ACCOUNT_ID="your_account_id"
@@ -16,6 +18,7 @@ dist/ 디렉토리의 파일들을 Cloudflare R2에 업로드
     python3 upload_to_r2.py              # 증분 업로드
     python3 upload_to_r2.py --dry-run    # 시뮬레이션 (업로드 안 함)
     python3 upload_to_r2.py --force      # 강제 전체 업로드
+    python3 upload_to_r2.py --metrics upload_metrics.prom  # 실행 지표 (Prometheus / JSON lines)
 """
 
 import argparse
@@ -23,10 +26,16 @@ import hashlib
 import json
 import os
 import sys
+import time
 import boto3
 from pathlib import Path
+from typing import Iterable, Optional
 from botocore.exceptions import ClientError
 
+from file_lock import file_lock, write_json_atomic
+from precompress import COMPRESSIBLE_SUFFIXES, ENCODINGS, recompress_sibling, source_of
+from run_metrics import RunMetrics
+
 # R2 설정 (환경변수에서 읽기)
 ACCOUNT_ID = os.getenv('R2_ACCOUNT_ID')
 BUCKET_NAME = os.getenv('R2_BUCKET_NAME')
@@ -57,18 +66,35 @@ def compute_file_hash(filepath: Path) -> str:
     return sha256.hexdigest()
 
 
-def load_upload_cache() -> dict:
-    """업로드 캐시 로드"""
+def _read_upload_cache() -> dict:
     if UPLOAD_CACHE_FILE.exists():
         with open(UPLOAD_CACHE_FILE, 'r', encoding='utf-8') as f:
             return json.load(f)
     return {}
 
 
-def save_upload_cache(cache: dict):
-    """업로드 캐시 저장"""
-    with open(UPLOAD_CACHE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, indent=2)
+def load_upload_cache() -> dict:
+    """업로드 캐시 로드"""
+    with file_lock(UPLOAD_CACHE_FILE, shared=True):
+        return _read_upload_cache()
+
+
+def save_upload_cache(updates: dict, removed: Iterable[str] = ()):
+    """
+    업로드 캐시 저장
+
+    동시에 실행된 다른 업로드의 기록을 잃지 않도록, 잠금을 잡고
+    디스크의 최신 캐시를 다시 읽어 이번 업로드 결과만 병합한다.
+
+    Args:
+        removed: R2에서 삭제해 캐시에서도 지울 키
+    """
+    with file_lock(UPLOAD_CACHE_FILE):
+        cache = _read_upload_cache()
+        cache.update(updates)
+        for key in removed:
+            cache.pop(key, None)
+        write_json_atomic(UPLOAD_CACHE_FILE, cache, indent=2)
 
 
 def get_r2_client():
@@ -98,18 +124,27 @@ def get_r2_client():
 
 
 def get_content_type(filepath: Path) -> str:
-    """파일 확장자에 따른 Content-Type 반환"""
-    ext = filepath.suffix.lower()
+    """파일 확장자에 따른 Content-Type 반환 (압축본은 원본 기준)"""
+    ext = (source_of(filepath) or filepath).suffix.lower()
     content_types = {
         '.json': 'application/json',
         '.svg': 'image/svg+xml',
         '.html': 'text/html',
         '.css': 'text/css',
         '.js': 'application/javascript',
+        '.msgpack': 'application/vnd.msgpack',
+        '.cbor': 'application/cbor',
     }
     return content_types.get(ext, 'application/octet-stream')
 
 
+def get_content_encoding(filepath: Path) -> Optional[str]:
+    """사전 압축본이면 Content-Encoding (br / gzip), 아니면 None"""
+    if source_of(filepath) is None:
+        return None
+    return ENCODINGS[filepath.suffix]
+
+
 def upload_file(client, local_path: Path, r2_key: str, dry_run: bool = False) -> bool:
     """단일 파일 R2 업로드"""
     if dry_run:
@@ -117,15 +152,19 @@ def upload_file(client, local_path: Path, r2_key: str, dry_run: bool = False) ->
         return True
 
     try:
-        content_type = get_content_type(local_path)
+        extra_args = {}
+        content_encoding = get_content_encoding(local_path)
+        if content_encoding:
+            extra_args['ContentEncoding'] = content_encoding
 
         with open(local_path, 'rb') as f:
             client.put_object(
                 Bucket=BUCKET_NAME,
                 Key=r2_key,
                 Body=f,
-                ContentType=content_type,
-                CacheControl='public, max-age=3600'  # 1시간 캐시
+                ContentType=get_content_type(local_path),
+                CacheControl='public, max-age=3600',  # 1시간 캐시
+                **extra_args
             )
 
         size_kb = local_path.stat().st_size / 1024
@@ -137,8 +176,29 @@ def upload_file(client, local_path: Path, r2_key: str, dry_run: bool = False) ->
         return False
 
 
-def collect_files_to_upload(force: bool = False) -> list:
-    """업로드할 파일 목록 수집 (증분)"""
+def delete_file(client, r2_key: str, dry_run: bool = False) -> bool:
+    """단일 객체 R2 삭제 (없는 키도 성공)"""
+    if dry_run:
+        print(f"  [DRY-RUN] 삭제 {r2_key}")
+        return True
+
+    try:
+        client.delete_object(Bucket=BUCKET_NAME, Key=r2_key)
+        print(f"  🗑️  {r2_key}")
+        return True
+
+    except ClientError as e:
+        print(f"  ❌ 삭제 {r2_key}: {e}")
+        return False
+
+
+def collect_files_to_upload(force: bool = False, stats: Optional[dict] = None) -> list:
+    """
+    업로드할 파일 목록 수집 (증분)
+
+    Args:
+        stats: 주어지면 스캔한 파일 수 / 바이트를 기록
+    """
     if not DIST_DIR.exists():
         print(f"❌ dist/ 디렉토리가 없습니다: {DIST_DIR}")
         print("   먼저 build_incremental.py를 실행하세요.")
@@ -147,11 +207,28 @@ def collect_files_to_upload(force: bool = False) -> list:
     cache = {} if force else load_upload_cache()
     files_to_upload = []
 
-    # dist/ 하위 모든 파일 스캔
-    for filepath in DIST_DIR.rglob('*'):
+    # dist/ 하위 모든 파일 스캔 (압축본을 다시 만들거나 지울 수 있으므로 목록을 먼저 고정)
+    for filepath in sorted(DIST_DIR.rglob('*')):
         if not filepath.is_file():
             continue
 
+        # 원본보다 오래된 압축본은 내용이 다름 (--watch / --no-precompress 빌드로 원본만 갱신된 경우)
+        # Worker는 압축본을 우선 제공하므로 지금 원본으로 다시 압축해서 올림 (원본이 없으면 삭제)
+        source = source_of(filepath)
+        if source is not None and (not source.exists() or
+                                   filepath.stat().st_mtime_ns < source.stat().st_mtime_ns):
+            kept = recompress_sibling(filepath)
+            print(f"  🗜️  오래된 압축본 {'다시 압축' if kept else '삭제'}: "
+                  f"{filepath.relative_to(DIST_DIR)}")
+            if stats is not None:
+                stats['files_stale'] = stats.get('files_stale', 0) + 1
+            if not kept:
+                continue
+
+        if stats is not None:
+            stats['files_scanned'] = stats.get('files_scanned', 0) + 1
+            stats['bytes_scanned'] = stats.get('bytes_scanned', 0) + filepath.stat().st_size
+
         # R2 키 생성 (dist/ 이후 경로)
         r2_key = str(filepath.relative_to(DIST_DIR))
 
@@ -173,8 +250,70 @@ def collect_files_to_upload(force: bool = False) -> list:
     return files_to_upload
 
 
-def upload_all(dry_run: bool = False, force: bool = False):
-    """전체 업로드 프로세스"""
+def collect_keys_to_delete(force: bool = False) -> list:
+    """
+    R2에서 삭제할 사전 압축본 키 (로컬에 없는 압축본)
+
+    원본이 임계값보다 작아졌거나 압축해도 작아지지 않아 precompress가 지운 압축본이
+    R2에 남아 있으면 Worker가 계속 이전 내용을 제공한다.
+    업로드 캐시에 기록된 압축본을 기준으로 하고, --force이면 모든 원본의 압축본 키를 확인한다.
+    """
+    if not DIST_DIR.exists():
+        return []
+
+    local_keys = {str(p.relative_to(DIST_DIR)) for p in DIST_DIR.rglob('*') if p.is_file()}
+    candidates = {key for key in load_upload_cache() if source_of(Path(key)) is not None}
+    if force:
+        candidates |= {
+            key + suffix
+            for key in local_keys
+            if source_of(Path(key)) is None and Path(key).suffix in COMPRESSIBLE_SUFFIXES
+            for suffix in ENCODINGS
+        }
+    return sorted(candidates - local_keys)
+
+
+def write_upload_metrics(path: Path, stats: dict, dry_run: bool):
+    """업로드 실행 지표 저장"""
+    metrics = RunMetrics('upload')
+    scanned = stats.get('files_scanned', 0)
+    pending = stats.get('files_pending', 0)
+    upload_seconds = stats.get('upload_seconds', 0.0)
+    bytes_uploaded = stats.get('bytes_uploaded', 0)
+
+    metrics.set('dry_run', int(dry_run), '시뮬레이션 실행이면 1')
+    metrics.set('files_scanned', scanned, 'dist/에서 스캔한 파일 수')
+    metrics.set('bytes_scanned', stats.get('bytes_scanned', 0), '스캔한 파일의 바이트 합계')
+    metrics.set('files_pending', pending, '변경되어 업로드 대상이 된 파일 수')
+    metrics.set('files_stale', stats.get('files_stale', 0), '원본보다 오래되어 다시 압축한 압축본 수')
+    metrics.set('files_deleted', stats.get('files_deleted', 0), 'R2에서 삭제한 압축본 수')
+    metrics.set('cache_hit_ratio', round(1 - pending / scanned, 4) if scanned else 1,
+                '업로드 캐시 적중률 (변경 없음 / 스캔)')
+    metrics.set('files_uploaded', stats.get('files_uploaded', 0), '업로드에 성공한 파일 수')
+    metrics.set('files_failed', stats.get('files_failed', 0), '업로드에 실패한 파일 수')
+    metrics.set('bytes_uploaded', bytes_uploaded, '업로드한 바이트')
+    metrics.set('throughput_bytes_per_second',
+                round(bytes_uploaded / upload_seconds) if upload_seconds else 0,
+                '업로드 처리량 (바이트 / 초)')
+    metrics.set('stage_seconds', round(stats.get('scan_seconds', 0.0), 3),
+                '단계별 소요 시간 (초)', stage='scan')
+    metrics.set('stage_seconds', round(upload_seconds, 3), '단계별 소요 시간 (초)', stage='upload')
+    metrics.set('duration_seconds', round(stats.get('duration_seconds', 0.0), 3),
+                '업로드 전체 경과 시간 (초)')
+    metrics.write(path)
+
+
+def upload_all(dry_run: bool = False, force: bool = False,
+               metrics_file: Optional[Path] = None):
+    """
+    전체 업로드 프로세스
+
+    Args:
+        metrics_file: 실행 지표 저장 경로 (.prom이면 Prometheus textfile, 그 외는 JSON lines)
+    """
+    start = time.perf_counter()
+    stats = {}
+
     print("=" * 70)
     print("R2 증분 업로드")
     print("=" * 70)
@@ -191,10 +330,16 @@ def upload_all(dry_run: bool = False, force: bool = False):
 
     # 업로드할 파일 수집
     print(f"\n📁 파일 스캔 중...")
-    files_to_upload = collect_files_to_upload(force=force)
+    files_to_upload = collect_files_to_upload(force=force, stats=stats)
+    keys_to_delete = collect_keys_to_delete(force=force)
+    stats['scan_seconds'] = time.perf_counter() - start
+    stats['files_pending'] = len(files_to_upload)
 
-    if not files_to_upload:
+    if not files_to_upload and not keys_to_delete:
         print("✅ 업로드할 파일이 없습니다 (모든 파일이 최신 상태)")
+        if metrics_file:
+            stats['duration_seconds'] = time.perf_counter() - start
+            write_upload_metrics(Path(metrics_file), stats, dry_run)
         return
 
     # 파일 크기 합계
@@ -218,9 +363,11 @@ def upload_all(dry_run: bool = False, force: bool = False):
     print("업로드 시작...")
     print("=" * 70)
 
-    cache = load_upload_cache()
+    uploaded = {}
     success_count = 0
     fail_count = 0
+    bytes_uploaded = 0
+    upload_start = time.perf_counter()
 
     for file_info in files_to_upload:
         local_path = file_info['local_path']
@@ -230,26 +377,48 @@ def upload_all(dry_run: bool = False, force: bool = False):
         if upload_file(client, local_path, r2_key, dry_run=dry_run):
             success_count += 1
             if not dry_run:
-                cache[r2_key] = file_hash
+                uploaded[r2_key] = file_hash
+                bytes_uploaded += file_info['size']
         else:
             fail_count += 1
 
+    # 로컬에서 사라진 압축본 삭제
+    deleted = []
+    if keys_to_delete:
+        print(f"\n🗑️  R2에서 삭제할 압축본: {len(keys_to_delete)}개")
+        for r2_key in keys_to_delete:
+            if delete_file(client, r2_key, dry_run=dry_run):
+                deleted.append(r2_key)
+            else:
+                fail_count += 1
+    stats['files_deleted'] = 0 if dry_run else len(deleted)
+
+    stats['upload_seconds'] = time.perf_counter() - upload_start
+
     # 캐시 저장
     if not dry_run:
-        save_upload_cache(cache)
+        save_upload_cache(uploaded, removed=deleted)
 
     # 결과 출력
     print("\n" + "=" * 70)
     if dry_run:
         print(f"✅ 시뮬레이션 완료!")
         print(f"  업로드 예정: {success_count}개")
+        print(f"  삭제 예정: {len(deleted)}개")
     else:
         print(f"✅ 업로드 완료!")
         print(f"  성공: {success_count}개")
+        print(f"  삭제: {len(deleted)}개")
         print(f"  실패: {fail_count}개")
         print(f"\nR2 버킷: https://pub-{ACCOUNT_ID}.r2.dev/")
     print("=" * 70)
 
+    if metrics_file:
+        stats.update(files_uploaded=0 if dry_run else success_count, files_failed=fail_count,
+                     bytes_uploaded=bytes_uploaded,
+                     duration_seconds=time.perf_counter() - start)
+        write_upload_metrics(Path(metrics_file), stats, dry_run)
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -261,10 +430,12 @@ def main():
                         help='시뮬레이션 모드 (실제 업로드 안 함)')
     parser.add_argument('--force', action='store_true',
                         help='강제 전체 업로드 (캐시 무시)')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='실행 지표 저장 (FILE.prom이면 Prometheus textfile, 그 외는 JSON lines 추가)')
 
     args = parser.parse_args()
 
-    upload_all(dry_run=args.dry_run, force=args.force)
+    upload_all(dry_run=args.dry_run, force=args.force, metrics_file=args.metrics)
 
 
 if __name__ == '__main__':
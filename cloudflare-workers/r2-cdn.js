@@ -2,7 +2,7 @@
  * Cloudflare Workers R2 CDN
  *
  * R2 버킷을 CDN처럼 제공하는 간단한 프록시
- * 기능: MIME 타입, CORS, 캐싱
+ * 기능: MIME 타입, CORS, 캐싱, 사전 압축본(.br / .gz) 제공
  */
 
 // MIME 타입 매핑
@@ -17,6 +17,8 @@ const MIME_TYPES = {
   '.jpeg': 'image/jpeg',
   '.gif': 'image/gif',
   '.txt': 'text/plain',
+  '.msgpack': 'application/vnd.msgpack',
+  '.cbor': 'application/cbor',
 };
 
 // 파일 확장자에서 MIME 타입 가져오기
@@ -25,6 +27,26 @@ function getMimeType(path) {
   return MIME_TYPES[ext] || 'application/octet-stream';
 }
 
+// 사전 압축본 (build_incremental.py가 만들고 upload_to_r2.py가 올림), 선호 순서
+const PRECOMPRESSED = [
+  { encoding: 'br', suffix: '.br' },
+  { encoding: 'gzip', suffix: '.gz' },
+];
+
+// 클라이언트가 받을 수 있는 사전 압축본 찾기 (없으면 원본)
+async function getObject(bucket, key, request) {
+  const accepted = (request.headers.get('Accept-Encoding') || '')
+    .split(',')
+    .map(token => token.split(';')[0].trim().toLowerCase());
+
+  for (const { encoding, suffix } of PRECOMPRESSED) {
+    if (!accepted.includes(encoding)) continue;
+    const object = await bucket.get(key + suffix);
+    if (object) return { object, encoding };
+  }
+  return { object: await bucket.get(key), encoding: null };
+}
+
 // CORS 헤더
 const CORS_HEADERS = {
   'Access-Control-Allow-Origin': '*',
@@ -55,14 +77,14 @@ export default {
 
       // 빈 경로 처리
       if (!key) {
-        return new Response('Use: /metadata.json, /problems/{id}.json, /svg/{file}.svg', {
+        return new Response('Use: /metadata.json, /problems/{id}.json, /solutions/{id}.json, /svg/{file}.svg', {
           status: 200,
           headers: { 'Content-Type': 'text/plain', ...CORS_HEADERS },
         });
       }
 
-      // R2에서 파일 가져오기
-      const object = await env.R2_BUCKET.get(key);
+      // R2에서 파일 가져오기 (압축본이 있으면 압축본)
+      const { object, encoding } = await getObject(env.R2_BUCKET, key, request);
 
       // 파일 없음
       if (!object) {
@@ -80,8 +102,12 @@ export default {
         'Content-Type': contentType,
         'Cache-Control': 'public, max-age=3600', // 1시간 캐싱
         'ETag': object.httpEtag,
+        'Vary': 'Accept-Encoding',
         ...CORS_HEADERS,
       };
+      if (encoding) {
+        headers['Content-Encoding'] = encoding;
+      }
 
       // HEAD 요청은 body 없이 헤더만
       if (request.method === 'HEAD') {
@@ -91,10 +117,11 @@ export default {
         });
       }
 
-      // 정상 응답
+      // 정상 응답 (압축본은 다시 압축하지 않고 그대로 전달)
       return new Response(object.body, {
         status: 200,
         headers,
+        encodeBody: encoding ? 'manual' : 'automatic',
       });
 
     } catch (error) {
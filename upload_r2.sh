@@ -27,6 +27,20 @@ for file in problems/*.json; do
 done
 echo "✅ $total problem JSON files uploaded"
 
+# solutions/*.json 업로드 (풀이 보기에서 지연 로드)
+echo ""
+echo "📝 Uploading solution JSON files..."
+solution_count=0
+if [ -d "solutions" ]; then
+  for file in solutions/*.json; do
+    [ -f "$file" ] || continue
+    filename=$(basename "$file")
+    npx wrangler r2 object put "kmo-geometry/solutions/$filename" --file="$file" > /dev/null 2>&1
+    solution_count=$((solution_count + 1))
+  done
+fi
+echo "✅ $solution_count solution JSON files uploaded"
+
 # svg/*.svg 업로드
 echo ""
 echo "🎨 Uploading SVG files..."
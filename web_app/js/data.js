@@ -30,7 +30,7 @@ async function loadProblems() {
     }
 }
 
-// 개별 문제 상세 정보 로드 (필요할 때만)
+// 개별 문제 상세 정보 로드 (필요할 때만, 풀이는 포함하지 않음)
 async function loadProblemDetail(problemId) {
     try {
         // 이미 로드된 경우 스킵
@@ -55,6 +55,31 @@ async function loadProblemDetail(problemId) {
     }
 }
 
+// 풀이 로드 (풀이를 열 때만)
+async function loadProblemSolution(problemId) {
+    try {
+        // 이미 로드된 경우 스킵
+        if (App.problemsData[problemId]?.solution_text !== undefined) {
+            return App.problemsData[problemId];
+        }
+
+        const response = await fetch(`${CDN_URL}/solutions/${problemId}.json`);
+        const solutionData = await response.json();
+
+        // 캐시에 저장
+        App.problemsData[problemId] = {
+            ...App.problemsData[problemId],
+            ...solutionData
+        };
+
+        return App.problemsData[problemId];
+    } catch (error) {
+        console.error(`Failed to load solution ${problemId}:`, error);
+        showToast('풀이를 불러오는데 실패했습니다.');
+        return null;
+    }
+}
+
 // 문제 분류 함수
 function classifyProblem(problem) {
     const source = problem.source || '';
@@ -116,7 +141,7 @@ function buildHierarchy(problems) {
 // 통계 업데이트
 function updateStats(data) {
     const total = data.total_problems;
-    const withSolution = App.allProblems.filter(p => p.solution).length;
+    const withSolution = App.allProblems.filter(p => p.has_solution).length;
     const completionRate = total > 0 ? Math.round(withSolution / total * 100) : 0;
 
     document.getElementById('stats').textContent =
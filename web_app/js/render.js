@@ -122,7 +122,7 @@ function renderProblemItem(container, problem, indentLevel) {
 
     let badges = '';
     if (problem.has_tikz) badges += '<span class="badge badge-tikz">TikZ</span>';
-    if (problem.solution) badges += '<span class="badge badge-solution">풀이</span>';
+    if (problem.has_solution) badges += '<span class="badge badge-solution">풀이</span>';
     if (problem.source) badges += '<span class="badge badge-source">출처</span>';
 
     const displayNumber = getProblemDisplayNumber(problem, App.unclassifiedNumberMap);
@@ -206,18 +206,15 @@ async function loadProblem(problemId) {
     if (problem.content) {
         let contentHtml = convertLatexToHtml(problem.content);
 
-        // solution에서 SVG 마커 추출하여 문제 아래에 추가
-        if (problem.solution) {
-            const svgButtons = extractSvgButtons(problem.solution);
-            if (svgButtons) {
-                contentHtml += svgButtons;
-            }
+        // 풀이의 그림을 문제 아래에 폴드아웃 버튼으로 추가
+        const svgButtons = createSvgButtons(problem.svg_files);
+        if (svgButtons) {
+            contentHtml += svgButtons;
         }
 
-        // solution_text가 있으면 floating annotation box 추가
-        if (problem.solution_text && problem.solution_text.trim()) {
-            const annotationHtml = createAnnotationBox(problem.solution_text);
-            contentHtml += annotationHtml;
+        // 풀이는 버튼을 눌렀을 때 불러와서 floating annotation box로 표시
+        if (problem.has_solution) {
+            contentHtml += createSolutionToggle();
         }
 
         viewTab.innerHTML = `<div class="problem-content">${contentHtml}</div>`;
@@ -232,7 +229,5 @@ async function loadProblem(problemId) {
 
     // 폴드아웃 버튼 이벤트 설정
     setupFigureToggles();
-
-    // Annotation box 드래그 기능 설정
-    setupAnnotationDragging();
+    setupSolutionToggle(problemId);
 }
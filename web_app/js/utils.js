@@ -2,17 +2,9 @@
  * utils.js - 유틸리티 함수
  */
 
-// solution에서 SVG 마커 추출하여 폴드아웃 버튼 HTML 생성
-function extractSvgButtons(solution) {
-    if (!solution) return '';
-
-    const svgMarkers = [];
-    const regex = /%\s*\[SVG:\s*([^\]]+)\]/g;
-    let match;
-
-    while ((match = regex.exec(solution)) !== null) {
-        svgMarkers.push(match[1].trim());
-    }
+// 문제 payload의 svg_files로 폴드아웃 버튼 HTML 생성
+function createSvgButtons(svgFiles) {
+    const svgMarkers = svgFiles || [];
 
     if (svgMarkers.length === 0) return '';
 
@@ -130,9 +122,66 @@ function convertLatexToHtml(latex) {
     return html;
 }
 
+// 풀이 보기 버튼 HTML (풀이 내용은 눌렀을 때 로드)
+function createSolutionToggle() {
+    return `
+        <div class="figure-toggle solution-toggle">
+            <div class="figure-toggle-icon">
+                <svg viewBox="0 0 24 24">
+                    <path d="M8 5v14l11-7z"/>
+                </svg>
+            </div>
+            <span class="figure-toggle-text">풀이 보기</span>
+        </div>
+        <div class="figure-content solution-content"></div>
+    `;
+}
+
+// 풀이 보기 버튼 이벤트 설정 (처음 열 때 solutions/{id}.json 로드)
+function setupSolutionToggle(problemId) {
+    const toggle = document.querySelector('.solution-toggle');
+    if (!toggle) return;
+
+    let loaded = false;
+    toggle.addEventListener('click', async function() {
+        const content = this.nextElementSibling;
+        const text = this.querySelector('.figure-toggle-text');
+
+        if (content.classList.contains('show')) {
+            content.classList.remove('show');
+            this.classList.remove('expanded');
+            text.textContent = '풀이 보기';
+            return;
+        }
+
+        if (!loaded) {
+            text.textContent = '불러오는 중...';
+            const problem = await loadProblemSolution(problemId);
+            // 로드하는 동안 다른 문제로 이동했으면 무시
+            if (!problem || !document.body.contains(this)) {
+                text.textContent = '풀이 보기';
+                return;
+            }
+
+            content.innerHTML = createAnnotationBox(problem.solution_text)
+                || '<p class="solution-empty">풀이 설명이 없습니다.</p>';
+            loaded = true;
+
+            if (window.MathJax) {
+                MathJax.typesetPromise([content]);
+            }
+            setupAnnotationDragging();
+        }
+
+        content.classList.add('show');
+        this.classList.add('expanded');
+        text.textContent = '풀이 숨기기';
+    });
+}
+
 // 폴드아웃 버튼 이벤트 설정
 function setupFigureToggles() {
-    document.querySelectorAll('.figure-toggle').forEach(toggle => {
+    document.querySelectorAll('.figure-toggle:not(.solution-toggle)').forEach(toggle => {
         toggle.addEventListener('click', function() {
             const content = this.nextElementSibling;
             const isExpanded = content.classList.contains('show');
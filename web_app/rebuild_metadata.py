@@ -2,11 +2,15 @@
 """
 problems 폴더 기반으로 metadata 재생성
 """
-import json
 import re
+import sys
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR.parent / "___scripts"))
+
+from file_lock import file_lock, write_json_atomic
+
 DATA_DIR = SCRIPT_DIR / "data"
 PROBLEMS_DIR = DATA_DIR / "problems"
 SOLUTIONS_DIR = PROBLEMS_DIR / "solutions"
@@ -58,8 +62,11 @@ def extract_metadata_from_tex(problem_id: str) -> dict:
 def main():
     print("Metadata 재생성 중...")
 
-    # problems 폴더에서 모든 tex 파일 찾기
-    problem_files = sorted(PROBLEMS_DIR.glob("[0-9][0-9][0-9].tex"))
+    # problems 폴더에서 모든 tex 파일 찾기 (ID가 999를 넘으면 네 자리 이상)
+    problem_files = sorted(
+        (pf for pf in PROBLEMS_DIR.glob("[0-9][0-9][0-9]*.tex") if pf.stem.isdigit()),
+        key=lambda pf: (len(pf.stem), pf.stem)
+    )
 
     problems = []
     for pf in problem_files:
@@ -74,8 +81,9 @@ def main():
         "problems": problems
     }
 
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    # 빌드 / 문제 추가 스크립트와 동시에 실행되어도 안전하도록 잠금 후 교체
+    with file_lock(OUTPUT_FILE):
+        write_json_atomic(OUTPUT_FILE, output_data, ensure_ascii=False, indent=2)
 
     print(f"\n✅ 완료! {len(problems)}개 문제")
     print(f"출력: {OUTPUT_FILE}")